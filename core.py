@@ -1,5 +1,9 @@
-import inspect
+import collections
+import itertools
 import string
+import codecs
+import re
+import numpy as np
 
 class RuneUtils(object):
     """
@@ -12,6 +16,34 @@ class RuneUtils(object):
     _PUNCT = { '-': ' ', '.': '. ' }
     _GP_PRIMES = [ 2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109 ]
 
+    # Certain Cicada3301 quirks, applied to English before transliteration (earlier quirks take precedence)
+    _ENGLISH_QUIRKS = [
+        ('ING', 'NG'),      # "BENG"
+        ('IO', 'IA'),       # "INSTRVCTIAN"
+        ('QU', 'CW'),       # "CWESTION"
+        ('K', 'C'),         # "BOOC"
+        ('U', 'V'),         # "OVR"
+        ('Z', 'S'),         # Hypothesis
+        ('Q', 'C')          # Hypothesis
+    ]
+
+    # Compiled transliteration patterns, built on first use
+    _TRANSLITERATION_PATTERNS = None
+
+    # Maps runes to their indices
+    _RUNE_INDICES = dict([ (rune, index) for (index, rune) in enumerate(_RUNES) ])
+
+    # Decoding map from rune indices to runes, a pattern that matches any rune and a punctuation translation table
+    _RUNES_CHARMAP = ''.join(_RUNES)
+    _RUNES_PATTERN = re.compile(f'[{_RUNES_CHARMAP}]')
+    _PUNCT_TABLE = str.maketrans(_PUNCT)
+
+    # Counts of each uppercase Latin letter per rune (i.e. a 29x26 matrix)
+    _LATIN_LETTER_COUNTS = np.array([ [ latin.count(letter) for letter in string.ascii_uppercase ] for latin in _LATIN ], dtype=np.int64)
+
+    # GP values of each rune, to sum ranges of rune indices
+    _GP_PRIMES_ARRAY = np.array(_GP_PRIMES, dtype=np.int64)
+
     @classmethod
     def size(cls):
         """
@@ -64,7 +96,7 @@ class RuneUtils(object):
         """
 
         # Indicate
-        return rune in cls._RUNES
+        return rune in cls._RUNE_INDICES
 
     @classmethod
     def is_punct(cls, candidate):
@@ -83,7 +115,70 @@ class RuneUtils(object):
 
         # Validations
         assert cls.is_rune(rune), Exception(f'Invalid rune: {rune}')
-        return cls._RUNES.index(rune)
+        return cls._RUNE_INDICES[rune]
+
+    @classmethod
+    def runes_to_indices(cls, runes):
+        """
+            Turns runes to a compact buffer of rune indices, ignoring non-runes.
+        """
+
+        # Only take runes into account
+        return bytes([ cls._RUNE_INDICES[rune] for rune in runes if rune in cls._RUNE_INDICES ])
+
+    @classmethod
+    def indices_to_runes(cls, indices):
+        """
+            Turns rune indices to a list of runes.
+        """
+
+        # Translate each index
+        return [ cls._RUNES[index] for index in indices ]
+
+    @classmethod
+    def indices_to_rune_string(cls, indices):
+        """
+            Turns a buffer of rune indices to a string of runes in a single pass.
+        """
+
+        # Decode with the runes as a character map
+        return codecs.charmap_decode(indices, 'strict', cls._RUNES_CHARMAP)[0]
+
+    @classmethod
+    def indices_to_latin(cls, indices):
+        """
+            Turns rune indices to a list of Latin strings.
+        """
+
+        # Translate each index
+        return list(map(cls._LATIN.__getitem__, indices))
+
+    @classmethod
+    def split_by_runes(cls, text):
+        """
+            Splits text by runes, returning the non-rune segments around runes (always one more than the number of runes).
+        """
+
+        # Split by any rune
+        return cls._RUNES_PATTERN.split(text)
+
+    @classmethod
+    def indices_to_gp_values(cls, indices):
+        """
+            Turns a buffer of rune indices to an array of their GP values.
+        """
+
+        # Index the GP values
+        return cls._GP_PRIMES_ARRAY[np.frombuffer(bytes(indices), dtype=np.uint8)]
+
+    @classmethod
+    def rune_counts_to_latin_letter_counts(cls, rune_counts):
+        """
+            Turns a histogram of rune indices to a histogram of uppercase Latin letters.
+        """
+
+        # Each rune contributes its Latin letters
+        return np.asarray(rune_counts, dtype=np.int64) @ cls._LATIN_LETTER_COUNTS
 
     @classmethod
     def runes_to_gp_sum(cls, runes):
@@ -92,7 +187,7 @@ class RuneUtils(object):
         """
 
         # Only take runes and translate
-        return sum([ cls._GP_PRIMES[cls._RUNES.index(rune)] for rune in runes if rune in cls._RUNES ])
+        return sum([ cls._GP_PRIMES[cls._RUNE_INDICES[rune]] for rune in runes if rune in cls._RUNE_INDICES ])
 
     @classmethod
     def runes_to_latin(cls, runes):
@@ -103,6 +198,62 @@ class RuneUtils(object):
         # Only take runes into account and preserve spaces etc.
         return ProcessedText(rune_text=runes).to_latin()
 
+    @classmethod
+    def _get_digraph_claim_pattern(cls, first, priority, priorities):
+        """
+            Gets a pattern that matches right after the given letter iff a digraph that starts with it and precedes the given priority gets replaced.
+            A digraph gets replaced unless its second letter is claimed the same way, so the pattern is built recursively (priorities strictly decrease, hence it terminates).
+        """
+
+        # Build an alternation of all claiming digraphs
+        alternatives = []
+        for digraph, digraph_priority in priorities.items():
+            if digraph[0] != first or digraph_priority >= priority:
+                continue
+            claim = cls._get_digraph_claim_pattern(digraph[1], digraph_priority, priorities)
+            alternatives.append(digraph[1] if claim is None else f'{digraph[1]}(?!{claim})')
+        return '|'.join(alternatives) if len(alternatives) > 0 else None
+
+    @classmethod
+    def _get_transliteration_patterns(cls):
+        """
+            Gets the compiled stages that transliterate English, each being a single left-to-right pass.
+            The original transliteration replaced each quirk and then each two-letter Latin rune in order, so a digraph loses to an overlapping digraph that comes earlier in the alphabet.
+            Since digraphs only overlap by a single letter, that is expressed with negative lookaheads, which makes the result identical to the sequential replacements.
+        """
+
+        # Use cache
+        if cls._TRANSLITERATION_PATTERNS is not None:
+            return cls._TRANSLITERATION_PATTERNS
+
+        # Multi-letter quirks never overlap each other, and "QU" comes before the single-letter quirks so it takes precedence over "Q" and "U"
+        quirks_pattern = re.compile('|'.join([ re.escape(latin) for latin, _ in cls._ENGLISH_QUIRKS if len(latin) > 1 ]))
+        quirks_table = str.maketrans(dict([ (latin, english) for latin, english in cls._ENGLISH_QUIRKS if len(latin) == 1 ]))
+
+        # Each digraph is replaced unless an earlier overlapping digraph claims its second letter, and single letters are translated afterwards
+        priorities = dict([ (latin, index) for (index, latin) in enumerate(cls._LATIN) if len(latin) == 2 ])
+        alternatives = []
+        for digraph, priority in priorities.items():
+            claim = cls._get_digraph_claim_pattern(digraph[1], priority, priorities)
+            alternatives.append(digraph if claim is None else f'{digraph}(?!{claim})')
+        digraphs_pattern = re.compile('|'.join(alternatives))
+        runes_table = str.maketrans(dict([ (latin, rune) for latin, rune in zip(cls._LATIN, cls._RUNES) if len(latin) == 1 ]))
+
+        # Save the stages, each as a pattern, its replacements and a translation table for the remaining letters
+        cls._TRANSLITERATION_PATTERNS = [ (quirks_pattern, dict(cls._ENGLISH_QUIRKS), quirks_table), (digraphs_pattern, dict(zip(cls._LATIN, cls._RUNES)), runes_table) ]
+        return cls._TRANSLITERATION_PATTERNS
+
+    @classmethod
+    def _transliterate(cls, s):
+        """
+            Transliterates uppercase English letters (possibly separated by other characters that are preserved) to runes.
+        """
+
+        # Apply all stages
+        for pattern, replacements, table in cls._get_transliteration_patterns():
+            s = pattern.sub(lambda match: replacements[match.group()], s).translate(table)
+        return s
+
     @classmethod
     def english_to_runes(cls, english):
         """
@@ -112,27 +263,22 @@ class RuneUtils(object):
         # Only take letters and turn everything uppercase
         s = ''.join([ i.upper() for i in english if i in string.ascii_letters ])
 
-        # Certain Cicada3301 quirks
-        s = s.replace('ING', 'NG')      # "BENG"
-        s = s.replace('IO', 'IA')       # "INSTRVCTIAN"
-        s = s.replace('QU', 'CW')       # "CWESTION"
-        s = s.replace('K', 'C')         # "BOOC"
-        s = s.replace('U', 'V')         # "OVR"
-        s = s.replace('Z', 'S')         # Hypothesis
-        s = s.replace('Q', 'C')         # Hypothesis
-
-        # Try to minimize the number of runes by prioritizing runes that translate to two-letter latin
-        for i in range(len(cls._RUNES)):
-            if len(cls._LATIN[i]) == 1:
-                continue
-            s = s.replace(cls._LATIN[i], cls._RUNES[i])
+        # Transliterate
+        return cls._transliterate(s)
 
-        # Translate all the rest
-        for i in range(cls.size()):
-            s = s.replace(cls._LATIN[i], cls._RUNES[i])
+    @classmethod
+    def english_to_runes_bulk(cls, words):
+        """
+            Turns many English words to runes at once, which is much faster than turning them one by one.
+            Words are expected not to contain newlines.
+        """
 
-        # Return result
-        return s
+        # Transliterate all words as a single text, where newlines separate words
+        words = list(words)
+        if len(words) == 0:
+            return []
+        text = re.sub('[^A-Za-z\n]', '', '\n'.join(words)).upper()
+        return cls._transliterate(text).split('\n')
 
     @classmethod
     def translate_punct(cls, c):
@@ -143,10 +289,389 @@ class RuneUtils(object):
         # Return the translation or an empty string
         return cls._PUNCT.get(c, '')
 
+    @classmethod
+    def translate_all_punct(cls, text):
+        """
+            Translates all punctuation in the given text.
+        """
+
+        # Translate with a table
+        return text.translate(cls._PUNCT_TABLE)
+
+class RuneStream(object):
+    """
+        A lazy stream of rune indices of a known length, caching all rune indices pulled so far.
+    """
+
+    def __init__(self, source, length):
+        """
+            Creates an instance.
+        """
+
+        # Save the source and the length
+        self._source = iter(source)
+        self._length = length
+
+        # Cache for rune indices pulled so far
+        self._buffer = bytearray()
+
+    def pull(self, count):
+        """
+            Pulls rune indices until at least the given number of them are available (or the stream ends) and returns all of them.
+        """
+
+        # Pull the missing rune indices
+        missing = min(count, self._length) - len(self._buffer)
+        if missing > 0:
+            self._buffer.extend(itertools.islice(self._source, missing))
+            is_available = len(self._buffer) >= min(count, self._length)
+            assert is_available, Exception(f'Rune stream ended after {len(self._buffer)} runes out of {self._length}')
+        return self._buffer
+
+    def to_bytes(self):
+        """
+            Pulls all rune indices and returns them as an immutable buffer.
+        """
+
+        # Pull everything
+        return bytes(self.pull(self._length))
+
+    def __len__(self):
+        """
+            Gets the stream length.
+        """
+
+        # Return the length
+        return self._length
+
+    def __iter__(self):
+        """
+            Iterates all rune indices, pulling them one by one.
+        """
+
+        # Pull as needed
+        for index in range(self._length):
+            if index >= len(self._buffer):
+                self.pull(index + 1)
+            yield self._buffer[index]
+
+class RuneTrie(object):
+    """
+        A trie of Runic words, flattened to a single transitions dictionary over rune indices.
+        A trie could also be backed by sorted transition arrays only (e.g. memory-mapped from disk and shared by processes), in which case it is read-only.
+    """
+
+    def __init__(self, words=()):
+        """
+            Creates an instance.
+        """
+
+        # Maps (node, rune index) pairs to child nodes, where node 0 is the root
+        self._transitions = {}
+        self._num_of_nodes = 1
+
+        # Nodes that terminate words
+        self._word_nodes = set()
+
+        # Sorted transition arrays for walking many nodes at once, built lazily
+        self._arrays = None
+
+        # Add all words
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """
+            Adds a Runic word, ignoring non-runes.
+        """
+
+        # Validations
+        assert self._transitions is not None, Exception('Cannot add words to a trie backed by arrays')
+
+        # Walk the trie and add missing nodes
+        self._arrays = None
+        node = 0
+        for index in RuneUtils.runes_to_indices(word):
+            key = node * RuneUtils.size() + index
+            if key not in self._transitions:
+                self._transitions[key] = self._num_of_nodes
+                self._num_of_nodes += 1
+            node = self._transitions[key]
+        if node > 0:
+            self._word_nodes.add(node)
+
+    def contains_indices(self, indices, start=0, end=None):
+        """
+            Indicates if the given rune indices (optionally sliced) form a word, stopping at the first rune that leaves the trie.
+        """
+
+        # Walk the sorted transition arrays if there is no transitions dictionary
+        node = 0
+        size = RuneUtils.size()
+        transitions = self._transitions
+        if transitions is None:
+            keys, children, word_mask = self._arrays
+            for i in range(start, len(indices) if end is None else end):
+                key = node * size + indices[i]
+                position = keys.searchsorted(key)
+                if position == len(keys) or keys[position] != key:
+                    return False
+                node = int(children[position])
+            return bool(word_mask[node])
+
+        # Walk the trie
+        for i in range(start, len(indices) if end is None else end):
+            node = transitions.get(node * size + indices[i])
+            if node is None:
+                return False
+        return node in self._word_nodes
+
+    def _get_arrays(self):
+        """
+            Gets the transition keys (sorted), their child nodes and a mask of word nodes as arrays.
+        """
+
+        # Build once
+        if self._arrays is None:
+            keys = np.fromiter(self._transitions.keys(), dtype=np.int64, count=len(self._transitions))
+            nodes = np.fromiter(self._transitions.values(), dtype=np.int64, count=len(self._transitions))
+            order = np.argsort(keys)
+            word_mask = np.zeros(self._num_of_nodes, dtype=bool)
+            word_mask[list(self._word_nodes)] = True
+            self._arrays = (keys[order], nodes[order], word_mask)
+        return self._arrays
+
+    def get_children(self, nodes, indices):
+        """
+            Walks many nodes at once, each by its own rune index (both given as arrays).
+            Returns the child nodes as an array, where -1 means there is no such child.
+        """
+
+        # Look up all transition keys at once
+        keys, children, _ = self._get_arrays()
+        lookup = np.asarray(nodes, dtype=np.int64) * RuneUtils.size() + np.asarray(indices, dtype=np.int64)
+        if len(keys) == 0:
+            return np.full(lookup.shape, -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(keys, lookup), len(keys) - 1)
+        return np.where(keys[positions] == lookup, children[positions], -1)
+
+    def are_words(self, nodes):
+        """
+            Indicates which of the given nodes (as an array of non-negative nodes) terminate words.
+        """
+
+        # Use the word nodes mask
+        return self._get_arrays()[2][nodes]
+
+    def __contains__(self, word):
+        """
+            Indicates if the given Runic word is in the trie.
+        """
+
+        # Check the rune indices
+        return self.contains_indices(RuneUtils.runes_to_indices(word))
+
+    def __len__(self):
+        """
+            Gets the number of words in the trie.
+        """
+
+        # Each word has its own node
+        if self._transitions is None:
+            return int(np.count_nonzero(self._arrays[2]))
+        return len(self._word_nodes)
+
+    def to_arrays(self):
+        """
+            Gets the trie as compact arrays (sorted transition keys, their child nodes and a mask of word nodes), e.g. for saving to disk.
+        """
+
+        # Use the sorted transition arrays
+        return self._get_arrays()
+
+    @staticmethod
+    def from_arrays(keys, nodes, word_mask):
+        """
+            Creates a new read-only instance backed by compact arrays, as returned by to_arrays.
+            The arrays are used as-is (e.g. memory-mapped arrays stay memory-mapped), without building a transitions dictionary.
+        """
+
+        # Only keep the arrays, as plain array views since indexing memory-mapped arrays is much slower
+        trie = RuneTrie()
+        trie._transitions = None
+        trie._num_of_nodes = len(word_mask)
+        trie._word_nodes = None
+        trie._arrays = (np.asarray(keys), np.asarray(nodes), np.asarray(word_mask))
+        return trie
+
+class IocTracker(object):
+    """
+        Tracks the 1-gram IoC of rune indices, supporting O(1) updates when individual runes change.
+    """
+
+    def __init__(self, rune_indices=b'', alphabet_size=None):
+        """
+            Creates an instance.
+        """
+
+        # Save the histogram
+        self._alphabet_size = RuneUtils.size() if alphabet_size is None else alphabet_size
+        self._counts = np.bincount(np.frombuffer(bytes(rune_indices), dtype=np.uint8), minlength=self._alphabet_size).tolist()
+
+        # Save the total and the sum of c*(c-1) over all counts
+        self._total = sum(self._counts)
+        self._pairs = sum([ count * (count - 1) for count in self._counts ])
+
+    def add(self, index):
+        """
+            Adds a rune index.
+        """
+
+        # Update the count and the sum in O(1)
+        self._pairs += 2 * self._counts[index]
+        self._counts[index] += 1
+        self._total += 1
+
+    def remove(self, index):
+        """
+            Removes a rune index.
+        """
+
+        # Update the count and the sum in O(1)
+        assert self._counts[index] > 0, Exception(f'Rune index was never added: {index}')
+        self._counts[index] -= 1
+        self._pairs -= 2 * self._counts[index]
+        self._total -= 1
+
+    def replace(self, old_index, new_index):
+        """
+            Replaces one rune index with another.
+        """
+
+        # Remove and add
+        if old_index != new_index:
+            self.remove(old_index)
+            self.add(new_index)
+
+    def get_counts(self):
+        """
+            Gets the histogram of rune indices.
+        """
+
+        # Return a copy
+        return self._counts[:]
+
+    def get_ioc(self):
+        """
+            Gets the IoC.
+        """
+
+        # Calculate from the tracked sums
+        return ProcessedText._get_ioc_from_sums(self._pairs, self._total, self._alphabet_size)
+
+class TextStructure(object):
+    """
+        The word, sentence and line boundaries of an original text, which never change as runes are transformed.
+        Words and sentences are (start, end) rune offsets into rune buffers, and lines are (start, end) offsets into the rune text with translated punctuation.
+    """
+
+    def __init__(self, text=''):
+        """
+            Creates an instance by walking the given original text once.
+            Words are separated by spaces, hyphens and periods (other non-runes are ignored), sentences by periods and lines by newlines.
+        """
+
+        # Boundaries of words, sentences (as word ranges, rune offsets, original text offsets and rune text offsets) and lines
+        self.word_offsets = []
+        self.sentence_words = []
+        self.sentence_offsets = []
+        self.sentence_text_offsets = []
+        self.sentence_render_offsets = []
+        self.line_offsets = []
+
+        # Walk the text while tracking the rune index and the index in the rune text
+        word_start = None
+        sentence_start = (0, 0, 0, 0)
+        line_start = 0
+        rune_index = 0
+        render_index = 0
+        for text_index, c in enumerate(text):
+
+            # Runes start or continue words
+            if RuneUtils.is_rune(c):
+                if word_start is None:
+                    word_start = rune_index
+                rune_index += 1
+                render_index += 1
+                continue
+
+            # End words on separators
+            if c in (' ', '-', '.') and word_start is not None:
+                self.word_offsets.append((word_start, rune_index))
+                word_start = None
+
+            # End lines on newlines
+            if c == '\n':
+                self.line_offsets.append((line_start, render_index))
+                line_start = render_index + 1
+
+            # End sentences on periods, where the next sentence starts after the translated period
+            period_render_index = render_index
+            render_index += len(RuneUtils.translate_all_punct(c))
+            if c == '.':
+                self._add_sentence(sentence_start, (len(self.word_offsets), rune_index, text_index, period_render_index))
+                sentence_start = (len(self.word_offsets), rune_index, text_index + 1, render_index)
+
+        # End the last word, sentence and line
+        if word_start is not None:
+            self.word_offsets.append((word_start, rune_index))
+        self._add_sentence(sentence_start, (len(self.word_offsets), rune_index, len(text), render_index))
+        self.line_offsets.append((line_start, render_index))
+
+    def _add_sentence(self, start, end):
+        """
+            Adds a sentence given its start and end as (word index, rune index, original text index, rune text index).
+        """
+
+        # Add all boundaries
+        self.sentence_words.append((start[0], end[0]))
+        self.sentence_offsets.append((start[1], end[1]))
+        self.sentence_text_offsets.append((start[2], end[2]))
+        self.sentence_render_offsets.append((start[3], end[3]))
+
+    def get_sentence_structure(self, index):
+        """
+            Gets the structure of a single sentence as if it were the original text, without walking any text.
+        """
+
+        # Get the sentence boundaries
+        first_word, end_word = self.sentence_words[index]
+        rune_start, rune_end = self.sentence_offsets[index]
+        text_start, text_end = self.sentence_text_offsets[index]
+        render_start, render_end = self.sentence_render_offsets[index]
+
+        # Shift the words and clip the lines that overlap the sentence
+        structure = TextStructure()
+        structure.word_offsets = [ (start - rune_start, end - rune_start) for (start, end) in self.word_offsets[first_word:end_word] ]
+        structure.sentence_words = [ (0, len(structure.word_offsets)) ]
+        structure.sentence_offsets = [ (0, rune_end - rune_start) ]
+        structure.sentence_text_offsets = [ (0, text_end - text_start) ]
+        structure.sentence_render_offsets = [ (0, render_end - render_start) ]
+        structure.line_offsets = [ (max(start, render_start) - render_start, min(end, render_end) - render_start) for (start, end) in self.line_offsets if start <= render_end and end >= render_start ]
+        return structure
+
 class ProcessedText(object):
 
-    # Save the runes
-    _RUNES = list(RuneUtils.iter_runes())
+    # The measurements of the running experiment, bound to each instance on creation
+    _ACTIVE_MEASUREMENTS = []
+
+    # Render templates by original text, bounded by evicting the least recently used templates
+    _RENDER_TEMPLATES_CACHE = collections.OrderedDict()
+    _RENDER_TEMPLATES_CACHE_SIZE = 1024
+
+    # Structures by original text, bounded the same way
+    _STRUCTURES_CACHE = collections.OrderedDict()
+    _STRUCTURES_CACHE_SIZE = 1024
 
     def __init__(self, rune_text=None, section=None):
         """
@@ -161,23 +686,32 @@ class ProcessedText(object):
             raise Exception('Must supply either section or rune text')
         self._orig = section.get_all_text() if rune_text is None else rune_text
 
-        # Save processes runes
-        self._processed_runes = [ c for c in self._orig if RuneUtils.is_rune(c) ]
-        self._orig_runes = self._processed_runes[:]
+        # Save processed runes as a compact buffer of rune indices
+        self._processed_runes = RuneUtils.runes_to_indices(self._orig)
+        self._orig_runes = self._processed_runes
+
+        # The structure, the Latin letter counts of non-runes and the render template are calculated lazily
+        self._structure = None
+        self._non_rune_latin_counts = None
+        self._render_template = None
+
+        # Rendered texts of the processed runes they were rendered from
+        self._rendered_runes = None
+        self._rendered = {}
 
         # Currently not marked as unsolved
         self._is_unsolved = False
 
-        # Cache for measurements
-        self._measurements = None
+        # Bind the active measurements
+        self._measurements = ProcessedText._ACTIVE_MEASUREMENTS
 
     def revert(self):
         """
             Reverts all changes.
         """
 
-        # Revert
-        self._processed_runes = self._orig_runes[:]
+        # Revert (buffers are immutable so they could be shared)
+        self._processed_runes = self._orig_runes
         self._is_unsolved = False
 
     @staticmethod
@@ -186,13 +720,65 @@ class ProcessedText(object):
             Creates a new instance, "duplicating" the given instance.
         """
 
-        # Duplicate
-        pt = ProcessedText(other._orig)
-        pt._processed_runes = other._processed_runes[:]
-        pt._is_unsolved = other._is_unsolved
+        # Duplicate without parsing the original text again (buffers and derived data are immutable so they could be shared)
+        pt = ProcessedText.__new__(ProcessedText)
         pt.section = other.section
+        pt._orig = other._orig
+        pt._orig_runes = other._orig_runes
+        pt._processed_runes = other._processed_runes
+        pt._structure = other._structure
+        pt._non_rune_latin_counts = other._non_rune_latin_counts
+        pt._render_template = other._render_template
+        pt._rendered_runes = None
+        pt._rendered = {}
+        pt._is_unsolved = other._is_unsolved
+        pt._measurements = other._measurements
         return pt
 
+    def get_sentence_view(self, index):
+        """
+            Gets a new instance of a single sentence (as split by periods) with its current runes, without parsing text.
+            The view is independent, i.e. transforming it does not affect this instance, and its render template is only compiled if it gets rendered.
+        """
+
+        # Slice the buffers and the original text by the sentence boundaries
+        structure = self._get_structure()
+        rune_start, rune_end = structure.sentence_offsets[index]
+        text_start, text_end = structure.sentence_text_offsets[index]
+        pt = ProcessedText.__new__(ProcessedText)
+        pt.section = self.section
+        pt._orig = self._orig[text_start:text_end]
+        pt._orig_runes = self._orig_runes[rune_start:rune_end]
+        pt._processed_runes = self._materialize()[rune_start:rune_end]
+        pt._structure = structure.get_sentence_structure(index)
+        pt._non_rune_latin_counts = None
+        pt._render_template = None
+        pt._rendered_runes = None
+        pt._rendered = {}
+        pt._is_unsolved = self._is_unsolved
+        pt._measurements = self._measurements
+        return pt
+
+    def snapshot(self):
+        """
+            Takes a snapshot of the current state in O(1), which could be restored later (as many times as needed).
+            Buffers are immutable, so the snapshot simply shares the current one.
+        """
+
+        # Share the processed runes and save the unsolved mark
+        return (self._processed_runes, self._is_unsolved)
+
+    def restore(self, snapshot):
+        """
+            Restores a snapshot taken by this instance (or by any instance with the same number of runes) in O(1).
+        """
+
+        # Share the processed runes of the snapshot
+        processed_runes, is_unsolved = snapshot
+        assert len(processed_runes) == len(self._orig_runes), Exception(f'Length mismatch between snapshot runes ({len(processed_runes)}) and old runes ({len(self._orig_runes)})')
+        self._processed_runes = processed_runes
+        self._is_unsolved = is_unsolved
+
     def set_unsolved(self):
         """
             Sets as unsolved.
@@ -209,13 +795,57 @@ class ProcessedText(object):
         # Indicate
         return self._is_unsolved
 
+    def get_original_text(self):
+        """
+            Gets the original text the instance was created from.
+        """
+
+        # Return the original text
+        return self._orig
+
+    def _materialize(self):
+        """
+            Pulls all lazily transformed runes, if there are any, and returns the processed rune indices.
+        """
+
+        # Replace the stream with an immutable buffer
+        if isinstance(self._processed_runes, RuneStream):
+            self._processed_runes = self._processed_runes.to_bytes()
+        return self._processed_runes
+
     def get_runes(self):
         """
             Gets the runes.
         """
 
-        # Returns the processed runes
-        return self._processed_runes
+        # Render the processed runes
+        return RuneUtils.indices_to_runes(self._materialize())
+
+    def get_rune_indices(self):
+        """
+            Gets the rune indices as an immutable buffer.
+        """
+
+        # Returns the processed rune indices
+        return self._materialize()
+
+    def get_rune_indices_prefix(self, count):
+        """
+            Gets the first rune indices as an immutable buffer, only pulling as many lazily transformed runes as needed.
+        """
+
+        # Pull from the stream if needed
+        if isinstance(self._processed_runes, RuneStream):
+            return bytes(self._processed_runes.pull(count)[:count])
+        return self._processed_runes[:count]
+
+    def iter_rune_indices(self):
+        """
+            Iterates the rune indices, only pulling lazily transformed runes as they are iterated.
+        """
+
+        # Iterate either the stream or the buffer
+        return iter(self._processed_runes)
 
     def get_num_of_runes(self):
         """
@@ -223,7 +853,7 @@ class ProcessedText(object):
         """
 
         # Returns the number of runes
-        return len(self._processed_runes)
+        return len(self._orig_runes)
 
     def set_runes(self, new_runes):
         """
@@ -231,29 +861,77 @@ class ProcessedText(object):
         """
 
         # Save processed runes
-        assert len(new_runes) == len(self._processed_runes), Exception(f'Length mismatch between new runes ({len(new_runes)}) and old runes ({len(self._processed_runes)})')
-        self._processed_runes = new_runes[:]
+        self.set_rune_indices(RuneUtils.runes_to_indices(new_runes))
+
+    def set_rune_indices(self, new_indices):
+        """
+            Save the rune indices.
+        """
+
+        # Save processed rune indices
+        assert len(new_indices) == len(self._orig_runes), Exception(f'Length mismatch between new runes ({len(new_indices)}) and old runes ({len(self._orig_runes)})')
+        self._processed_runes = bytes(new_indices)
+
+    def set_rune_stream(self, new_indices):
+        """
+            Save the rune indices lazily from an iterable, which is only consumed as runes are needed.
+        """
+
+        # Save processed rune indices as a stream
+        self._processed_runes = RuneStream(new_indices, len(self._orig_runes))
 
     def get_rune_words(self, remove_periods=True):
         """
             Get Runic words.
         """
 
-        # Get the Runic text
-        text = self.get_rune_text()
+        # Slice the rune string by the word offsets
+        runes = RuneUtils.indices_to_rune_string(self._materialize())
+        structure = self._get_structure()
         if remove_periods:
-            text = text.replace('.', ' ')
-        else:
-            text = text.replace('.', ' . ')
-        return [ word for word in ''.join([ c for c in text if RuneUtils.is_rune(c) or c in (' ', '.') ]).split(' ') if len(word) > 0 ]
+            return [ runes[start:end] for (start, end) in structure.word_offsets ]
+
+        # Keep periods as words between sentences
+        words = []
+        for sentence_index, (first_word, end_word) in enumerate(structure.sentence_words):
+            if sentence_index > 0:
+                words.append('.')
+            words.extend([ runes[start:end] for (start, end) in structure.word_offsets[first_word:end_word] ])
+        return words
+
+    def get_word_offsets(self):
+        """
+            Gets the rune offsets of all words as (start, end) pairs.
+            Words are separated by spaces, hyphens and periods, while other non-runes are ignored, just like in get_rune_words.
+        """
+
+        # Use the structure
+        return self._get_structure().word_offsets
+
+    def get_num_of_words(self):
+        """
+            Returns the number of words.
+        """
+
+        # Use the word offsets
+        return len(self.get_word_offsets())
+
+    def get_num_of_sentences(self):
+        """
+            Returns the number of sentences (as split by periods, including empty sentences).
+        """
+
+        # Use the structure
+        return len(self._get_structure().sentence_offsets)
 
     def split_sentences(self, include_empty=True):
         """
             Split text into sentences.
         """
 
-        # Split
-        sentences = [ [ word for word in ProcessedText(sentence).get_rune_words() if len(word) > 0 ] for sentence in self.get_rune_text().split('.') ]
+        # Group the words by the sentence word ranges
+        words = self.get_rune_words()
+        sentences = [ words[first_word:end_word] for (first_word, end_word) in self._get_structure().sentence_words ]
         if not include_empty:
             sentences = [ sentence for sentence in sentences if len(sentence) > 0 ]
         return sentences
@@ -263,8 +941,9 @@ class ProcessedText(object):
             Split text into lines.
         """
 
-        # Split
-        lines = self.get_rune_text().split('\n')
+        # Slice the rune text by the line offsets
+        text = self.get_rune_text()
+        lines = [ text[start:end] for (start, end) in self._get_structure().line_offsets ]
         if not include_empty:
             lines = [ line for line in lines if len(line.strip()) > 0 ]
         return lines
@@ -275,8 +954,7 @@ class ProcessedText(object):
         """
 
         # Return the GP sums of runes
-        result = [ RuneUtils.runes_to_gp_sum(rune) for rune in self.get_runes() ]
-        return [ val for val in result if val > 0 ]
+        return [ RuneUtils.gp_at(index) for index in self._materialize() ]
 
     def get_gp_sum_of_words(self):
         """
@@ -284,124 +962,298 @@ class ProcessedText(object):
         """
 
         # Return the GP sums of words
-        result = [ RuneUtils.runes_to_gp_sum(word) for word in self.get_rune_words() ]
-        return [ val for val in result if val > 0 ]
+        return self._get_gp_sums_of_ranges(self._get_structure().word_offsets)
 
     def get_gp_sum_of_sentences(self):
         """
             Get the GP sums of sentences.
         """
 
-        # Return the GP sums of sentences
-        result = [ RuneUtils.runes_to_gp_sum(''.join(sentence)) for sentence in self.split_sentences() ]
-        return [ val for val in result if val > 0 ]
+        # Return the GP sums of sentences (every rune belongs to a word, so sentences could be summed as rune ranges)
+        return self._get_gp_sums_of_ranges(self._get_structure().sentence_offsets)
+
+    def _get_gp_sums_of_ranges(self, offsets):
+        """
+            Gets the GP sums of the given rune ranges from the cumulative sums of GP values, omitting empty ranges.
+        """
+
+        # Subtract cumulative sums at range boundaries
+        if len(offsets) == 0:
+            return []
+        cumsum = np.concatenate(([ 0 ], np.cumsum(RuneUtils.indices_to_gp_values(self._materialize()))))
+        offsets = np.array(offsets, dtype=np.int64)
+        result = cumsum[offsets[:, 1]] - cumsum[offsets[:, 0]]
+        return result[result > 0].tolist()
 
     def get_first_non_wordlist_word_index(self, wordlist):
         """
             Finds the first Runic word that is not in the given wordlist.
         """
 
-        # Iterate all words
+        # Iterate all words, only pulling lazily transformed runes up to the end of each word
         word_index = -1
-        for word in self.get_rune_words():
+        is_stream = isinstance(self._processed_runes, RuneStream)
+        for (start, end) in self.get_word_offsets():
             word_index += 1
-            if word not in wordlist:
+            runes = self._processed_runes.pull(end) if is_stream else self._processed_runes
+
+            # Walk the trie directly on rune indices
+            if isinstance(wordlist, RuneTrie):
+                if not wordlist.contains_indices(runes, start, end):
+                    return word_index
+            elif ''.join(RuneUtils.indices_to_runes(runes[start:end])) not in wordlist:
                 return word_index
         
-        # Indicate all words are in the wordlist by just returning the number of words plus one
+        # Indicate all words are in the wordlist by just returning the number of words
         return word_index + 1
 
-    def get_rune_text(self, punct_translation=True):
+    def get_first_non_wordlist_word_index_batch(self, rune_indices, wordlist):
+        """
+            Finds the first Runic word that is not in the given wordlist for each row of a 2D matrix of rune indices, as an array.
+            A trie is walked for all rows at once, word by word, until no row is left.
+        """
+
+        # Fall back to checking rows one by one
+        if not isinstance(wordlist, RuneTrie):
+            processed_text = ProcessedText.from_processed_text(self)
+            result = []
+            for row in rune_indices:
+                processed_text.set_rune_indices(row)
+                result.append(processed_text.get_first_non_wordlist_word_index(wordlist))
+            return np.array(result, dtype=np.int64)
+
+        # Walk all rows that matched every word so far
+        rune_indices = np.asarray(rune_indices)
+        result = np.zeros(len(rune_indices), dtype=np.int64)
+        rows = np.arange(len(rune_indices))
+        for (start, end) in self.get_word_offsets():
+            nodes = np.zeros(len(rows), dtype=np.int64)
+            for i in range(start, end):
+                nodes = wordlist.get_children(nodes, rune_indices[rows, i])
+            survivors = nodes >= 0
+            survivors[survivors] = wordlist.are_words(nodes[survivors])
+            rows = rows[survivors]
+            if len(rows) == 0:
+                break
+            result[rows] += 1
+
+        # Return the number of matched words
+        return result
+
+    @classmethod
+    def _compile_render_template(cls, text):
         """
-            Gets the rune text.
+            Compiles the render template of the given original text, which is the non-rune segments around each rune slot, both as-is and with translated punctuation.
         """
 
-        # Replace runes from the original with the newly processed runes
-        result = ''
-        rune_index = 0
-        for c in self._orig:
-            if RuneUtils.is_rune(c):
-                result += self._processed_runes[rune_index]
-                rune_index += 1
-            else:
-                if punct_translation and RuneUtils.is_punct(c):
-                    result += RuneUtils.translate_punct(c)
-                else:
-                    result += c
+        # Get from cache and mark as recently used
+        template = cls._RENDER_TEMPLATES_CACHE.get(text)
+        if template is not None:
+            cls._RENDER_TEMPLATES_CACHE.move_to_end(text)
+            return template
+
+        # Compile and evict the least recently used template if needed
+        segments = RuneUtils.split_by_runes(text)
+        template = (segments, [ RuneUtils.translate_all_punct(segment) for segment in segments ])
+        cls._RENDER_TEMPLATES_CACHE[text] = template
+        if len(cls._RENDER_TEMPLATES_CACHE) > cls._RENDER_TEMPLATES_CACHE_SIZE:
+            cls._RENDER_TEMPLATES_CACHE.popitem(last=False)
+        return template
+
+    @classmethod
+    def _compile_structure(cls, text):
+        """
+            Compiles the structure of the given original text.
+        """
+
+        # Get from cache and mark as recently used
+        structure = cls._STRUCTURES_CACHE.get(text)
+        if structure is not None:
+            cls._STRUCTURES_CACHE.move_to_end(text)
+            return structure
+
+        # Compile and evict the least recently used structure if needed
+        structure = TextStructure(text)
+        cls._STRUCTURES_CACHE[text] = structure
+        if len(cls._STRUCTURES_CACHE) > cls._STRUCTURES_CACHE_SIZE:
+            cls._STRUCTURES_CACHE.popitem(last=False)
+        return structure
+
+    def _get_structure(self):
+        """
+            Gets the structure of the original text.
+        """
+
+        # Compile unless previously compiled
+        if self._structure is None:
+            self._structure = self.__class__._compile_structure(self._orig)
+        return self._structure
+
+    def _get_render_template(self):
+        """
+            Gets the render template of the original text.
+        """
+
+        # Compile unless previously compiled
+        if self._render_template is None:
+            self._render_template = self.__class__._compile_render_template(self._orig)
+        return self._render_template
+
+    def _render(self, as_latin, punct_translation):
+        """
+            Renders the processed runes (either as runes or as Latin) into the render template, memoized until the runes change.
+        """
+
+        # Forget previous renders if the runes changed (buffers are immutable so identity is enough)
+        processed_runes = self._materialize()
+        if self._rendered_runes is not processed_runes:
+            self._rendered_runes = processed_runes
+            self._rendered = {}
 
-        # Return result
+        # Use memoized render
+        key = (as_latin, punct_translation)
+        result = self._rendered.get(key)
+        if result is not None:
+            return result
+
+        # Interleave the segments and the rendered runes
+        segments = self._get_render_template()[1 if punct_translation else 0]
+        runes = RuneUtils.indices_to_latin(processed_runes) if as_latin else RuneUtils.indices_to_rune_string(processed_runes)
+        result = ''.join(map(str.__add__, segments, runes)) + segments[-1]
+        self._rendered[key] = result
         return result
 
+    def get_rune_text(self, punct_translation=True):
+        """
+            Gets the rune text.
+        """
+
+        # Render runes
+        return self._render(False, punct_translation)
+
     def to_latin(self):
         """
             Translates to Latin.
         """
         
-        # Translate to Latin
-        text = self.get_rune_text()
-        result = []
-        for c in text:
-            if RuneUtils.is_rune(c):
-                result.append(RuneUtils.latin_at(RuneUtils.get_rune_index(c)))
-            else:
-                result.append(c)
-        all_text = ''.join(result)
+        # Render Latin
+        all_text = self._render(True, True)
 
         # Add prefix if unsolved
         if self._is_unsolved:
             all_text = f'<UNSOLVED>\n\n{all_text}'
         return all_text
 
+    @staticmethod
+    def _get_ioc_from_sums(pairs, total, alphabet_size):
+        """
+            1-gram IoC calculation given the sum of c*(c-1) over all letter counts and the total count.
+        """
+
+        # Ignore texts that are too short
+        if total < 2 or alphabet_size == 0:
+            return 0.0
+
+        # Calculate the IoC
+        return pairs / (total * (total - 1) / alphabet_size)
+
+    @staticmethod
+    def _get_ioc_from_counts(counts, alphabet_size):
+        """
+            1-gram IoC calculation given a histogram of letters.
+        """
+
+        # Use the sums
+        counts = np.asarray(counts, dtype=np.int64)
+        return ProcessedText._get_ioc_from_sums(int((counts * (counts - 1)).sum()), int(counts.sum()), alphabet_size)
+
     @staticmethod
     def _get_ioc(text, alphabet):
         """
             1-gram IoC calculation.
         """
 
-        # Take only alphabet letters
-        instance = [ c for c in text if c in alphabet ]
+        # Count in a single pass
+        counts = collections.Counter(text)
+        return ProcessedText._get_ioc_from_counts([ counts[letter] for letter in alphabet ], len(alphabet))
 
-        # Ignore zero-length
-        if len(instance) == 0 or len(alphabet) == 0:
-            return 0.0
+    def get_rune_counts(self):
+        """
+            Returns the histogram of rune indices.
+        """
+
+        # Count all rune indices at once
+        return np.bincount(np.frombuffer(self._materialize(), dtype=np.uint8), minlength=RuneUtils.size())
 
-        # Calculate the IoC
-        s = sum([ instance.count(letter) * (instance.count(letter) - 1) for letter in alphabet ])
-        d = len(instance) * (len(instance) - 1) / len(alphabet)
-        return s / d
- 
     def get_rune_ioc(self):
         """
             Returns the IoC for the runes.
         """
 
         # Calculate IoC
-        return self.__class__._get_ioc(self._processed_runes, self.__class__._RUNES)
-    
+        return self.__class__._get_ioc_from_counts(self.get_rune_counts(), RuneUtils.size())
+
+    @staticmethod
+    def get_rune_ioc_batch(rune_indices):
+        """
+            Returns the IoC for the runes of each row of a 2D matrix of rune indices, as a list.
+        """
+
+        # Count all rows at once by offsetting each row to its own histogram
+        rune_indices = np.asarray(rune_indices, dtype=np.int64)
+        size = RuneUtils.size()
+        offsets = np.arange(len(rune_indices), dtype=np.int64)[:, None] * size
+        counts = np.bincount((rune_indices + offsets).ravel(), minlength=len(rune_indices) * size).reshape(len(rune_indices), size)
+        pairs = (counts * (counts - 1)).sum(axis=1)
+        return [ ProcessedText._get_ioc_from_sums(pair, rune_indices.shape[1], size) for pair in pairs.tolist() ]
+
+    def get_ioc_tracker(self):
+        """
+            Returns an IoC tracker for the runes, which could be updated incrementally.
+        """
+
+        # Create from rune indices
+        return IocTracker(self._materialize())
+
     def get_latin_ioc(self):
         """
             Returns the latin IoC.
         """
 
-        return self.__class__._get_ioc(self.to_latin(), string.ascii_uppercase)
+        # Count Latin letters that are not derived from runes once, since they never change
+        if self._non_rune_latin_counts is None:
+            non_runes = ''.join(self._get_render_template()[1])
+            counts = collections.Counter(non_runes)
+            self._non_rune_latin_counts = np.array([ counts[letter] for letter in string.ascii_uppercase ], dtype=np.int64)
 
-    def check_measurements(self, **kwds):
+        # Combine with the Latin letters of runes, and include the unsolved prefix just like in to_latin
+        counts = self._non_rune_latin_counts + RuneUtils.rune_counts_to_latin_letter_counts(self.get_rune_counts())
+        if self._is_unsolved:
+            counts = counts + np.array([ 'UNSOLVED'.count(letter) for letter in string.ascii_uppercase ], dtype=np.int64)
+        return self.__class__._get_ioc_from_counts(counts, len(string.ascii_uppercase))
+
+    @staticmethod
+    def get_active_measurements():
         """
-            Checks measurements.
+            Gets the measurements that new instances are bound to.
         """
 
-        # We could not import measurements before due to circular dependency
-        import measurements
+        # Return the active measurements
+        return ProcessedText._ACTIVE_MEASUREMENTS
 
-        # Get measurements unless previously acquired
-        if self._measurements is None:
+    @staticmethod
+    def set_active_measurements(measurements):
+        """
+            Sets the measurements that new instances are bound to (see measurements.measurement_context).
+        """
 
-            # Inspect frames up
-            self._measurements = []
-            curr_frame = inspect.currentframe()
-            while curr_frame is not None:
-                self._measurements += measurements.get_measurements_for_function(curr_frame.f_code.co_name)
-                curr_frame = curr_frame.f_back
+        # Save the active measurements
+        ProcessedText._ACTIVE_MEASUREMENTS = measurements
+
+    def check_measurements(self, **kwds):
+        """
+            Checks the measurements that were active when the instance was created.
+        """
 
         # Run all measurements and stop at first success
         for measurement in self._measurements:
@@ -411,3 +1263,29 @@ class ProcessedText(object):
         # Indicate failure
         return False
 
+    def check_measurements_batch(self, rune_indices, kwds_list):
+        """
+            Checks measurements on each row of a 2D matrix of rune indices (e.g. as returned by transform_batch), each row with its own keywords.
+            Each measurement runs on all rows at once, and rows that pass are set as the rune indices and reported in order, just like checking them one by one.
+            The runes are restored afterwards, and the number of rows that passed is returned.
+        """
+
+        # Run all measurements on all rows
+        rune_indices = np.asarray(rune_indices, dtype=np.uint8)
+        results = [ measurement.run_measurement_batch(self, rune_indices) for measurement in self._measurements ]
+
+        # Report each row at its first success
+        processed_runes = self._processed_runes
+        num_of_passed = 0
+        for row in range(len(rune_indices)):
+            for measurement, measurement_results in zip(self._measurements, results):
+                if measurement.is_passing(measurement_results[row]):
+                    self.set_rune_indices(rune_indices[row])
+                    measurement.report(self, measurement_results[row], **kwds_list[row])
+                    num_of_passed += 1
+                    break
+
+        # Restore the runes and return the number of rows that passed
+        self._processed_runes = processed_runes
+        return num_of_passed
+
@@ -4,6 +4,9 @@ from secrets import *
 from transformers import *
 from liber_primus import LiberPrimus
 from measurements import *
+from runner import shardable
+from persistence import Checkpoint
+from search_space import *
 import screen
 
 import os
@@ -18,6 +21,7 @@ import sympy
 import subprocess
 import hashlib
 import binascii
+import numpy as np
 
 class Experiments(object):
     """
@@ -33,12 +37,8 @@ class Experiments(object):
         # Decrypt all sections
         for section in LiberPrimus.get_all_sections():
 
-            # Build the processed text
-            processed_text = ProcessedText(section=section)
-
-            # Decrypt
-            for transformer in section.transformers:
-                transformer.transform(processed_text)
+            # Get the decrypted processed text
+            processed_text = section.get_plaintext()
 
             # Optionally skip unsolved
             if only_solved and processed_text.is_unsolved():
@@ -109,16 +109,13 @@ class Experiments(object):
         unsolved_sections = ResearchUtils.get_unsolved_sections()
         max_runes = max([ ProcessedText(section=section).get_num_of_runes() for section in unsolved_sections ])
 
-        # Build a primes cache
-        with tqdm(desc='Building primes cache') as pbar:
-            max_prime = MathUtils.find_next_prime(start_val_limit)
-            primes = [ 2 ]
-            while max_prime not in primes:
-                primes.append(MathUtils.find_next_prime(primes[-1]))
-                pbar.update(1)
-            for i in range((skip_limit + 1) * max_runes):
-                primes.append(MathUtils.find_next_prime(primes[-1]))
-                pbar.update(1)
+        # Take primes up to the first prime beyond the start value limit, with enough primes to skip from there
+        primes = MathUtils.get_primes(0, MathUtils.prime_count(start_val_limit) + 1 + (skip_limit + 1) * max_runes)
+        emirps = np.array([ int(str(p)[::-1]) for p in primes.tolist() ], dtype=np.int64)
+
+        # Keystreams are substructed from the header runes, and interrupters are checked against the same dictionary as the measurement
+        transformer = KeystreamTransformer()
+        dictionary = ResearchUtils.get_english_dictionary_trie()
 
         # Either reverse or not
         for rev_option in (False, True):
@@ -126,59 +123,56 @@ class Experiments(object):
             # Iterate all unsolved sections
             for section in unsolved_sections:
 
-                # Get the section number of runes
-                section_runes_len = ProcessedText(section=section).get_num_of_runes()
-
                 # Optionally reverse
                 text = section.get_all_text()
                 if rev_option:
                     text = text[::-1]
+                section_pt = ProcessedText(rune_text=text, section=section)
+                section_runes_len = section_pt.get_num_of_runes()
 
-                # Get header words
-                header_pt = ProcessedText(rune_text=text.split('.')[0], section=section)
-                header_words = header_pt.get_rune_words()
-                if len(header_words) == 0:
+                # Only the header runes are decrypted, as a view of the first sentence
+                pt = section_pt.get_sentence_view(0)
+                if pt.get_num_of_words() == 0:
                     continue
+                key_offsets = np.arange(pt.get_num_of_runes())
 
                 # Iterate all potential prime keys
                 for skip in tqdm(range(1, skip_limit), desc=f'Section "{section.name}" (rev={rev_option})'):
-                    for start_index in range(0, len(primes) - skip*section_runes_len):
-                       
-                        # Take interrupters into account
-                        gen = ResearchUtils.iterate_potential_interrupter_indices(header_pt) if consider_interrupters else [[]]
-                        for interrupt_indices in gen:
-
-                            # Build primes key
-                            key = [ primes[i] for i in range(start_index, start_index + skip * section_runes_len, skip) ]
-
-                            # Check for primes
-                            pt = ProcessedText(rune_text=' '.join(header_words), section=section)
-                            KeystreamTransformer(keystream=iter(key), interrupt_indices=interrupt_indices).transform(pt)
-                            pt.check_measurements(key=key, mode='Primes', skip=skip, start=key[0])
-                            
-                            # Check for abs(3301 - primes)
-                            pt.revert()
-                            key_abs = [ abs(3301 - i) for i in key ]
-                            KeystreamTransformer(keystream=iter(key_abs), interrupt_indices=interrupt_indices).transform(pt)
-                            pt.check_measurements(key=key, mode='Func15', skip=skip, start=key[0])
-
-                            # Check Totient of primes
+                    start_indices = np.arange(0, len(primes) - skip*section_runes_len)
+
+                    # Work on chunks of start indices to keep the keystream matrices small
+                    for chunk_start in range(0, len(start_indices), 4096):
+
+                        # Build primes keys and their variants (primes, abs(3301 - primes), Totient of primes, abs(3301 - tot(primes)) and emirps)
+                        key_indices = start_indices[chunk_start:chunk_start + 4096, None] + key_offsets[None, :] * skip
+                        keys = primes[key_indices]
+                        variants = [
+                            ('Primes', keys, keys),
+                            ('Func15', np.abs(3301 - keys), keys),
+                            ('Totient', keys - 1, keys - 1),
+                            ('Func15-Totient', np.abs(3301 - (keys - 1)), keys - 1),
+                            ('Emirps', emirps[key_indices], emirps[key_indices])
+                        ]
+
+                        # Check all variants, always decrypting the header runes (checking measurements sets the decrypted runes)
+                        for mode, keystreams, reported_keys in variants:
                             pt.revert()
-                            key = [ i - 1 for i in key ]
-                            KeystreamTransformer(keystream=iter(key), interrupt_indices=interrupt_indices).transform(pt)
-                            pt.check_measurements(key=key, mode='Totient', skip=skip, start=key[0])
 
-                            # Check for abs(3301 - tot(primes))
-                            pt.revert()
-                            key_abs = [ abs(3301 - i) for i in key ]
-                            KeystreamTransformer(keystream=iter(key_abs), interrupt_indices=interrupt_indices).transform(pt)
-                            pt.check_measurements(key=key, mode='Func15-Totient', skip=skip, start=key[0])
-
-                            # Build mirpe key
-                            pt.revert()
-                            key = [ int(str(i + 1)[::-1]) for i in key ]
-                            KeystreamTransformer(keystream=iter(key), interrupt_indices=interrupt_indices).transform(pt)
-                            pt.check_measurements(key=key, mode='Emirps', skip=skip, start=key[0])
+                            # Take interrupters into account, only decrypting keystreams for which all words are in the dictionary
+                            if consider_interrupters:
+                                for interrupt_indices, rows, results in ResearchUtils.iterate_interrupter_decryptions(pt, -keystreams, dictionary):
+                                    for row, result in zip(rows.tolist(), results):
+                                        pt.set_rune_indices(result)
+                                        key = reported_keys[row].tolist()
+                                        pt.check_measurements(key=key, mode=mode, skip=skip, start=key[0], interrupt_indices=interrupt_indices)
+                                continue
+
+                            # Decrypt all keystreams
+                            results = transformer.transform_batch(pt, keystreams)
+                            for row in range(len(results)):
+                                pt.set_rune_indices(results[row])
+                                key = reported_keys[row].tolist()
+                                pt.check_measurements(key=key, mode=mode, skip=skip, start=key[0])
 
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
@@ -192,6 +186,11 @@ class Experiments(object):
         # Iterate all sections
         for section in ResearchUtils.get_unsolved_sections():
 
+            # Reverse once and keep a snapshot of the reversed text
+            pt = ProcessedText(section=section)
+            ReverseTransformer().transform(pt)
+            reversed_snapshot = pt.snapshot()
+
             # Iterate all number of totient operations
             for tot_call_count in tqdm(range(1, 3), desc=f'Section "{section.name}"'):
                
@@ -202,8 +201,7 @@ class Experiments(object):
                     for emirp_val in (False, True):
 
                         # Try reversing and then run totient index manipulation
-                        pt = ProcessedText(section=section)
-                        ReverseTransformer().transform(pt)
+                        pt.restore(reversed_snapshot)
                         TotientPrimeTransformer(tot_calls=tot_call_count, add=add_option, emirp=emirp_val).transform(pt)
                         pt.check_measurements()
 
@@ -283,37 +281,35 @@ class Experiments(object):
             FibonacciKeystreamTransformer(start_a=1, start_b=2)
         ]
 
+        # All math transformers are additive so all orderings of a subset are equivalent and compose into a single transformer
+        math_pipelines = []
+        for transformer_subset in MathUtils.get_all_subsets(math_transformers):
+            for transformer_order in KeystreamComposer.iter_distinct_orderings(transformer_subset):
+                math_pipelines.append((transformer_order, (KeystreamComposer(transformer_order),) if len(transformer_order) > 0 else ()))
+
+        # Build all pipelines of Autokey and the math transformers, applying Autokey either first or last
+        pipelines = []
+        pipeline_params = []
+        for rune in [ RuneUtils.rune_at(index) for index in range(RuneUtils.size()) ]:
+            for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
+                autokey_transformer = AutokeyTransformer(key=rune, mode=mode)
+                for transformer_order, math_pipeline in math_pipelines:
+                    math_order = ', '.join([ transformer.__class__.__name__ for transformer in transformer_order ])
+                    pipelines.append((autokey_transformer,) + math_pipeline)
+                    pipeline_params.append(dict(mode=mode, rune=rune, math_order=math_order, autokey_order='AutokeyThenMath'))
+                    pipelines.append(math_pipeline + (autokey_transformer,))
+                    pipeline_params.append(dict(mode=mode, rune=rune, math_order=math_order, autokey_order='MathThenAutokey'))
+
         # Iterate all sections
-        runes = [ RuneUtils.rune_at(index) for index in range(RuneUtils.size()) ]
+        executor = PipelineExecutor(pipelines)
         for section in ResearchUtils.get_unsolved_sections():
 
-            # Process section
+            # Run all pipelines, sharing the results of common pipeline prefixes (e.g. math transformers before Autokey)
             pt = ProcessedText(section=section)
+            for pipeline_index in tqdm(executor.run(pt), total=len(pipelines), desc=f'Section {section.name}'):
+                pt.check_measurements(**pipeline_params[pipeline_index])
 
-            # Iterate all runes as keys
-            for rune in tqdm(runes, desc=f'Section {section.name}'):
-
-                # Iterate all Autokey modes
-                for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
-
-                    # Iterate all subsets of the math transformers
-                    for transformer_subset in MathUtils.get_all_subsets(math_transformers):
-                        for transformer_order in itertools.permutations(transformer_subset):
-
-                            # Apply Autokey and then transformers
-                            pt.revert()
-                            AutokeyTransformer(key=rune, mode=mode).transform(pt)
-                            for transformer in transformer_order:
-                                transformer.transform(pt)
-                            pt.check_measurements(mode=mode, rune=rune, math_order=', '.join([ transformer.__class__.__name__ for transformer in transformer_order ]), autokey_order='AutokeyThenMath')
-
-                            # Apply transformers and then Autokey
-                            pt.revert()
-                            for transformer in transformer_order:
-                                transformer.transform(pt)
-                            AutokeyTransformer(key=rune, mode=mode).transform(pt)
-                            pt.check_measurements(mode=mode, rune=rune, math_order=', '.join([ transformer.__class__.__name__ for transformer in transformer_order ]), autokey_order='MathThenAutokey')
-
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
     @staticmethod
@@ -332,22 +328,27 @@ class Experiments(object):
         keys = set(keys)
 
         # Iterate all sections
+        keys = list(ResearchUtils.iter_shard(keys))
+        alphabet = Alphabet.get()
         for section in ResearchUtils.get_unsolved_sections():
 
-            # Iterate all keys
-            for key in tqdm(keys, desc=f'Section {section.name}'):
+            # Process text
+            pt = ProcessedText(section=section)
 
-                # Process text
-                pt = ProcessedText(section=section)
+            # Iterate chunks of keys, decrypting each chunk with all keys at once
+            with tqdm(total=len(keys), desc=f'Section {section.name}') as pbar:
+                for chunk_start in range(0, len(keys), 256):
+                    chunk = keys[chunk_start:chunk_start + 256]
+                    key_matrix, key_lengths = alphabet.keys_to_matrix(chunk)
 
-                # Iterate all grouping sizes
-                for grouping_size in range(1, max_grouping_size + 1):
+                    # Apply Vigenere with all grouping sizes
+                    results = [ VigenereTransformer(key=chunk[0], grouping_size=grouping_size).transform_batch(pt, key_matrix, key_lengths) for grouping_size in range(1, max_grouping_size + 1) ]
 
-                    # Apply Vigenere
-                    pt.revert()
-                    VigenereTransformer(key=key, grouping_size=grouping_size).transform(pt)
-                    pt.check_measurements(key=key, grouping_size=grouping_size)
+                    # Check key by key, in the order of grouping sizes
+                    pt.check_measurements_batch(np.stack(results, axis=1).reshape(-1, pt.get_num_of_runes()), [ dict(key=key, grouping_size=grouping_size) for key in chunk for grouping_size in range(1, max_grouping_size + 1) ])
+                    pbar.update(len(chunk))
 
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
     @staticmethod
@@ -368,60 +369,49 @@ class Experiments(object):
         keys = set(keys)
 
         # Iterate all sections
+        keys = list(ResearchUtils.iter_shard(keys))
+        alphabet = Alphabet.get()
+        size = RuneUtils.size()
         for section in ResearchUtils.get_unsolved_sections():
 
-            # Iterate all keys
-            for key in tqdm(keys, desc=f'Section {section.name}'):
-              
-                # Attempt Vigenere
-                pt = ProcessedText(section=section)
-                VigenereTransformer(key=key).transform(pt)
-                pt.check_measurements(mode='Vigenere', key=key)
-
-                # Attempts the Totient of the primes too
-                TotientPrimeTransformer().transform(pt)
-                pt.check_measurements(mode='VigenereWithTotients', key=key)
-
-                # Attempts the primes on Vigenere
-                pt.revert()
-                VigenereTransformer(key=key).transform(pt)
-                TotientPrimeTransformer(tot_calls=0).transform(pt)
-                pt.check_measurements(mode='VigenereWithPrimes', key=key)
-               
-                # Attempts Totient of primes and then Vigenere
-                pt.revert()
-                TotientPrimeTransformer().transform(pt)
-                VigenereTransformer(key=key).transform(pt)
-                pt.check_measurements(mode='TotientsWithVigenere', key=key)
-
-                # Iterate all modes
-                for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
-
-                    # Either try or do not try GP-mode
-                    for use_gp in (False, True):
-
-                        # Revert previous runs
-                        pt.revert()
-
-                        # Apply Autokey
-                        AutokeyTransformer(key=key, mode=mode, use_gp=use_gp).transform(pt)
-                        pt.check_measurements(mode=f'Autokey {mode}', key=key)
-
-                        # Reverse
-                        ReverseTransformer().transform(pt)
-                        pt.check_measurements(mode=f'Autokey {mode} then reversing', key=key)
-
-                        # Start from reversing and then apply Autokey
-                        pt.revert()
-                        ReverseTransformer().transform(pt)
-                        AutokeyTransformer(key=key, mode=mode, use_gp=use_gp).transform(pt)
-                        pt.check_measurements(mode=f'Reversing then Autokey {mode}', key=key)
-
-                        # Attempts Totient of primes and Autokey
-                        pt.revert()
-                        TotientPrimeTransformer().transform(pt)
-                        AutokeyTransformer(key=key, mode=mode, use_gp=use_gp).transform(pt)
-                        pt.check_measurements(mode=f'Autokey {mode}', key=key)
+            # Prepare the text, its reversal and the text after substructing the Totient of primes
+            pt = ProcessedText(section=section)
+            reversed_pt = ProcessedText.from_processed_text(pt)
+            ReverseTransformer().transform(reversed_pt)
+            totients_pt = ProcessedText.from_processed_text(pt)
+            TotientPrimeTransformer().transform(totients_pt)
+
+            # Prepare the keystreams of the Totient of primes and of the primes
+            totients_keystream = TotientPrimeTransformer().get_keystream(pt.get_num_of_runes())
+            primes_keystream = TotientPrimeTransformer(tot_calls=0).get_keystream(pt.get_num_of_runes())
+
+            # Iterate chunks of keys, decrypting each chunk with all keys at once
+            with tqdm(total=len(keys), desc=f'Section {section.name}') as pbar:
+                for chunk_start in range(0, len(keys), 128):
+                    chunk = keys[chunk_start:chunk_start + 128]
+                    key_matrix, key_lengths = alphabet.keys_to_matrix(chunk)
+
+                    # Attempt Vigenere, the Totient of primes and the primes on Vigenere and the Totient of primes and then Vigenere
+                    vigenere = VigenereTransformer(key=chunk[0])
+                    vigenere_results = vigenere.transform_batch(pt, key_matrix, key_lengths)
+                    results = [ vigenere_results, ((vigenere_results + totients_keystream) % size).astype(np.uint8), ((vigenere_results + primes_keystream) % size).astype(np.uint8), vigenere.transform_batch(totients_pt, key_matrix, key_lengths) ]
+                    modes = [ 'Vigenere', 'VigenereWithTotients', 'VigenereWithPrimes', 'TotientsWithVigenere' ]
+
+                    # Iterate all modes
+                    for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
+
+                        # Either try or do not try GP-mode
+                        for use_gp in (False, True):
+
+                            # Attempt Autokey, then reversing, reversing and then Autokey and the Totient of primes and then Autokey
+                            autokey = AutokeyTransformer(key=chunk[0], mode=mode, use_gp=use_gp)
+                            autokey_results = autokey.transform_batch(pt, key_matrix, key_lengths)
+                            results += [ autokey_results, autokey_results[:, ::-1], autokey.transform_batch(reversed_pt, key_matrix, key_lengths), autokey.transform_batch(totients_pt, key_matrix, key_lengths) ]
+                            modes += [ f'Autokey {mode}', f'Autokey {mode} then reversing', f'Reversing then Autokey {mode}', f'Autokey {mode}' ]
+
+                    # Check key by key, in the order of attempts
+                    pt.check_measurements_batch(np.stack(results, axis=1).reshape(-1, pt.get_num_of_runes()), [ dict(mode=mode, key=key) for key in chunk for mode in modes ])
+                    pbar.update(len(chunk))
 
     @measurement(PrefixWordsMeasurement(threshold=6))
     @measurement(IocMeasurement(threshold=1.8))
@@ -523,12 +513,12 @@ class Experiments(object):
 
                 # Try the Totient of the Fibonacci-indexed primes
                 pt.revert()
-                KeystreamTransformer(add=add_option, keystream=map(lambda x:sympy.totient(x), MathUtils.get_fibo_primes())).transform(pt)
+                KeystreamTransformer(add=add_option, keystream=map(MathUtils.totient, MathUtils.get_fibo_primes())).transform(pt)
                 pt.check_measurements(mode='Totient-fibonacci-primes', add=add_option)
                 
                 # Try the Totient of the function from page 15 on Fibonacci indexed primes
                 pt.revert()
-                KeystreamTransformer(add=add_option, keystream=map(lambda x:abs(3301 - sympy.totient(x)), MathUtils.get_fibo_primes())).transform(pt)
+                KeystreamTransformer(add=add_option, keystream=map(lambda x:abs(3301 - MathUtils.totient(x)), MathUtils.get_fibo_primes())).transform(pt)
                 pt.check_measurements(mode='Func15-totient-fibonacci-primes', add=add_option)
               
                 # Try on Fibonacci-indexed primes without the page 15 function
@@ -591,17 +581,26 @@ class Experiments(object):
         # Iterate all sections
         for section in ResearchUtils.get_unsolved_sections():
 
+            # Decrypt with all squares of the same size at once, either inverse or not
+            pt = ProcessedText(section=section)
+            results = {}
+            for size in sorted(set([ square.rows for square in squares ])):
+                square_indices = [ index for index in range(len(squares)) if squares[index].rows == size ]
+                for inverse_option in (False, True):
+                    transformer = HillCipherTransformer(matrix=squares[square_indices[0]], inverse=inverse_option)
+                    for index, result in zip(square_indices, transformer.transform_batch(pt, [ squares[index] for index in square_indices ])):
+                        results[(index, inverse_option)] = result
+
             # Iterate all squares
             square_index = -1
-            for square in tqdm(squares, desc=f'Section "{section.name}"'):
+            for index in tqdm(range(len(squares)), desc=f'Section "{section.name}"'):
                 
                 # Either inverse or not
                 for inverse_option in (False, True):
 
                     # Use Hill cipher
                     square_index += 1
-                    pt = ProcessedText(section=section)
-                    HillCipherTransformer(matrix=square, inverse=inverse_option).transform(pt)
+                    pt.set_rune_indices(results[(index, inverse_option)])
                     pt.check_measurements(square=square_index, inverse=inverse_option)
 
     @measurement(PrefixWordsMeasurement(threshold=3))
@@ -652,11 +651,9 @@ class Experiments(object):
         for section in tqdm(LiberPrimus.get_all_sections(), desc='Building streams from sections'):
 
             # Process text and skip unsolved sections
-            pt = ProcessedText(section=section)
-            for transformer in section.transformers:
-                transformer.transform(pt)
-            if pt.is_unsolved():
+            if not section.is_solved():
                 continue
+            pt = section.get_plaintext()
 
             # Work on either encrypted or decrypted section
             for use_enc in (False, True):
@@ -725,11 +722,10 @@ class Experiments(object):
 
         # Build primes and the Fibonacci sequence
         max_value = max([ max(stream) for stream in streams ])
-        primes = [ 2 ]
+        primes = MathUtils.get_primes(0, max_value).tolist()
         fibonacci = [ 1, 2 ]
-        with tqdm(total=max_value - 1, desc=f'Building primes and Fibonacci numbers for stream values') as pbar:
-            while len(primes) < max_value:
-                primes.append(MathUtils.find_next_prime(primes[-1]))
+        with tqdm(total=max_value - 1, desc=f'Building Fibonacci numbers for stream values') as pbar:
+            while len(fibonacci) <= max_value:
                 fibonacci.append(fibonacci[-2] + fibonacci[-1])
                 pbar.update(1)
         
@@ -763,7 +759,7 @@ class Experiments(object):
 
                         # Take the totients of the keystream
                         pt.revert()
-                        totients = [ MathUtils.totient(val) for val in base_stream ]
+                        totients = MathUtils.get_totients(base_stream)
                         KeystreamTransformer(keystream=iter(totients), add=add_option).transform(pt)
                         pt.check_measurements(stream=stream_index, add=add_option, mode='Totients', reverse=rev_option)
 
@@ -781,13 +777,13 @@ class Experiments(object):
 
                         # Use Totient value of the prime indices
                         pt.revert()
-                        totient_prime_indices = [ MathUtils.totient(val) for val in prime_indices ]
+                        totient_prime_indices = MathUtils.get_totients(prime_indices)
                         KeystreamTransformer(keystream=iter(totient_prime_indices), add=add_option).transform(pt)
                         pt.check_measurements(stream=stream_index, add=add_option, mode='TotientOfPrimeIndices', rev=rev_option)
 
                         # Use Totient value of the Emirp indices
                         pt.revert()
-                        totient_emirp_indices = [ MathUtils.totient(val) for val in emirp_indices ]
+                        totient_emirp_indices = MathUtils.get_totients(emirp_indices)
                         KeystreamTransformer(keystream=iter(totient_emirp_indices), add=add_option).transform(pt)
                         pt.check_measurements(stream=stream_index, add=add_option, mode='TotientOfEmirpIndices', rev=rev_option)
 
@@ -798,7 +794,7 @@ class Experiments(object):
                         pt.check_measurements(stream=stream_index, add=add_option, mode='FibonacciIndices', rev=rev_option)
 
                         # Only take primes from the keystream
-                        primes_ks = [ val for val in base_stream if sympy.isprime(val) ]
+                        primes_ks = [ val for val in base_stream if MathUtils.is_prime(val) ]
                         if len(primes_ks) == 0:
                             continue
                         pt.revert()
@@ -806,7 +802,7 @@ class Experiments(object):
                         pt.check_measurements(stream=stream_index, add=add_option, mode='Primes', rev=rev_option)
 
                         # Take the Totient value of the primes
-                        tot_primes_ks = [ MathUtils.totient(val) for val in primes_ks ]
+                        tot_primes_ks = MathUtils.get_totients(primes_ks)
                         pt.revert()
                         KeystreamTransformer(keystream=iter(tot_primes_ks), add=add_option).transform(pt)
                         pt.check_measurements(stream=stream_index, add=add_option, mode='TotientOfPrimes', rev=rev_option)
@@ -848,14 +844,10 @@ class Experiments(object):
         lp1_encrypted_runes = []
         lp1_decrypted_runes = []
         for section in LiberPrimus.get_all_sections():
-            pt = ProcessedText(section=section)
-            lp1_encrypted_runes += pt.get_runes()
-            for transformer in section.transformers:
-                transformer.transform(pt)
-            if pt.is_unsolved():
-                lp1_encrypted_runes = lp1_encrypted_runes[:len(lp1_decrypted_runes)]
+            if not section.is_solved():
                 break
-            lp1_decrypted_runes += pt.get_runes()
+            lp1_encrypted_runes += ProcessedText(section=section).get_runes()
+            lp1_decrypted_runes += section.get_plaintext().get_runes()
 
         # Iterate all sections
         for section in ResearchUtils.get_unsolved_sections():
@@ -883,6 +875,7 @@ class Experiments(object):
             pt.set_runes([ lp1_decrypted_runes[RuneUtils.gp_at(RuneUtils.get_rune_index(rune)) - 1] for rune in pt.get_runes() ])
             pt.check_measurements(mode='GpValuesIndices')
 
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
     @staticmethod
@@ -893,35 +886,35 @@ class Experiments(object):
 
         # Generate primes
         assert max_skip > 0, Exception('Skip value must be strictly positive')
-        assert sympy.isprime(max_start_value), Exception('Maximal start value must be prime')
+        assert MathUtils.is_prime(max_start_value), Exception('Maximal start value must be prime')
         unsolved_sections = ResearchUtils.get_unsolved_sections()
         max_runes = max([ ProcessedText(section=section).get_num_of_runes() for section in unsolved_sections ])
-        primes = [ 2 ]
-        start_values = [ 2 ]
-        with tqdm(desc='Generating initial primes') as pbar:
-            while max_start_value not in primes:
-                primes.append(MathUtils.find_next_prime(primes[-1]))
-                start_values.append(primes[-1])
-                pbar.update(1)
-        for i in tqdm(range((max_skip + 1) * max_runes), desc='Extending primes'):
-            primes.append(MathUtils.find_next_prime(primes[-1]))
+        start_values = MathUtils.get_primes(0, MathUtils.index_of(max_start_value) + 1).tolist()
+        primes = MathUtils.get_primes(0, len(start_values) + (max_skip + 1) * max_runes)
 
         # Iterate all sections
+        skip_values = np.arange(1, max_skip + 1)
         for section in unsolved_sections:
 
-            # Iterate all start values and skip values
+            # Iterate all start values
+            pt = ProcessedText(section=section)
             with tqdm(desc=f'Section "{section.name}"', total=max_skip * len(start_values)) as pbar:
-                for start_value in start_values:
-                    for skip_value in range(1, max_skip + 1):
+                for prime_index in ResearchUtils.iter_shard(range(len(start_values))):
 
-                        # Either adding or substructing
-                        for add_option in (False, True):
+                    # Build the prime sequences for all skip values at once
+                    start_value = start_values[prime_index]
+                    keystreams = primes[prime_index + np.arange(pt.get_num_of_runes())[None, :] * skip_values[:, None]]
+
+                    # Either adding or substructing
+                    for add_option in (False, True):
+
+                        # Apply all the prime sequences
+                        pt.revert()
+                        results = KeystreamTransformer(add=add_option).transform_batch(pt, keystreams)
+                        for skip_value in skip_values.tolist():
 
                             # Use the prime sequence
-                            pt = ProcessedText(section=section)
-                            prime_index = primes.index(start_value)
-                            ks = [ primes[i] for i in range(prime_index, prime_index + skip_value * max_runes, skip_value) ]
-                            KeystreamTransformer(add=add_option, keystream=iter(ks)).transform(pt)
+                            pt.set_rune_indices(results[skip_value - 1])
                             pt.check_measurements(start_value=start_value, add=add_option, skip=skip_value, mode='AsIs')
 
                             # Try Atbash
@@ -936,8 +929,8 @@ class Experiments(object):
                                 ShiftTransformer(shift=1).transform(pt)
                                 pt.check_measurements(start_value=start_value, add=add_option, skip=skip_value, shift=shift_value, mode='Shift')
                         
-                        # Update progrsss bar
-                        pbar.update(1)
+                    # Update progrsss bar
+                    pbar.update(max_skip)
 
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4)) 
@@ -1047,14 +1040,17 @@ class Experiments(object):
     @measurement(PrefixWordsMeasurement(threshold=4))
     @measurement(IocMeasurement(threshold=1.8)) 
     @staticmethod
-    def primes_indexed_by_totient_keystream(consider_interrupters=False):
+    def primes_indexed_by_totient_keystream(consider_interrupters=False, interrupters_num_of_words=4):
         """
             Performs a keystream manipulation on runes based on the primes that are indexed by the Totient of the natural numbers.
+            Interrupters are searched for by only checking those for which the first words are in the dictionary.
         """
 
+        # Interrupters are checked against the same dictionary as the measurement
+        dictionary = ResearchUtils.get_english_dictionary_trie()
+
         # Saves the keystream
         keystream = [ 2 ]
-        primes = [ 2 ]
 
         # Iterate all sections
         for section in tqdm(ResearchUtils.get_unsolved_sections()):
@@ -1063,33 +1059,36 @@ class Experiments(object):
             pt = ProcessedText(section=section)
             while len(keystream) < pt.get_num_of_runes():
                 next_tot = MathUtils.totient(len(keystream) + 1)
-                while len(primes) <= next_tot:
-                    primes.append(MathUtils.find_next_prime(primes[-1]))
-                keystream.append(primes[next_tot - 1])
+                keystream.append(MathUtils.prime_at(next_tot - 1))
 
             # Either add or substruct
             for add_option in (False, True):
 
-                # Consider interrupters
+                # Consider interrupters, only decrypting with those for which the first words are in the dictionary
                 pt = ProcessedText(section=section)
-                gen = ResearchUtils.iterate_potential_interrupter_indices(pt) if consider_interrupters else [[]]
-                for interrupt_indices in gen:
-
-                    # Revert processed text
-                    pt.revert()
+                transformer = KeystreamTransformer(add=add_option, keystream=iter(keystream))
+                if consider_interrupters:
+                    for interrupt_indices, _, results in ResearchUtils.iterate_interrupter_decryptions(pt, [ transformer.get_keystream(pt.get_num_of_runes()) ], dictionary, num_of_words=interrupters_num_of_words):
+                        pt.set_rune_indices(results[0])
+                        pt.check_measurements(add=add_option, interrupt_indices=interrupt_indices)
+                    continue
 
-                    # Apply keystream
-                    KeystreamTransformer(add=add_option, keystream=iter(keystream), interrupt_indices=interrupt_indices).transform(pt)
-                    pt.check_measurements(add=add_option)
+                # Apply keystream
+                transformer.transform(pt)
+                pt.check_measurements(add=add_option)
 
     @measurement(PrefixWordsMeasurement(threshold=4))
     @measurement(IocMeasurement(threshold=1.8)) 
     @staticmethod
-    def fibonacci_sequence_keystream_bruteforce(consider_interrupters=False):
+    def fibonacci_sequence_keystream_bruteforce(consider_interrupters=False, interrupters_num_of_words=4):
         """
             Performs a keystream manipulation on runes based on Fibonacci sequence starting at every two numbers between 0 and 28.
+            Interrupters are searched for by only checking those for which the first words are in the dictionary.
         """
 
+        # Interrupters are checked against the same dictionary as the measurement
+        dictionary = ResearchUtils.get_english_dictionary_trie()
+
         # Iterate all sections
         for section in ResearchUtils.get_unsolved_sections():
 
@@ -1101,21 +1100,23 @@ class Experiments(object):
                         # Either add or substruct
                         for add_option in (False, True):
 
-                            # Consider interrupters
+                            # Consider interrupters, only decrypting with those for which the first words are in the dictionary
                             pt = ProcessedText(section=section)
-                            gen = ResearchUtils.iterate_potential_interrupter_indices(pt) if consider_interrupters else [[]]
-                            for interrupt_indices in gen:
-
-                                # Revert processed text
-                                pt.revert()
+                            transformer = FibonacciKeystreamTransformer(add=add_option, start_a=start_a, start_b=start_b)
+                            if consider_interrupters:
+                                for interrupt_indices, _, results in ResearchUtils.iterate_interrupter_decryptions(pt, [ transformer.get_keystream(pt.get_num_of_runes()) ], dictionary, num_of_words=interrupters_num_of_words):
+                                    pt.set_rune_indices(results[0])
+                                    pt.check_measurements(start_a=start_a, start_b=start_b, add=add_option, interrupt_indices=interrupt_indices)
+                                continue
 
-                                # Apply keystream
-                                FibonacciKeystreamTransformer(add=add_option, start_a=start_a, start_b=start_b, interrupt_indices=interrupt_indices).transform(pt)
-                                pt.check_measurements(start_a=start_a, start_b=start_b, add=add_option)
+                            # Apply keystream
+                            transformer.transform(pt)
+                            pt.check_measurements(start_a=start_a, start_b=start_b, add=add_option)
 
                         # Update progress bar
                         pbar.update(1)
 
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=4))
     @measurement(IocMeasurement(threshold=1.6)) 
     @staticmethod
@@ -1128,26 +1129,23 @@ class Experiments(object):
         alphabet_prefix_options = [ ''.join(set(word)) for word in ResearchUtils.get_rune_wordlist() if len(word) >= min_alphabet_prefix_len ]
         alphabet_prefix_options = [ '' ] + alphabet_prefix_options
 
-        # Iterate all sections
-        for section in ResearchUtils.get_unsolved_sections():
-
-            # Iterate all start values
-            with tqdm(total=RuneUtils.size() * (RuneUtils.size() - 1) * max_period, desc=f'Section "{section.name}"') as pbar:
-                for period in range(1, max_period + 1):
-                    for periodic_increment in range(1, RuneUtils.size()):
-                        for initial_shift in range(RuneUtils.size()):
-
-                            # Iterate mixed alphabet
-                            pt = ProcessedText(section=section)
-                            for alphabet_prefix_option in alphabet_prefix_options:
-
-                                # Run cipher
-                                pt.revert()
-                                AlbertiTransformer(period=period, periodic_increment=periodic_increment, initial_shift=initial_shift, alphabet_prefix=alphabet_prefix_option).transform(pt)
-                                pt.check_measurements(period=period, periodic_increment=periodic_increment, initial_shift=initial_shift, alphabet_prefix=alphabet_prefix_option)
-
-                            # Update progress bar
-                            pbar.update(1)
+        # Declare the search space
+        unsolved_sections = ResearchUtils.get_unsolved_sections()
+        space = Product(Dimension('section', unsolved_sections),
+                        Dimension('period', range(1, max_period + 1)),
+                        Dimension('periodic_increment', range(1, RuneUtils.size())),
+                        Dimension('initial_shift', range(RuneUtils.size())),
+                        Dimension('alphabet_prefix', alphabet_prefix_options))
+
+        # Iterate the search space
+        processed_texts = { section.name: ProcessedText(section=section) for section in unsolved_sections }
+        for params in tqdm(ResearchUtils.iter_shard(space), desc='Alberti configurations'):
+
+            # Run cipher
+            pt = processed_texts[params['section'].name]
+            pt.revert()
+            AlbertiTransformer(period=params['period'], periodic_increment=params['periodic_increment'], initial_shift=params['initial_shift'], alphabet_prefix=params['alphabet_prefix']).transform(pt)
+            pt.check_measurements(period=params['period'], periodic_increment=params['periodic_increment'], initial_shift=params['initial_shift'], alphabet_prefix=params['alphabet_prefix'])
 
     @measurement(PrefixWordsMeasurement(threshold=4))
     @measurement(IocMeasurement(threshold=1.6)) 
@@ -1205,12 +1203,10 @@ class Experiments(object):
         """
 
         # Validations
-        assert sympy.isprime(max_start_value), Exception('Maximum start value must be prime')
+        assert MathUtils.is_prime(max_start_value), Exception('Maximum start value must be prime')
 
         # Build primes
-        primes = [ 2 ]
-        while max_start_value not in primes:
-            primes.append(MathUtils.find_next_prime(primes[-1]))
+        primes = MathUtils.get_primes(0, MathUtils.index_of(max_start_value) + 1).tolist()
         rev_primes = primes[::-1]
 
         # Iterate all sections
@@ -1233,7 +1229,7 @@ class Experiments(object):
 
                     # Try Totients
                     pt.revert()
-                    KeystreamTransformer(keystream=map(sympy.totient, ks), add=add_option).transform(pt)
+                    KeystreamTransformer(keystream=iter(MathUtils.get_totients(ks)), add=add_option).transform(pt)
                     pt.check_measurements(start_value=ks[0], add=add_option, mode='Totients')
 
     @measurement(PrefixWordsMeasurement(threshold=3))
@@ -1286,17 +1282,13 @@ class Experiments(object):
         # Gain statistics on solved pages
         for section in tqdm(LiberPrimus.get_all_sections(), desc=f'Building {n}-gram mapping'):
 
-            # Build the processed text
-            pt = ProcessedText(section=section)
-
-            # Decrypt
-            for transformer in section.transformers:
-                transformer.transform(pt)
-
             # Skip non-solved
-            if pt.is_unsolved():
+            if not section.is_solved():
                 continue
 
+            # Get the decrypted processed text
+            pt = section.get_plaintext()
+
             # Get runes and optionally extend padding by one rune ("F")
             runes = pt.get_runes()
             while len(runes) % n != 0:
@@ -1363,41 +1355,43 @@ class Experiments(object):
         keys = [ k for k in keys if len(k) > min_key_len ]
         keys = set(keys)
 
-        # Iterate all sections
-        for section in ResearchUtils.get_unsolved_sections():
+        # Iterate all sections and resume from the last checkpoint
+        with Checkpoint('vigenere_keyswitch_bruteforce', min_key_len=min_key_len) as checkpoint:
+            for section in ResearchUtils.get_unsolved_sections():
 
-            # Define processed text
-            pt = ProcessedText(section=section)
+                # Define processed text
+                pt = ProcessedText(section=section)
 
-            # Iterate all key pairs
-            key_pairs = list(itertools.permutations(keys, 2))
-            for key_pair in tqdm(key_pairs, desc=f'Section "{section.name}"'):
+                # Iterate all key pairs in a stable order
+                key_pairs = list(itertools.permutations(sorted(keys), 2))
+                stage = section.name
+                for key_pair in tqdm(checkpoint.iterate(stage, key_pairs), total=len(key_pairs), initial=checkpoint.get_position(stage), desc=f'Section "{section.name}"'):
 
-                # Define the key indices
-                key_values = [ [ RuneUtils.get_rune_index(rune) for rune in key ] for key in key_pair ]
-                key_indices = [ 0, 0 ]
-                curr_key_index = 0
+                    # Define the key indices
+                    key_values = [ RuneUtils.runes_to_indices(key) for key in key_pair ]
+                    key_indices = [ 0, 0 ]
+                    curr_key_index = 0
 
-                # Iterate runes
-                pt.revert()
-                result = []
-                for rune in pt.get_runes():
+                    # Iterate runes
+                    pt.revert()
+                    result = []
+                    for rune in pt.get_rune_indices():
                     
-                    # Apply Vigenere on current key
-                    new_rune = RuneUtils.rune_at((RuneUtils.get_rune_index(rune) - key_values[curr_key_index][key_indices[curr_key_index]]) % RuneUtils.size())
+                        # Apply Vigenere on current key
+                        new_rune = (rune - key_values[curr_key_index][key_indices[curr_key_index]]) % RuneUtils.size()
 
-                    # Optionally change key
-                    if len(result) > 0 and result[-1] == new_rune:
-                        curr_key_index = (curr_key_index + 1) % len(key_indices)
-                        new_rune = RuneUtils.rune_at((RuneUtils.get_rune_index(rune) - key_values[curr_key_index][key_indices[curr_key_index]]) % RuneUtils.size())
+                        # Optionally change key
+                        if len(result) > 0 and result[-1] == new_rune:
+                            curr_key_index = (curr_key_index + 1) % len(key_indices)
+                            new_rune = (rune - key_values[curr_key_index][key_indices[curr_key_index]]) % RuneUtils.size()
 
-                    # Increase key index and append rune to result
-                    key_indices[curr_key_index] = (key_indices[curr_key_index] + 1) % len(key_values[curr_key_index])
-                    result.append(new_rune)
+                        # Increase key index and append rune to result
+                        key_indices[curr_key_index] = (key_indices[curr_key_index] + 1) % len(key_values[curr_key_index])
+                        result.append(new_rune)
 
-                # Apply result and measure
-                pt.set_runes(result)
-                pt.check_measurements(key1=key_pair[0], key2=key_pair[1])
+                    # Apply result and measure
+                    pt.set_rune_indices(result)
+                    pt.check_measurements(key1=key_pair[0], key2=key_pair[1])
 
     @staticmethod
     def deep_hash_pastebin_bruteforce(hash_alg=hashlib.sha512):
@@ -1414,10 +1408,11 @@ class Experiments(object):
         letters = string.ascii_lowercase + string.ascii_uppercase + string.digits
         suffix_len = 8
 
-        # Iterate all options
+        # Iterate all options and resume from the last checkpoint
         total = len(letters)**suffix_len
-        with tqdm(total=total, desc='Running deep hash bruteforce') as pbar:
-            for option in itertools.product(letters, repeat=suffix_len):
+        stage = 'suffixes'
+        with Checkpoint('deep_hash_pastebin_bruteforce', hash_alg=hash_alg.__name__) as checkpoint, tqdm(total=total, initial=checkpoint.get_position(stage), desc='Running deep hash bruteforce') as pbar:
+            for option in checkpoint.iterate(stage, itertools.product(letters, repeat=suffix_len)):
                
                 # Fetch data
                 url = prefix + ''.join(option)
@@ -1488,17 +1483,17 @@ class Experiments(object):
             # Iterate all keystreams
             for keystream_name in tqdm(keystreams, desc=f'Section "{section.name}"'):
 
-                # Iterate all functions
-                func_index = -1
-                for func in funcs:
+                # Apply all functions at once
+                pt.revert()
+                keystream_matrix = [ [ func(gp_values[i], keystreams[keystream_name][i]) % RuneUtils.size() for i in range(len(gp_values)) ] for func in funcs ]
+                results = KeystreamTransformer().transform_batch(pt, keystream_matrix)
 
-                    # Revert and apply keystream
-                    func_index += 1
-                    pt.revert()
-                    keystream = [ func(gp_values[i], keystreams[keystream_name][i]) for i in range(len(gp_values)) ]
-                    KeystreamTransformer(keystream=iter(keystream)).transform(pt)
+                # Check each function result
+                for func_index in range(len(funcs)):
+                    pt.set_rune_indices(results[func_index])
                     pt.check_measurements(func_index=func_index, keystream_name=keystream_name)
 
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
     @staticmethod
@@ -1507,41 +1502,44 @@ class Experiments(object):
             Attempts Autokey or Vigenere bruteforcing for all runes.
         """
 
-        # Iterate all key lengths
+        # Iterate all key lengths and resume from the last checkpoint
         alphabet = [ RuneUtils.rune_at(i) for i in range(RuneUtils.size()) ]
-        for key_len in range(1, max_key_len + 1):
+        with Checkpoint('autokey_and_vigenere_bruteforce', max_key_len=max_key_len) as checkpoint:
+            for key_len in range(1, max_key_len + 1):
 
-            # Iterate all sections
-            for section in ResearchUtils.get_unsolved_sections():
+                # Iterate all sections
+                for section in ResearchUtils.get_unsolved_sections():
 
-                # Iterate all keys
-                total = len(alphabet) ** key_len
-                with tqdm(total=total, desc=f'Section "{section.name}" (keylen={key_len})') as pbar:
-                    for option in itertools.product(alphabet, repeat=key_len):
+                    # Iterate all keys in chunks, as a search space so resuming does not need to skip keys one by one
+                    pt = ProcessedText(section=section)
+                    stage = f'{section.name}/{key_len}'
+                    keys = ResearchUtils.iter_shard(Product(*[ Dimension(key_index, alphabet) for key_index in range(key_len) ]))
+                    with tqdm(total=len(keys), initial=checkpoint.get_position(stage), desc=f'Section "{section.name}" (keylen={key_len})') as pbar:
+                        for options in checkpoint.iterate_chunks(stage, keys, 1024):
 
-                        # Get key from option
-                        key = ''.join(option)
-                        
-                        # Attempt Vigenere
-                        pt = ProcessedText(section=section)
-                        VigenereTransformer(key=key).transform(pt)
-                        pt.check_measurements(mode='Vigenere', key=key)
+                            # Get keys from options
+                            chunk = [ ''.join(option.values()) for option in options ]
+                            key_matrix, key_lengths = Alphabet.get().keys_to_matrix(chunk)
 
-                        # Iterate all Autokey modes
-                        for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
+                            # Attempt Vigenere
+                            results = [ VigenereTransformer(key=chunk[0]).transform_batch(pt, key_matrix, key_lengths) ]
+                            modes = [ 'Vigenere' ]
 
-                            # Either try or do not try GP-mode
-                            for use_gp in (False, True):
+                            # Iterate all Autokey modes
+                            for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
 
-                                # Revert previous runs
-                                pt.revert()
+                                # Either try or do not try GP-mode
+                                for use_gp in (False, True):
 
-                                # Apply Autokey
-                                AutokeyTransformer(key=key, mode=mode, use_gp=use_gp).transform(pt)
-                                pt.check_measurements(mode=f'Autokey {mode}', key=key)
+                                    # Apply Autokey
+                                    results.append(AutokeyTransformer(key=chunk[0], mode=mode, use_gp=use_gp).transform_batch(pt, key_matrix, key_lengths))
+                                    modes.append(f'Autokey {mode}')
 
-                        # Update progress bar
-                        pbar.update(1)
+                            # Check key by key, in the order of attempts
+                            pt.check_measurements_batch(np.stack(results, axis=1).reshape(-1, pt.get_num_of_runes()), [ dict(mode=mode, key=key) for key in chunk for mode in modes ])
+
+                            # Update progress bar
+                            pbar.update(len(chunk))
 
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
@@ -1556,10 +1554,10 @@ class Experiments(object):
 
             # Iterate all runes in section
             pt = ProcessedText(section=section)
-            runes = pt.get_runes()
+            runes = pt.get_rune_indices()
             new_runes = [ runes[0] ]
-            new_runes += [ RuneUtils.rune_at((RuneUtils.get_rune_index(runes[i+1]) - RuneUtils.get_rune_index(runes[i])) % RuneUtils.size()) for i in range(len(runes) - 1) ]
-            pt.set_runes(new_runes)
+            new_runes += [ (runes[i+1] - runes[i]) % RuneUtils.size() for i in range(len(runes) - 1) ]
+            pt.set_rune_indices(new_runes)
             pt.check_measurements()
 
     @measurement(PrefixWordsMeasurement(threshold=2))
@@ -1576,11 +1574,9 @@ class Experiments(object):
         for section in tqdm(LiberPrimus.get_all_sections(), desc='Building streams from sections'):
 
             # Process text and skip unsolved sections
-            pt = ProcessedText(section=section)
-            for transformer in section.transformers:
-                transformer.transform(pt)
-            if pt.is_unsolved():
+            if not section.is_solved():
                 continue
+            pt = section.get_plaintext()
 
             # Use decoded text as keystreams
             keystreams.append(pt.get_rune_text())
@@ -1618,6 +1614,7 @@ class Experiments(object):
                     KeystreamTransformer(keystream=iter(list(map(RuneUtils.gp_at, map(RuneUtils.get_rune_index, modified_keystream))))).transform(pt)
                     pt.check_measurements(keystream=modified_keystream, mode='GpValues')
 
+    @shardable
     @measurement(PrefixWordsMeasurement(threshold=3))
     @measurement(IocMeasurement(threshold=1.4))
     @staticmethod
@@ -1638,23 +1635,19 @@ class Experiments(object):
         keys += [ RuneUtils.rune_at(i) for i in range(RuneUtils.size()) ]
         keys = set(keys)
 
-        # Iterate all sections
-        for section in ResearchUtils.get_unsolved_sections():
-            
-            # Use all keys
-            for key in tqdm(keys, desc=f'Section "{section.name}"'):
-
-                # Process the section
-                pt = ProcessedText(section=section)
-
-                # Iterate all Autokey modes
-                for mode in (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
-
-                    # Iterate all mixed alphabets
-                    for alphabet_prefix_option in alphabet_prefix_options:
+        # Declare the search space
+        unsolved_sections = ResearchUtils.get_unsolved_sections()
+        space = Product(Dimension('section', unsolved_sections),
+                        Dimension('key', keys),
+                        Dimension('mode', (AutokeyMode.PLAINTEXT, AutokeyMode.CIPHERTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT)),
+                        Dimension('alphabet_prefix', alphabet_prefix_options))
 
-                        # Apply Autokey
-                        pt.revert()
-                        AutokeyTransformer(key=key, mode=mode, alphabet_prefix=alphabet_prefix_option).transform(pt)
-                        pt.check_measurements(mode=mode, key=key, alphabet_prefix=alphabet_prefix_option)
+        # Iterate the search space
+        processed_texts = { section.name: ProcessedText(section=section) for section in unsolved_sections }
+        for params in tqdm(ResearchUtils.iter_shard(space), desc='Autokey configurations'):
 
+            # Apply Autokey
+            pt = processed_texts[params['section'].name]
+            pt.revert()
+            AutokeyTransformer(key=params['key'], mode=params['mode'], alphabet_prefix=params['alphabet_prefix']).transform(pt)
+            pt.check_measurements(mode=params['mode'], key=params['key'], alphabet_prefix=params['alphabet_prefix'])
@@ -1,9 +1,14 @@
 import transformers
+import core
+from persistence import CACHE_DIR
+from persistence import atomic_write
 
 import re
 import sys
 import os
 import json
+import hashlib
+import inspect
 
 class LiberPrimus(object):
     """
@@ -13,6 +18,28 @@ class LiberPrimus(object):
     # Sections cache
     _SECTIONS = None
 
+    # On-disk cache for decrypted sections, versioned by its format
+    _DECRYPTION_CACHE_DIR = os.path.join(CACHE_DIR, 'sections')
+    _DECRYPTION_CACHE_VERSION = 1
+
+    # Hash of the decryption code, calculated once
+    _DECRYPTION_CODE_HASH = None
+
+    @classmethod
+    def _get_decryption_cache_path(cls, section_name, config_data):
+        """
+            Gets the path of the on-disk cache of a decrypted section.
+            The cache is keyed by the section configuration and the decryption code, so changing either of them decrypts the section again.
+        """
+
+        # Hash the decryption code once
+        if cls._DECRYPTION_CODE_HASH is None:
+            cls._DECRYPTION_CODE_HASH = hashlib.md5(f'{cls._DECRYPTION_CACHE_VERSION}\n{inspect.getsource(core)}\n{inspect.getsource(transformers)}'.encode()).hexdigest()
+
+        # Build the path
+        key = hashlib.md5(f'{cls._DECRYPTION_CODE_HASH}\n'.encode() + config_data).hexdigest()
+        return os.path.join(cls._DECRYPTION_CACHE_DIR, f'{section_name}_{key}.json')
+
     @classmethod
     def get_all_sections(cls):
         """
@@ -37,8 +64,9 @@ class LiberPrimus(object):
                     continue
 
                 # Load the section data
-                with open(config_path, 'r') as fp:
-                    section_data = json.load(fp)
+                with open(config_path, 'rb') as fp:
+                    config_data = fp.read()
+                section_data = json.loads(config_data)
 
                 # Initialize all transformers
                 section_transformers = []
@@ -52,7 +80,7 @@ class LiberPrimus(object):
                 nice_name = section_name[:]
                 if '_' in nice_name:
                     nice_name = ' '.join(nice_name.split('_')[1:])
-                section = Section(name=nice_name.title(), title=section_data['title'], transformers=section_transformers)
+                section = Section(name=nice_name.title(), title=section_data['title'], transformers=section_transformers, cache_path=cls._get_decryption_cache_path(section_name, config_data))
                 for page_data in section_data['pages']:
                     page_filename = page_data.get('filename', None)
                     page_filepath = os.path.join(sections_base_path, section_name, page_filename) if page_filename is not None else None
@@ -110,9 +138,10 @@ class Section(object):
         Represents a book section.
     """
 
-    def __init__(self, name, title, transformers):
+    def __init__(self, name, title, transformers, cache_path=None):
         """
             Creates an instance.
+            The decryption is cached in memory, and also on disk if a cache path is given.
         """
 
         # Save members
@@ -124,6 +153,70 @@ class Section(object):
         # Cache (maps booleans to text - whether to include title or not)
         self._all_text_cache = {}
 
+        # Decryption cache (decrypted rune indices and whether the section is unsolved)
+        self._cache_path = cache_path
+        self._decryption = None
+        self._plaintext_words = None
+
+    def _decrypt(self):
+        """
+            Decrypts the section once, returning the decrypted rune indices and whether the section is unsolved.
+        """
+
+        # Use cache
+        if self._decryption is not None:
+            return self._decryption
+
+        # Load from disk if possible
+        if self._cache_path is not None and os.path.isfile(self._cache_path):
+            with open(self._cache_path, 'r') as fp:
+                cache = json.load(fp)
+            self._decryption = (bytes.fromhex(cache['runes']), cache['unsolved'])
+            return self._decryption
+
+        # Run all transformers
+        processed_text = core.ProcessedText(section=self)
+        for transformer in self.transformers:
+            transformer.transform(processed_text)
+        self._decryption = (processed_text.get_rune_indices(), processed_text.is_unsolved())
+
+        # Save to disk
+        if self._cache_path is not None:
+            atomic_write(self._cache_path, json.dumps({ 'runes': self._decryption[0].hex(), 'unsolved': self._decryption[1] }))
+        return self._decryption
+
+    def get_plaintext(self):
+        """
+            Gets a new processed text of the section, transformed by all of its transformers.
+            Reverting the processed text restores the encrypted runes.
+        """
+
+        # Build from the decryption cache
+        rune_indices, is_unsolved = self._decrypt()
+        processed_text = core.ProcessedText(section=self)
+        processed_text.set_rune_indices(rune_indices)
+        if is_unsolved:
+            processed_text.set_unsolved()
+        return processed_text
+
+    def get_plaintext_words(self):
+        """
+            Gets the decrypted Runic words.
+        """
+
+        # Use cache
+        if self._plaintext_words is None:
+            self._plaintext_words = self.get_plaintext().get_rune_words()
+        return self._plaintext_words[:]
+
+    def is_solved(self):
+        """
+            Indicates if the section is solved.
+        """
+
+        # Use the decryption cache
+        return not self._decrypt()[1]
+
     def get_all_text(self, exclude_titles=False):
         """
             Get the entire section text.
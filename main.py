@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 from experiments import Experiments
+from runner import ParallelRunner
+from runner import is_shardable
+from measurements import flush_hits
 import screen
 
+import argparse
 import logging
 
 def main():
@@ -9,6 +13,12 @@ def main():
         Main routine.
     """
 
+    # Parse arguments
+    parser = argparse.ArgumentParser(description='Cicada 3301 utilities for decryption and research purposes.')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes for shardable experiments (default: 1)')
+    args = parser.parse_args()
+    assert args.workers > 0, Exception(f'Invalid number of workers: {args.workers}')
+
     # Logging capability
     logging.basicConfig(filename='CicadaUtils.log', level=logging.INFO)
     logger = logging.getLogger(__name__)
@@ -33,13 +43,18 @@ def main():
             logger.info(f'Starting: {menu_items[choice][0]}')
             screen.clear()
             screen.print_yellow(f'== {menu_items[choice][0]} ==\n')
-            exprs[choice][1].__func__()
+            if args.workers > 1 and is_shardable(exprs[choice][0]):
+                ParallelRunner(args.workers).run(exprs[choice][0])
+            else:
+                exprs[choice][1].__func__()
+            flush_hits()
             logger.info(f'Finished: {menu_items[choice][0]}')
             screen.print_green('\n\nEXECUTION COMPLETE\n')
             screen.press_enter()
 
         except (KeyboardInterrupt, EOFError):
             if choice is not None:
+                flush_hits()
                 logger.info(f'Stopped: {menu_items[choice][0]}')
                 screen.print_red('\n\nSTOPPED BY USER\n')
                 screen.press_enter()
@@ -1,16 +1,82 @@
 from research_utils import ResearchUtils
-import screen
+from core import ProcessedText
+from reporter import HitReporter
 
 from abc import ABC
 from abc import abstractmethod
-import logging
+import contextlib
+import functools
 
-# Maps function names to measurements
-_MEASUREMENTS_CACHE = {}
+# Queue for reporting measurement hits to a parent process, set in parallel runner workers
+_HITS_QUEUE = None
+
+# Reports measurement hits in the background, created on first use
+_REPORTER = None
+
+# The name of the running experiment
+_EXPERIMENT = None
+
+def set_hits_queue(hits_queue):
+    """
+        Sets a queue that gets all measurement hits instead of the reporter.
+    """
+
+    # Save the queue
+    global _HITS_QUEUE
+    _HITS_QUEUE = hits_queue
+
+def get_reporter():
+    """
+        Gets the reporter of measurement hits.
+    """
+
+    # Create on first use
+    global _REPORTER
+    if _REPORTER is None:
+        _REPORTER = HitReporter()
+    return _REPORTER
+
+def set_reporter(reporter):
+    """
+        Sets the reporter of measurement hits, e.g. to change its results file or print rate.
+    """
+
+    # Flush the previous reporter and save the new one
+    global _REPORTER
+    flush_hits()
+    _REPORTER = reporter
+
+def flush_hits():
+    """
+        Waits until all measurement hits so far are reported.
+    """
+
+    # Flush the reporter if it was ever used
+    if _REPORTER is not None:
+        _REPORTER.flush()
+
+@contextlib.contextmanager
+def measurement_context(measurements, experiment=None):
+    """
+        Activates the given measurements (on top of the currently active ones), so processed texts created within the context check them.
+        The experiment name is reported alongside all hits within the context.
+    """
+
+    # Activate the measurements and restore the previous ones when done
+    global _EXPERIMENT
+    previous, previous_experiment = ProcessedText.get_active_measurements(), _EXPERIMENT
+    ProcessedText.set_active_measurements(list(measurements) + previous)
+    _EXPERIMENT = previous_experiment if experiment is None else experiment
+    try:
+        yield
+    finally:
+        ProcessedText.set_active_measurements(previous)
+        _EXPERIMENT = previous_experiment
 
 def measurement(measurement_instance):
     """
         Acts as a decorator that could be used for experiments.
+        The first decorator binds a measurement list to the experiment, which is activated whenever the experiment runs, and further decorators add to it.
     """
 
     def wrapper(func):
@@ -18,22 +84,37 @@ def measurement(measurement_instance):
             The decorator wrapper.
         """
 
+        # Bind a measurement list to the function unless previously bound
+        if not hasattr(func.__func__, 'measurements'):
+            experiment = func.__func__
+
+            @functools.wraps(experiment)
+            def bound_experiment(*args, **kwds):
+                """
+                    Runs the experiment with its measurements active.
+                """
+
+                # Run within the measurement context
+                with measurement_context(bound_experiment.measurements, experiment.__name__):
+                    return experiment(*args, **kwds)
+
+            bound_experiment.measurements = []
+            func = staticmethod(bound_experiment)
+
         # Save the measurement to the function
-        if func.__func__.__name__ not in _MEASUREMENTS_CACHE:
-            _MEASUREMENTS_CACHE[func.__func__.__name__] = []
-        _MEASUREMENTS_CACHE[func.__func__.__name__].append(measurement_instance)
+        func.__func__.measurements.append(measurement_instance)
         return func
 
     # Return the decorator wrapper function
     return wrapper
 
-def get_measurements_for_function(func_name):
+def get_measurements_for_function(func):
     """
-        Get the set of measurements for a given function.
+        Get the measurements bound to a given function.
     """
 
-    # Return from cache
-    return _MEASUREMENTS_CACHE.get(func_name, [])
+    # Return the bound measurements
+    return getattr(getattr(func, '__func__', func), 'measurements', [])
 
 class MeasurementBase(ABC):
     """
@@ -59,6 +140,40 @@ class MeasurementBase(ABC):
         """
         pass
 
+    def run_measurement_batch(self, processed_text, rune_indices):
+        """
+            Runs a measurement on each row of a 2D matrix of rune indices (sharing the processed text structure) and returns the results.
+            Measurements that could be vectorized should override this.
+        """
+
+        # Run on each row separately
+        batch_text = ProcessedText.from_processed_text(processed_text)
+        results = []
+        for row in rune_indices:
+            batch_text.set_rune_indices(row)
+            results.append(self.run_measurement(batch_text))
+        return results
+
+    def is_passing(self, measurement):
+        """
+            Indicates if a measurement result passes the threshold.
+        """
+
+        # Check the condition
+        return self._cond(measurement)
+
+    def report(self, processed_text, measurement, **kwds):
+        """
+            Reports the processed text of a measurement that passed, which only enqueues a compact hit record.
+        """
+
+        # Report to the parent process if running as a worker, or to the reporter otherwise
+        hit = HitReporter.pack(_EXPERIMENT, self.__class__.__name__, measurement, processed_text, kwds)
+        if _HITS_QUEUE is not None:
+            _HITS_QUEUE.put(hit)
+        else:
+            get_reporter().submit(hit)
+
     def measure(self, processed_text, **kwds):
         """
             Runs a measurement and presents the processed text if measurement passes.
@@ -66,22 +181,11 @@ class MeasurementBase(ABC):
 
         # Run and check
         measurement = self.run_measurement(processed_text)
-        if not self._cond(measurement):
+        if not self.is_passing(measurement):
             return False
 
-        # Print data and log it
-        logger = logging.getLogger(__name__)
-        logger.info(f'{self.__class__.__name__}: {measurement}\n')
-        screen.print_yellow(self.__class__.__name__, end='')
-        print(f': {measurement}\n')
-        for kwd in kwds:
-            logger.info(f'{kwd}: {kwds[kwd]}')
-            screen.print_yellow(f'{kwd}:', end='')
-            print(f' {kwds[kwd]}')
-        if processed_text.section is None:
-            screen.print_solved_text(processed_text.to_latin())
-        else:
-            ResearchUtils.print_section_data(processed_text.section, processed_text)
+        # Report
+        self.report(processed_text, measurement, **kwds)
         return True
 
 class IocMeasurement(MeasurementBase):
@@ -105,6 +209,14 @@ class IocMeasurement(MeasurementBase):
         # Returns the Runic IoC
         return processed_text.get_rune_ioc()
 
+    def run_measurement_batch(self, processed_text, rune_indices):
+        """
+            Runs a measurement on each row of a 2D matrix of rune indices and returns the results.
+        """
+
+        # Returns the Runic IoC of all rows at once
+        return ProcessedText.get_rune_ioc_batch(rune_indices)
+
 class PrefixWordsMeasurement(MeasurementBase):
     """
         Measures the number of words that match a dictionary.
@@ -119,7 +231,7 @@ class PrefixWordsMeasurement(MeasurementBase):
         super().__init__(threshold=threshold)
 
         # Save the wordlist
-        self._wordlist = ResearchUtils.get_english_dictionary_words(as_runes=True)
+        self._wordlist = ResearchUtils.get_english_dictionary_trie()
 
     def run_measurement(self, processed_text):
         """
@@ -129,6 +241,14 @@ class PrefixWordsMeasurement(MeasurementBase):
         # Returns the number of matched words
         return processed_text.get_first_non_wordlist_word_index(self._wordlist)
 
+    def run_measurement_batch(self, processed_text, rune_indices):
+        """
+            Runs a measurement on each row of a 2D matrix of rune indices and returns the results.
+        """
+
+        # Returns the number of matched words of all rows at once
+        return processed_text.get_first_non_wordlist_word_index_batch(rune_indices, self._wordlist).tolist()
+
 class AllWordsMeasurement(MeasurementBase):
     """
         A Boolean measurement that indicates all words are in a dictionary.
@@ -143,7 +263,7 @@ class AllWordsMeasurement(MeasurementBase):
         super().__init__(threshold=0)
 
         # Save the wordlist
-        self._wordlist = ResearchUtils.get_english_dictionary_words(as_runes=True)
+        self._wordlist = ResearchUtils.get_english_dictionary_trie()
 
     def run_measurement(self, processed_text):
         """
@@ -151,8 +271,16 @@ class AllWordsMeasurement(MeasurementBase):
         """
 
         # Indicates success or failure which will be matched against the "threshold" of zero
-        if processed_text.get_first_non_wordlist_word_index(self._wordlist) >= len(processed_text.get_rune_words()):
+        if processed_text.get_first_non_wordlist_word_index(self._wordlist) >= processed_text.get_num_of_words():
             return 1
         else:
             return -1
 
+    def run_measurement_batch(self, processed_text, rune_indices):
+        """
+            Runs a measurement on each row of a 2D matrix of rune indices and returns the results.
+        """
+
+        # Indicates success or failure of all rows at once
+        num_of_words = processed_text.get_num_of_words()
+        return [ 1 if index >= num_of_words else -1 for index in processed_text.get_first_non_wordlist_word_index_batch(rune_indices, self._wordlist).tolist() ]
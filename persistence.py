@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import itertools
+import collections.abc
+
+# The directory used for all cached data
+CACHE_DIR = '.cache'
+
+def atomic_write(path, data):
+    """
+        Writes data (either bytes or a string) to a file atomically, i.e. readers either see the old contents or the new ones.
+    """
+
+    # Write to a temporary file in the same directory and then replace the original file
+    dir_path = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dir_path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data.encode() if isinstance(data, str) else data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+class Checkpoint(object):
+    """
+        Persists the progress of a long-running experiment, so it could be resumed from where it stopped.
+        Progress is kept as a position per named stage, where each stage iterates a deterministic search space.
+    """
+
+    # The directory of all checkpoint files
+    _CHECKPOINTS_DIR = os.path.join(CACHE_DIR, 'checkpoints')
+
+    def __init__(self, name, save_interval=30, **params):
+        """
+            Creates an instance.
+            The name and parameters (as well as the current shard) identify the checkpoint, so changing any of them starts from scratch.
+        """
+
+        # We could not import research utilities before due to circular dependency
+        from research_utils import ResearchUtils
+
+        # Build the checkpoint path
+        shard_index, num_of_shards = ResearchUtils.get_shard()
+        params_hash = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        self._path = os.path.join(self.__class__._CHECKPOINTS_DIR, f'{name}_{params_hash}_{shard_index}of{num_of_shards}.json')
+
+        # Load the saved positions
+        self._positions = {}
+        if os.path.isfile(self._path):
+            with open(self._path, 'r') as fp:
+                self._positions = json.load(fp)
+            logging.getLogger(__name__).info(f'Resuming from checkpoint: {self._path}')
+
+        # Save members
+        self._save_interval = save_interval
+        self._last_save_time = time.monotonic()
+
+    def __enter__(self):
+        """
+            Enters a checkpoint context.
+        """
+
+        # Return self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+            Exits a checkpoint context, saving progress if the experiment was stopped or removing the checkpoint if it was done.
+        """
+
+        # Save or remove
+        if exc_type is None:
+            self.clear()
+        else:
+            self.save()
+            logging.getLogger(__name__).info(f'Saved checkpoint: {self._path}')
+
+    def get_position(self, stage):
+        """
+            Gets the number of items already done in the given stage.
+        """
+
+        # Return the position
+        return self._positions.get(stage, 0)
+
+    def set_position(self, stage, position):
+        """
+            Sets the number of items done in the given stage, periodically saving to disk.
+        """
+
+        # Set and optionally save
+        self._positions[stage] = position
+        if time.monotonic() - self._last_save_time >= self._save_interval:
+            self.save()
+
+    def iterate(self, stage, iterable):
+        """
+            Iterates the given stage, skipping all items that were already done.
+            An item is considered done once the next one is requested.
+        """
+
+        # Skip items that were done
+        start = self.get_position(stage)
+        if isinstance(iterable, collections.abc.Sequence):
+            items = iterable[start:]
+        else:
+            items = itertools.islice(iterable, start, None)
+
+        # Iterate the rest and update the position
+        for position, item in enumerate(items, start + 1):
+            yield item
+            self.set_position(stage, position)
+
+    def iterate_chunks(self, stage, iterable, chunk_size):
+        """
+            Iterates the given stage in lists of up to the given number of items, skipping all items that were already done.
+            A chunk is considered done once the next one is requested.
+        """
+
+        # Validations
+        assert chunk_size > 0, Exception(f'Invalid chunk size: {chunk_size}')
+
+        # Skip items that were done
+        position = self.get_position(stage)
+        if isinstance(iterable, collections.abc.Sequence):
+            items = iter(iterable[position:])
+        else:
+            items = itertools.islice(iterable, position, None)
+
+        # Iterate the rest in chunks and update the position
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if len(chunk) == 0:
+                return
+            yield chunk
+            position += len(chunk)
+            self.set_position(stage, position)
+
+    def save(self):
+        """
+            Saves all positions to disk.
+        """
+
+        # Write atomically
+        atomic_write(self._path, json.dumps(self._positions))
+        self._last_save_time = time.monotonic()
+
+    def clear(self):
+        """
+            Removes the checkpoint.
+        """
+
+        # Remove positions and the file
+        self._positions = {}
+        if os.path.isfile(self._path):
+            os.remove(self._path)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+from core import ProcessedText
+from liber_primus import LiberPrimus
+from research_utils import ResearchUtils
+import screen
+
+import json
+import time
+import queue
+import atexit
+import hashlib
+import logging
+import threading
+
+class HitReporter(object):
+    """
+        Reports measurement hits in a background thread, so experiments only pay for putting a compact hit record in a queue.
+        Each hit is logged and appended as a JSON line to a results file, and printed to the terminal at a bounded rate.
+        Hits with a plaintext that was already reported are skipped.
+    """
+
+    # The default path of the results file
+    RESULTS_PATH = 'CicadaResults.jsonl'
+
+    # Maximum number of processed texts kept for rendering hits
+    _MAX_TEXTS = 256
+
+    def __init__(self, results_path=RESULTS_PATH, max_prints_per_second=10):
+        """
+            Creates an instance.
+            The results path could be None to skip writing results, and the maximum prints per second could be None to print all hits.
+        """
+
+        # Validations
+        assert max_prints_per_second is None or max_prints_per_second > 0, Exception(f'Invalid maximum prints per second: {max_prints_per_second}')
+
+        # Save members
+        self._results_path = results_path
+        self._max_prints_per_second = max_prints_per_second
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # State of the reporting thread
+        self._digests = set()
+        self._texts = {}
+        self._sections = None
+        self._results_file = None
+        self._window_start = 0.0
+        self._window_prints = 0
+        self._num_of_unprinted = 0
+
+    @staticmethod
+    def pack(experiment, measurement_name, measurement, processed_text, params):
+        """
+            Packs a hit as a compact record that could also be sent to other processes.
+            Parameters that are not JSON primitives are kept as strings, so later changes to them do not affect the report.
+        """
+
+        # Keep the runes as an immutable buffer alongside the original text they were processed from
+        primitive = lambda value:value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        return {
+            'experiment': experiment,
+            'measurement': measurement_name,
+            'score': primitive(measurement),
+            'params': dict([ (kwd, primitive(value)) for (kwd, value) in params.items() ]),
+            'section': None if processed_text.section is None else processed_text.section.name,
+            'text': processed_text.get_original_text(),
+            'runes': processed_text.get_rune_indices(),
+            'unsolved': processed_text.is_unsolved()
+        }
+
+    def submit(self, hit):
+        """
+            Submits a packed hit to be reported.
+        """
+
+        # Start the reporting thread on first use
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='HitReporter', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+        # Only enqueue
+        self._queue.put(hit)
+
+    def flush(self):
+        """
+            Waits until all submitted hits are reported.
+        """
+
+        # Wait for the queue to drain
+        if self._thread is None:
+            return
+        self._queue.join()
+
+        # Mention hits that were not printed
+        if self._num_of_unprinted > 0:
+            screen.print_yellow(f'\n{self._num_of_unprinted} more hits were not printed', end='')
+            print('' if self._results_path is None else f' (see {self._results_path})')
+            self._num_of_unprinted = 0
+
+    def _run(self):
+        """
+            Reports hits from the queue forever.
+        """
+
+        # Report each hit and keep going on failures
+        while True:
+            hit = self._queue.get()
+            try:
+                self._report(hit)
+            except Exception:
+                logging.getLogger(__name__).exception('Failed reporting a hit')
+            finally:
+                self._queue.task_done()
+
+    def _get_processed_text(self, hit):
+        """
+            Gets a processed text with the runes of the given hit, reusing one processed text per original text.
+        """
+
+        # Get the sections by name
+        if self._sections is None:
+            self._sections = dict([ (section.name, section) for section in LiberPrimus.get_all_sections() ])
+
+        # Create a processed text unless previously created
+        key = (hit['section'], hit['text'], hit['unsolved'])
+        processed_text = self._texts.get(key)
+        if processed_text is None:
+            if len(self._texts) >= self.__class__._MAX_TEXTS:
+                self._texts.clear()
+            processed_text = ProcessedText(rune_text=hit['text'], section=self._sections.get(hit['section']))
+            if hit['unsolved']:
+                processed_text.set_unsolved()
+            self._texts[key] = processed_text
+
+        # Set the runes
+        processed_text.set_rune_indices(hit['runes'])
+        return processed_text
+
+    def _should_print(self):
+        """
+            Indicates whether the next hit should be printed, allowing a bounded number of prints per second.
+        """
+
+        # Always print if there is no bound
+        if self._max_prints_per_second is None:
+            return True
+
+        # Start a new window every second
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_prints = 0
+
+        # Count prints in the current window
+        if self._window_prints >= self._max_prints_per_second:
+            self._num_of_unprinted += 1
+            return False
+        self._window_prints += 1
+        return True
+
+    def _report(self, hit):
+        """
+            Reports a single hit.
+        """
+
+        # Skip plaintexts that were already reported
+        digest = hashlib.blake2b(f'{hit["section"]}\n{hit["text"]}\n{hit["unsolved"]}\n'.encode() + hit['runes'], digest_size=16).digest()
+        if digest in self._digests:
+            return
+        self._digests.add(digest)
+
+        # Log
+        logger = logging.getLogger(__name__)
+        logger.info(f'{hit["measurement"]}: {hit["score"]}\n')
+        for kwd, value in hit['params'].items():
+            logger.info(f'{kwd}: {value}')
+
+        # Append to the results file
+        processed_text = self._get_processed_text(hit)
+        if self._results_path is not None:
+            if self._results_file is None:
+                self._results_file = open(self._results_path, 'a', encoding='utf-8')
+            record = dict([ (kwd, hit[kwd]) for kwd in ('experiment', 'measurement', 'score', 'params', 'section') ])
+            record['latin'] = processed_text.to_latin()
+            record['runes'] = processed_text.get_rune_text()
+            self._results_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._results_file.flush()
+
+        # Print at a bounded rate
+        if not self._should_print():
+            return
+        screen.print_yellow(hit['measurement'], end='')
+        print(f': {hit["score"]}\n')
+        for kwd, value in hit['params'].items():
+            screen.print_yellow(f'{kwd}:', end='')
+            print(f' {value}')
+        if processed_text.section is None:
+            screen.print_solved_text(processed_text.to_latin())
+        else:
+            ResearchUtils.print_section_data(processed_text.section, processed_text)
@@ -2,25 +2,44 @@
 from core import *
 from transformers import *
 from liber_primus import LiberPrimus
+from persistence import CACHE_DIR
+from persistence import atomic_write
 import screen
 
 import subprocess
 import platform
 import os
 import shutil
+import itertools
+import collections.abc
+import hashlib
+import inspect
+import io
+import numpy as np
 
 class ResearchUtils(object):
     """
         Research utlities.
     """
 
-    # Cache for English words
+    # Cache for English words (the Runic words are built on first use from their memory-mapped packed text)
     _ENGLISH_WORD_RUNES = None
+    _ENGLISH_WORD_RUNES_TEXT = None
     _ENGLISH_WORD_ENGLISH = None
+    _ENGLISH_WORD_TRIE = None
+
+    # On-disk cache for the Runic English dictionary, versioned by its format
+    # Each array is an uncompressed .npy file, so it could be memory-mapped and its pages shared by all processes
+    _DICTIONARY_CACHE_DIR = os.path.join(CACHE_DIR, 'dictionary')
+    _DICTIONARY_CACHE_VERSION = 2
+    _DICTIONARY_CACHE_ARRAYS = ('keys', 'nodes', 'word_mask', 'runes')
 
     # Cache for unsolved sections
     _UNSOLVED_SECTIONS = None
 
+    # The current shard index and the number of shards
+    _SHARD = (0, 1)
+
     @classmethod
     def get_unsolved_sections(cls):
         """
@@ -30,21 +49,87 @@ class ResearchUtils(object):
         # Work on cache
         if cls._UNSOLVED_SECTIONS is None:
 
-            # Try to decrypt all sections
-            cls._UNSOVLED_SECTIONS = []
-            for section in LiberPrimus.get_all_sections():
+            # Take all sections that are not solved
+            cls._UNSOLVED_SECTIONS = [ section for section in LiberPrimus.get_all_sections() if not section.is_solved() ]
 
-                # Process all text
-                processed_text = ProcessedText(section.get_all_text())
-                for transformer in section.transformers:
-                    transformer.transform(processed_text)
+        # Return all unsolved sections
+        return cls._UNSOLVED_SECTIONS
 
-                # Add to result if section is unsolved
-                if processed_text.is_unsolved():
-                    cls._UNSOVLED_SECTIONS.append(section)
+    @classmethod
+    def set_shard(cls, shard_index, num_of_shards):
+        """
+            Sets the current shard, which limits the search space iterated by iter_shard.
+        """
 
-        # Return all unsolved sections
-        return cls._UNSOVLED_SECTIONS
+        # Validations
+        assert num_of_shards > 0, Exception(f'Invalid number of shards: {num_of_shards}')
+        assert 0 <= shard_index < num_of_shards, Exception(f'Invalid shard index: {shard_index}')
+
+        # Save the shard
+        cls._SHARD = (shard_index, num_of_shards)
+
+    @classmethod
+    def get_shard(cls):
+        """
+            Gets the current shard index and the number of shards.
+        """
+
+        # Return the shard
+        return cls._SHARD
+
+    @classmethod
+    def iter_shard(cls, iterable):
+        """
+            Gets the part of the given search space that belongs to the current shard.
+            Sequences (including search spaces) are sliced lazily and keep supporting len(), other iterables are iterated lazily.
+            Without sharding this simply returns everything.
+        """
+
+        # Return everything if there is a single shard
+        shard_index, num_of_shards = cls._SHARD
+        if num_of_shards == 1:
+            return iterable
+
+        # Sets have no stable order across processes so they are sorted first
+        if isinstance(iterable, (set, frozenset)):
+            iterable = sorted(iterable)
+
+        # Take every n-th element starting at the shard index
+        if isinstance(iterable, collections.abc.Sequence):
+            return iterable[shard_index::num_of_shards]
+        return itertools.islice(iterable, shard_index, None, num_of_shards)
+
+    @classmethod
+    def _load_english_dictionary(cls):
+        """
+            Loads the English dictionary, its Runic words and their trie, using an on-disk cache for the Runic parts.
+            The cache is keyed by the wordlist contents and the transliteration rules, so changing either of them rebuilds it.
+            The cached arrays are memory-mapped, so the trie is backed by pages that are shared by all processes rather than by per-process objects.
+        """
+
+        # Read the wordlist
+        with open('english_wordlist.txt', 'rb') as fp:
+            data = fp.read()
+        cls._ENGLISH_WORD_ENGLISH = set([ word for word in data.decode().splitlines() if len(word) > 0 ])
+
+        # Build the cache paths
+        key = hashlib.md5(f'{cls._DICTIONARY_CACHE_VERSION}\n{inspect.getsource(RuneUtils)}\n'.encode() + data).hexdigest()
+        paths = dict([ (name, os.path.join(cls._DICTIONARY_CACHE_DIR, f'{key}.{name}.npy')) for name in cls._DICTIONARY_CACHE_ARRAYS ])
+
+        # Transliterate all words and build the trie unless cached (each file is written atomically, and any missing file rebuilds them all)
+        if not all([ os.path.isfile(path) for path in paths.values() ]):
+            runic_words = set([ runic for runic in RuneUtils.english_to_runes_bulk(cls._ENGLISH_WORD_ENGLISH) if len(runic) > 0 ])
+            keys, nodes, word_mask = RuneTrie(runic_words).to_arrays()
+            arrays = { 'keys': keys, 'nodes': nodes.astype(np.int32), 'word_mask': word_mask, 'runes': np.frombuffer('\n'.join(sorted(runic_words)).encode(), dtype=np.uint8) }
+            for name, array in arrays.items():
+                output = io.BytesIO()
+                np.save(output, array)
+                atomic_write(paths[name], output.getvalue())
+
+        # Memory-map all arrays
+        arrays = dict([ (name, np.load(path, mmap_mode='r')) for (name, path) in paths.items() ])
+        cls._ENGLISH_WORD_TRIE = RuneTrie.from_arrays(arrays['keys'], arrays['nodes'], arrays['word_mask'])
+        cls._ENGLISH_WORD_RUNES_TEXT = arrays['runes']
 
     @classmethod
     def get_english_dictionary_words(cls, as_runes=True):
@@ -53,22 +138,27 @@ class ResearchUtils(object):
         """
 
         # Build cache
-        if cls._ENGLISH_WORD_RUNES is None or cls._ENGLISH_WORD_ENGLISH is None:
-            cls._ENGLISH_WORD_RUNES = set()
-            cls._ENGLISH_WORD_ENGLISH = set()
-            with open('english_wordlist.txt', 'r') as fp:
-                for word in fp.read().split('\n'):
-                    if len(word) == 0:
-                        continue
-                    cls._ENGLISH_WORD_ENGLISH.add(word)
-                    runic = RuneUtils.english_to_runes(word)
-                    if len(runic) == 0:
-                        continue
-                    cls._ENGLISH_WORD_RUNES.add(runic)
+        if cls._ENGLISH_WORD_RUNES_TEXT is None or cls._ENGLISH_WORD_ENGLISH is None:
+            cls._load_english_dictionary()
+        if as_runes and cls._ENGLISH_WORD_RUNES is None:
+            cls._ENGLISH_WORD_RUNES = set(cls._ENGLISH_WORD_RUNES_TEXT.tobytes().decode().split('\n'))
         
         # Use cache
         return cls._ENGLISH_WORD_RUNES if as_runes else cls._ENGLISH_WORD_ENGLISH
 
+    @classmethod
+    def get_english_dictionary_trie(cls):
+        """
+            Gets words from an English dictionary as a Runic trie.
+        """
+
+        # Build cache
+        if cls._ENGLISH_WORD_TRIE is None:
+            cls._load_english_dictionary()
+
+        # Use cache
+        return cls._ENGLISH_WORD_TRIE
+
     @classmethod
     def get_rune_wordlist(cls, use_dictionary=False):
         """
@@ -76,21 +166,16 @@ class ResearchUtils(object):
             Can also extend to an English wordlist.
         """
 
-        # Try to decrypt all sections
+        # Take words from all solved sections
         result = set()
         for section in LiberPrimus.get_all_sections():
 
-            # Process all text
-            processed_text = ProcessedText(section.get_all_text())
-            for transformer in section.transformers:
-                transformer.transform(processed_text)
-
             # Skip unsolved sections 
-            if processed_text.is_unsolved():
+            if not section.is_solved():
                 continue
 
             # Get all words
-            for word in processed_text.get_rune_words():
+            for word in section.get_plaintext_words():
                 if len(word) == 0:
                     continue
                 result.add(word)
@@ -176,16 +261,68 @@ class ResearchUtils(object):
         return None
 
     @staticmethod
-    def iterate_potential_interrupter_indices(processed_text, interrupter_rune='ᚠ'):
+    def iterate_interrupter_decryptions(processed_text, keystreams, wordlist, num_of_words=None, interrupter_rune='ᚠ'):
         """
-            Iterates all the potential interrupter indices.
+            Decrypts the processed text runes with additive keystreams (as rows of a 2D matrix), where each potential interrupter rune might either be an interrupter or not.
+            An interrupter is left untouched and does not consume a keystream value.
+            Rather than trying each subset of potential interrupters, runes are decrypted left-to-right (for all keystreams at once) and each potential interrupter is a branch point.
+            That way subsets with a common prefix share work, and a keystream is dropped from a branch as soon as one of the first words leaves the wordlist trie.
+            Only the first given number of words (or all words if not given) are checked, and the rest are decrypted without interrupters.
+            Yields triplets of the interrupt indices, the surviving keystream rows and their decrypted rune indices (as rows of a 2D matrix), with no interrupters first.
         """
 
-        # Finds all potential indices
-        runes = processed_text.get_runes()
-        potential_interrupters = [ i for i in range(len(runes)) if runes[i] == interrupter_rune ]
-
-        # Iterate
-        for mask in range(2**len(potential_interrupters)):
-            yield [ potential_interrupters[i] for i in range(len(potential_interrupters)) if (mask & (1<<i)) > 0 ]
+        # Reduce keystream values (could be arbitrarily big or non-native integers)
+        size = RuneUtils.size()
+        keystreams = np.asarray(keystreams)
+        if keystreams.dtype == object:
+            keystreams = (keystreams % size).astype(np.int64)
+        keystreams = keystreams.astype(np.int64) % size
+
+        # Only runes up to the end of the last checked word are branched on
+        ciphertext = np.frombuffer(processed_text.get_rune_indices(), dtype=np.uint8)
+        word_offsets = processed_text.get_word_offsets()
+        if num_of_words is not None:
+            word_offsets = word_offsets[:num_of_words]
+        word_ends = set([ end for (_, end) in word_offsets ])
+        checked_len = max(word_ends) if len(word_ends) > 0 else 0
+        interrupter = RuneUtils.get_rune_index(interrupter_rune)
+
+        # Each branch is the next rune position, the surviving keystream rows, their trie nodes and the interrupt indices so far
+        # A branch whose last interrupt index is its position is about to decide that the rune is an interrupter
+        stack = [ (0, np.arange(len(keystreams)), np.zeros(len(keystreams), dtype=np.int64), ()) ]
+        while len(stack) > 0:
+            position, rows, nodes, interrupt_indices = stack.pop()
+
+            # Decrypt left-to-right while any keystream survives
+            while position < checked_len and len(rows) > 0:
+
+                # Either keep the interrupter untouched or branch on it, deciding it is not an interrupter first
+                if len(interrupt_indices) > 0 and interrupt_indices[-1] == position:
+                    runes = np.full(len(rows), interrupter, dtype=np.int64)
+                else:
+                    if ciphertext[position] == interrupter:
+                        stack.append((position, rows, nodes, interrupt_indices + (position,)))
+                    runes = (int(ciphertext[position]) + keystreams[rows, position - len(interrupt_indices)]) % size
+
+                # Walk the trie and drop keystreams that left it
+                nodes = wordlist.get_children(nodes, runes)
+                position += 1
+                survivors = nodes >= 0
+                rows, nodes = rows[survivors], nodes[survivors]
+
+                # Drop keystreams that did not complete a word and start the next word from the root
+                if position in word_ends:
+                    survivors = wordlist.are_words(nodes)
+                    rows = rows[survivors]
+                    nodes = np.zeros(len(rows), dtype=np.int64)
+
+            # Decrypt the surviving keystreams entirely
+            if len(rows) == 0:
+                continue
+            mask = np.ones(len(ciphertext), dtype=bool)
+            mask[list(interrupt_indices)] = False
+            positions = np.flatnonzero(mask)[:keystreams.shape[1]]
+            result = np.tile(ciphertext, (len(rows), 1))
+            result[:, positions] = (ciphertext[positions] + keystreams[rows, :len(positions)]) % size
+            yield list(interrupt_indices), rows, result
 
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+from research_utils import ResearchUtils
+import measurements
+
+import os
+import sys
+import multiprocessing
+import concurrent.futures
+from tqdm import tqdm
+
+# Names of experiments that split their search space by calling ResearchUtils.iter_shard
+_SHARDABLE_EXPERIMENTS = set()
+
+def shardable(func):
+    """
+        Acts as a decorator that marks an experiment as shardable, i.e. could run in parallel by the ParallelRunner.
+        Shardable experiments are expected to iterate their main search space with ResearchUtils.iter_shard.
+    """
+
+    # Mark the function
+    _SHARDABLE_EXPERIMENTS.add(func.__func__.__name__)
+    return func
+
+def is_shardable(func_name):
+    """
+        Indicates if the given experiment is shardable.
+    """
+
+    # Look up
+    return func_name in _SHARDABLE_EXPERIMENTS
+
+def _init_worker(hits_queue):
+    """
+        Initializes a worker process.
+    """
+
+    # Silence progress bars since workers run concurrently
+    sys.stderr = open(os.devnull, 'w')
+
+    # Report measurement hits back to the parent process
+    measurements.set_hits_queue(hits_queue)
+
+    # Preload sections and the dictionary (no-op if they were already loaded in the parent process before forking)
+    ParallelRunner.preload()
+
+def _run_shard(func_name, shard_index, num_of_shards, kwds):
+    """
+        Runs a single shard of an experiment in a worker process.
+    """
+
+    # We could not import experiments before due to circular dependency
+    from experiments import Experiments
+
+    # Run the experiment on the shard
+    ResearchUtils.set_shard(shard_index, num_of_shards)
+    getattr(Experiments, func_name)(**kwds)
+
+class ParallelRunner(object):
+    """
+        Runs shardable experiments in parallel, by splitting their search space across worker processes.
+    """
+
+    def __init__(self, num_of_workers=None, num_of_shards=None):
+        """
+            Creates an instance.
+        """
+
+        # Save the number of workers and shards
+        self._num_of_workers = os.cpu_count() if num_of_workers is None else num_of_workers
+        assert self._num_of_workers > 0, Exception(f'Invalid number of workers: {self._num_of_workers}')
+        self._num_of_shards = self._num_of_workers if num_of_shards is None else num_of_shards
+        assert self._num_of_shards > 0, Exception(f'Invalid number of shards: {self._num_of_shards}')
+
+    @staticmethod
+    def preload():
+        """
+            Preloads all commonly used data, to avoid loading it once per shard.
+        """
+
+        # Load unsolved sections and the dictionary
+        ResearchUtils.get_unsolved_sections()
+        ResearchUtils.get_english_dictionary_trie()
+
+    @staticmethod
+    def _report_hits(hits_queue):
+        """
+            Submits all measurement hits reported by workers so far to the reporter.
+        """
+
+        # Drain the queue
+        reporter = measurements.get_reporter()
+        while not hits_queue.empty():
+            reporter.submit(hits_queue.get())
+
+    def run(self, func_name, **kwds):
+        """
+            Runs the given shardable experiment in parallel.
+        """
+
+        # Validations
+        assert is_shardable(func_name), Exception(f'Experiment is not shardable: {func_name}')
+
+        # Preload before workers are created, so forked workers inherit everything
+        self.__class__.preload()
+
+        # Prefer forking since it is cheaper and keeps the state of the parent process
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+        # Hits are enqueued synchronously, so they are all available once their shard is done
+        hits_queue = context.SimpleQueue()
+
+        # Run all shards and report hits as they arrive
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self._num_of_workers, mp_context=context, initializer=_init_worker, initargs=(hits_queue,)) as executor:
+            futures = [ executor.submit(_run_shard, func_name, shard_index, self._num_of_shards, kwds) for shard_index in range(self._num_of_shards) ]
+            try:
+                with tqdm(total=self._num_of_shards, desc=f'Shards ({self._num_of_workers} workers)') as pbar:
+                    pending = set(futures)
+                    while len(pending) > 0:
+                        done, pending = concurrent.futures.wait(pending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED)
+                        self.__class__._report_hits(hits_queue)
+                        for future in done:
+                            future.result()
+                            pbar.update(1)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        # Report hits that arrived after all shards were done
+        self.__class__._report_hits(hits_queue)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+from abc import abstractmethod
+import collections.abc
+import itertools
+import bisect
+import random
+
+class SearchSpaceBase(collections.abc.Sequence):
+    """
+        Base class for search spaces.
+        A search space is a lazy sequence of items, where each item is a dictionary that maps parameter names to values.
+        Being a sequence, a search space supports len(), random access by index and slicing (which returns a search space too).
+    """
+
+    @abstractmethod
+    def __len__(self):
+        """
+            Gets the number of items in the search space.
+        """
+        pass
+
+    @abstractmethod
+    def _get_item(self, index):
+        """
+            Gets an item by a non-negative index that is known to be in range.
+        """
+        pass
+
+    def __getitem__(self, index):
+        """
+            Gets an item by index, or a search space if a slice is given.
+        """
+
+        # Handle slices
+        if isinstance(index, slice):
+            return SliceSpace(self, range(len(self))[index])
+
+        # Handle negative indices and validate
+        size = len(self)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError(f'Search space index out of range: {index}')
+        return self._get_item(index)
+
+    def __iter__(self):
+        """
+            Iterates all items.
+        """
+
+        # Iterate by index by default
+        for index in range(len(self)):
+            yield self._get_item(index)
+
+    def shard(self, shard_index, num_of_shards):
+        """
+            Gets the part of the search space that belongs to the given shard.
+        """
+
+        # Validations
+        assert num_of_shards > 0, Exception(f'Invalid number of shards: {num_of_shards}')
+        assert 0 <= shard_index < num_of_shards, Exception(f'Invalid shard index: {shard_index}')
+
+        # Take every n-th item
+        return self[shard_index::num_of_shards]
+
+    def sample(self, count, seed=None):
+        """
+            Iterates a random sample of items without repetitions.
+        """
+
+        # Sample indices
+        for index in random.Random(seed).sample(range(len(self)), count):
+            yield self._get_item(index)
+
+class Dimension(SearchSpaceBase):
+    """
+        A single named parameter and its values.
+    """
+
+    def __init__(self, name, values):
+        """
+            Creates an instance.
+            Sets are sorted to get a stable order, and other non-sequences are saved as tuples.
+        """
+
+        # Save members
+        self._name = name
+        if isinstance(values, (set, frozenset)):
+            self._values = sorted(values)
+        elif isinstance(values, collections.abc.Sequence):
+            self._values = values
+        else:
+            self._values = tuple(values)
+
+    def __len__(self):
+        """
+            Gets the number of items in the search space.
+        """
+
+        # Return the number of values
+        return len(self._values)
+
+    def _get_item(self, index):
+        """
+            Gets an item by a non-negative index that is known to be in range.
+        """
+
+        # Get the value
+        return { self._name: self._values[index] }
+
+    def __iter__(self):
+        """
+            Iterates all items.
+        """
+
+        # Iterate values
+        for value in self._values:
+            yield { self._name: value }
+
+class Product(SearchSpaceBase):
+    """
+        The Cartesian product of search spaces, where the last search space changes the fastest (like itertools.product).
+    """
+
+    def __init__(self, *spaces):
+        """
+            Creates an instance.
+        """
+
+        # Save members
+        self._spaces = spaces
+        self._len = 1
+        for space in spaces:
+            self._len *= len(space)
+
+    def __len__(self):
+        """
+            Gets the number of items in the search space.
+        """
+
+        # Return the cached length
+        return self._len
+
+    def _get_item(self, index):
+        """
+            Gets an item by a non-negative index that is known to be in range.
+        """
+
+        # Decode the index as a mixed-radix number
+        items = []
+        for space in reversed(self._spaces):
+            index, space_index = divmod(index, len(space))
+            items.append(space._get_item(space_index))
+
+        # Merge items in the same order as iteration does
+        result = {}
+        for item in reversed(items):
+            result.update(item)
+        return result
+
+    def __iter__(self):
+        """
+            Iterates all items.
+        """
+
+        # Merge all the items of the product
+        for items in itertools.product(*self._spaces):
+            result = {}
+            for item in items:
+                result.update(item)
+            yield result
+
+class Chain(SearchSpaceBase):
+    """
+        The concatenation of search spaces.
+    """
+
+    def __init__(self, *spaces):
+        """
+            Creates an instance.
+        """
+
+        # Save members and the index at which each space ends
+        self._spaces = spaces
+        self._ends = list(itertools.accumulate(len(space) for space in spaces))
+
+    def __len__(self):
+        """
+            Gets the number of items in the search space.
+        """
+
+        # The last space ends at the total length
+        return self._ends[-1] if len(self._ends) > 0 else 0
+
+    def _get_item(self, index):
+        """
+            Gets an item by a non-negative index that is known to be in range.
+        """
+
+        # Find the space that contains the index
+        space_index = bisect.bisect_right(self._ends, index)
+        start = self._ends[space_index - 1] if space_index > 0 else 0
+        return self._spaces[space_index]._get_item(index - start)
+
+    def __iter__(self):
+        """
+            Iterates all items.
+        """
+
+        # Iterate all spaces
+        for space in self._spaces:
+            yield from space
+
+class SliceSpace(SearchSpaceBase):
+    """
+        A lazy view of some of the items of a search space, selected by a range of indices.
+    """
+
+    def __init__(self, space, indices):
+        """
+            Creates an instance.
+        """
+
+        # Save members
+        self._space = space
+        self._indices = indices
+
+    def __len__(self):
+        """
+            Gets the number of items in the search space.
+        """
+
+        # Return the number of indices
+        return len(self._indices)
+
+    def _get_item(self, index):
+        """
+            Gets an item by a non-negative index that is known to be in range.
+        """
+
+        # Translate the index
+        return self._space._get_item(self._indices[index])
+
+    def __getitem__(self, index):
+        """
+            Gets an item by index, or a search space if a slice is given.
+        """
+
+        # Slice the indices rather than nesting views
+        if isinstance(index, slice):
+            return SliceSpace(self._space, self._indices[index])
+        return super().__getitem__(index)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+from core import RuneUtils
+from core import ProcessedText
+from core import RuneTrie
+from transformers import PipelineExecutor
+from transformers import ShiftTransformer
+from transformers import AtbashTransformer
+from transformers import ReverseTransformer
+from transformers import AutokeyTransformer
+from transformers import AutokeyMode
+from transformers import VigenereTransformer
+from research_utils import ResearchUtils
+
+import os
+import random
+import string
+import tempfile
+import itertools
+import unittest
+import numpy as np
+
+def reference_english_to_runes(english):
+    """
+        A frozen copy of the original English to runes transliteration, which replaced quirks and Latin letters one by one.
+    """
+
+    # Only take letters and turn everything uppercase
+    s = ''.join([ i.upper() for i in english if i in string.ascii_letters ])
+
+    # Certain Cicada3301 quirks
+    s = s.replace('ING', 'NG')      # "BENG"
+    s = s.replace('IO', 'IA')       # "INSTRVCTIAN"
+    s = s.replace('QU', 'CW')       # "CWESTION"
+    s = s.replace('K', 'C')         # "BOOC"
+    s = s.replace('U', 'V')         # "OVR"
+    s = s.replace('Z', 'S')         # Hypothesis
+    s = s.replace('Q', 'C')         # Hypothesis
+
+    # Try to minimize the number of runes by prioritizing runes that translate to two-letter latin
+    for i in range(RuneUtils.size()):
+        if len(RuneUtils.latin_at(i)) == 1:
+            continue
+        s = s.replace(RuneUtils.latin_at(i), RuneUtils.rune_at(i))
+
+    # Translate all the rest
+    for i in range(RuneUtils.size()):
+        s = s.replace(RuneUtils.latin_at(i), RuneUtils.rune_at(i))
+
+    # Return result
+    return s
+
+class EnglishToRunesTest(unittest.TestCase):
+    """
+        Proves the compiled transliteration is equivalent to the original one.
+    """
+
+    # The wordlist that is transliterated by the dictionary
+    WORDLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'english_wordlist.txt')
+
+    @classmethod
+    def setUpClass(cls):
+        """
+            Reads the full wordlist, including empty lines.
+        """
+
+        # Read all lines
+        with open(cls.WORDLIST_PATH, 'r', encoding='utf-8') as fp:
+            cls.words = fp.read().splitlines()
+
+    def test_wordlist(self):
+        """
+            Every line of the wordlist is transliterated like the reference.
+        """
+
+        # Compare word by word
+        for word in self.words:
+            self.assertEqual(RuneUtils.english_to_runes(word), reference_english_to_runes(word), word)
+
+    def test_wordlist_bulk(self):
+        """
+            Transliterating the wordlist at once is identical to transliterating word by word.
+        """
+
+        # Compare with the per-word results
+        self.assertEqual(RuneUtils.english_to_runes_bulk(self.words), [ RuneUtils.english_to_runes(word) for word in self.words ])
+        self.assertEqual(RuneUtils.english_to_runes_bulk([]), [])
+
+    def test_overlapping_digraphs(self):
+        """
+            Overlapping digraphs and quirks are transliterated like the reference.
+        """
+
+        # A digraph loses to an overlapping digraph that comes earlier in the alphabet
+        self.assertEqual(RuneUtils.english_to_runes('EAE'), 'ᛖᚫ')
+        self.assertEqual(RuneUtils.english_to_runes('EAE'), reference_english_to_runes('EAE'))
+
+        # Chains of overlapping digraphs, quirks that create digraphs and non-letters
+        for english in ('EOE', 'OEO', 'THEOE', 'IAE', 'EAEA', 'AEAE', 'NGNG', 'KING', 'QUIO', 'ioing', 'Thing-Queue!', 'EO EA', 'uzq', 'IOEAEO', 'TH3 EA7'):
+            self.assertEqual(RuneUtils.english_to_runes(english), reference_english_to_runes(english), english)
+
+class PipelineExecutorTest(unittest.TestCase):
+    """
+        Proves running pipelines as a trie is equivalent to applying each pipeline directly.
+    """
+
+    # A text with punctuation around the runes
+    TEXT = 'ᚠᚢᚦ-ᚩᚱ ᚳᚷᚹ.ᚻᚾᛁ ᛄᛇ\nᛈᛉᛋᛏ-ᛒᛖ ᛗᛚᛝ. ᛟᛞᚪᚫ ᚣᛡᛠᚠ'
+
+    def _get_expected(self, pipeline):
+        """
+            Applies a pipeline directly on a new processed text.
+        """
+
+        # Transform one by one
+        processed_text = ProcessedText(self.__class__.TEXT)
+        for transformer in pipeline:
+            transformer.transform(processed_text)
+        return processed_text.get_rune_indices()
+
+    def test_random_pipelines(self):
+        """
+            Random pipelines, including empty and duplicate ones, give the same results with any number of cached buffers.
+        """
+
+        # Pipelines are random sequences of shared transformer instances, so they share prefixes
+        rng = random.Random(3301)
+        transformers = [ ShiftTransformer(shift=1), ShiftTransformer(shift=7), AtbashTransformer(), ReverseTransformer(), AutokeyTransformer(key='ᚠᚢᚦ', mode=AutokeyMode.PLAINTEXT), VigenereTransformer(key='ᛞᚪ') ]
+        pipelines = [ tuple(rng.choice(transformers) for _ in range(rng.randint(0, 4))) for _ in range(300) ]
+        pipelines += [ (), pipelines[0], pipelines[1], () ]
+        self.assertGreater(len([ pipeline for pipeline in pipelines if len(pipeline) == 0 ]), 2)
+
+        # Compare each yielded result with applying its pipeline directly
+        expected = [ self._get_expected(pipeline) for pipeline in pipelines ]
+        for max_cached_buffers in (None, 0, 1, 2):
+            processed_text = ProcessedText(self.__class__.TEXT)
+            processed_text.set_rune_indices(bytes(len(expected[0])))
+            yielded = []
+            for pipeline_index in PipelineExecutor(pipelines, max_cached_buffers=max_cached_buffers).run(processed_text):
+                self.assertEqual(processed_text.get_rune_indices(), expected[pipeline_index], (max_cached_buffers, pipelines[pipeline_index]))
+                yielded.append(pipeline_index)
+
+            # Every pipeline is yielded exactly once and the processed text is reverted
+            self.assertEqual(sorted(yielded), list(range(len(pipelines))))
+            self.assertEqual(processed_text.get_rune_indices(), ProcessedText(self.__class__.TEXT).get_rune_indices())
+
+class RuneTrieTest(unittest.TestCase):
+    """
+        Proves a trie backed by memory-mapped arrays is equivalent to the trie it was saved from.
+    """
+
+    def test_memory_mapped_arrays(self):
+        """
+            Lookups of words, prefixes and random runes give the same results, both one by one and for many nodes at once.
+        """
+
+        # Build a trie of random words
+        rng = random.Random(3301)
+        random_runes = lambda max_len:''.join([ RuneUtils.rune_at(rng.randrange(RuneUtils.size())) for _ in range(rng.randint(0, max_len)) ])
+        words = [ random_runes(6) for _ in range(2000) ]
+        trie = RuneTrie(words)
+
+        # Save its arrays and memory-map them
+        with tempfile.TemporaryDirectory() as dir_path:
+            arrays = []
+            for index, array in enumerate(trie.to_arrays()):
+                path = os.path.join(dir_path, f'{index}.npy')
+                np.save(path, array)
+                arrays.append(np.load(path, mmap_mode='r'))
+            mapped = RuneTrie.from_arrays(*arrays)
+
+            # Compare lookups one by one
+            self.assertEqual(len(mapped), len(trie))
+            for candidate in words + [ word[:-1] for word in words ] + [ random_runes(8) for _ in range(2000) ]:
+                indices = RuneUtils.runes_to_indices(candidate)
+                self.assertEqual(mapped.contains_indices(indices), trie.contains_indices(indices), candidate)
+                self.assertEqual(mapped.contains_indices(indices, 1), trie.contains_indices(indices, 1), candidate)
+                self.assertEqual(candidate in mapped, candidate in trie, candidate)
+
+            # Compare lookups of many nodes at once
+            nodes = np.array([ rng.randrange(len(arrays[2])) for _ in range(5000) ])
+            indices = np.array([ rng.randrange(RuneUtils.size()) for _ in range(5000) ])
+            self.assertTrue((mapped.get_children(nodes, indices) == trie.get_children(nodes, indices)).all())
+            self.assertTrue((mapped.are_words(nodes) == trie.are_words(nodes)).all())
+            del mapped, arrays
+
+class InterrupterDecryptionsTest(unittest.TestCase):
+    """
+        Proves the pruned interrupter search is equivalent to decrypting every subset of potential interrupters.
+    """
+
+    # The interrupter is the first rune
+    INTERRUPTER = 0
+
+    @classmethod
+    def _decrypt(cls, ciphertext, keystream, interrupt_indices):
+        """
+            Decrypts with an additive keystream, where interrupters are left untouched and do not consume keystream values.
+        """
+
+        # Only non-interrupters consume the keystream
+        result = list(ciphertext)
+        keystream_index = 0
+        for position in range(len(ciphertext)):
+            if position in interrupt_indices or keystream_index >= len(keystream):
+                continue
+            result[position] = (ciphertext[position] + keystream[keystream_index]) % RuneUtils.size()
+            keystream_index += 1
+        return bytes(result)
+
+    @classmethod
+    def _get_random_text(cls, rng):
+        """
+            Gets a random text of a few short words with many potential interrupters.
+        """
+
+        # Join random words with random separators
+        text = ''
+        for _ in range(rng.randint(1, 5)):
+            text += ''.join([ RuneUtils.rune_at(cls.INTERRUPTER if rng.random() < 0.3 else rng.randrange(RuneUtils.size())) for _ in range(rng.randint(1, 4)) ])
+            text += rng.choice((' ', '-', '. ', '\n'))
+        return text
+
+    def _check_trial(self, rng, num_of_words, use_objects):
+        """
+            Compares the pruned search with an exhaustive search on a random text, keystreams and wordlist.
+        """
+
+        # Random ciphertext and keystreams
+        processed_text = ProcessedText(self._get_random_text(rng))
+        ciphertext = processed_text.get_rune_indices()
+        word_offsets = processed_text.get_word_offsets()[:num_of_words]
+        keystreams = np.array([ [ rng.randrange(RuneUtils.size()) for _ in range(len(ciphertext)) ] for _ in range(rng.randint(1, 6)) ], dtype=np.int64)
+        reduced = keystreams.tolist()
+        if use_objects:
+            keystreams = keystreams.astype(object) + RuneUtils.size() * 10**30 * rng.choice((-1, 1))
+
+        # Potential interrupters are only branched on up to the end of the last checked word
+        checked_len = max([ end for (_, end) in word_offsets ]) if len(word_offsets) > 0 else 0
+        potential = [ position for position in range(checked_len) if ciphertext[position] == self.__class__.INTERRUPTER ]
+        subsets = [ set(subset) for count in range(len(potential) + 1) for subset in itertools.combinations(potential, count) ]
+
+        # Build a wordlist that some decryptions pass, alongside random words
+        trie = RuneTrie()
+        for _ in range(rng.randint(0, 3)):
+            decrypted = self._decrypt(ciphertext, rng.choice(reduced), rng.choice(subsets))
+            for (start, end) in word_offsets:
+                trie.add(RuneUtils.indices_to_rune_string(decrypted[start:end]))
+        for _ in range(20):
+            trie.add(''.join([ RuneUtils.rune_at(rng.randrange(RuneUtils.size())) for _ in range(rng.randint(1, 3)) ]))
+
+        # Exhaustively decrypt every subset with every keystream, keeping decryptions whose checked words are all in the wordlist
+        expected = []
+        for subset in subsets:
+            for row, keystream in enumerate(reduced):
+                decrypted = self._decrypt(ciphertext, keystream, subset)
+                if all([ trie.contains_indices(decrypted, start, end) for (start, end) in word_offsets ]):
+                    expected.append((tuple(sorted(subset)), row, decrypted))
+
+        # Compare with the pruned search
+        actual = []
+        for interrupt_indices, rows, results in ResearchUtils.iterate_interrupter_decryptions(processed_text, keystreams, trie, num_of_words=num_of_words):
+            for row, result in zip(rows.tolist(), results):
+                actual.append((tuple(interrupt_indices), row, bytes(result.astype(np.uint8))))
+        self.assertEqual(sorted(actual), sorted(expected))
+        return len(expected)
+
+    def test_random_trials(self):
+        """
+            Random trials give the same decryptions as the exhaustive search, checking all words or just the first ones.
+        """
+
+        # Run trials and make sure decryptions survive in most settings
+        rng = random.Random(3301)
+        for num_of_words in (None, 1, 2):
+            for use_objects in (False, True):
+                num_of_decryptions = sum([ self._check_trial(rng, num_of_words, use_objects) for _ in range(100) ])
+                self.assertGreater(num_of_decryptions, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,9 @@ from enum import Enum
 from core import ProcessedText
 import os
 import itertools
+import collections
+import math
+import numpy as np
 
 # Autokey modes
 AutokeyMode = Enum('AutokeyMode', [ 'PLAINTEXT', 'CIPHERTEXT', 'ALT_START_PLAINTEXT', 'ALT_START_CIPHERTEXT', 'ALT_MOBIUS_START_PLAINTEXT', 'ALT_MOBIUS_START_CIPHERTEXT' ])
@@ -19,6 +22,22 @@ class MathUtils(object):
     # Fibonacci primes cache
     _FIBO_PRIMES_CACHE = None
 
+    # Primes table - contains all primes below the sieve limit in ascending order, grows on demand
+    _PRIMES_CACHE = np.array([ 2, 3, 5, 7 ], dtype=np.int64)
+    _PRIMES_SIEVE_LIMIT = 10
+
+    # Primes table sieve segment size and the maximum sieve limit (falls back to sympy beyond it)
+    _PRIMES_SEGMENT_SIZE = 1 << 18
+    _PRIMES_MAX_SIEVE_LIMIT = 1 << 28
+
+    # Totient and Mobius tables - contain the values for all naturals below the sieve limit, grow on demand
+    _TOTIENTS_CACHE = np.array([ 0, 1 ], dtype=np.int64)
+    _MOBIUS_CACHE = np.array([ 0, 1 ], dtype=np.int8)
+    _ARITHMETIC_SIEVE_LIMIT = 2
+
+    # Totient and Mobius tables maximum sieve limit (falls back to sympy beyond it)
+    _ARITHMETIC_MAX_SIEVE_LIMIT = 1 << 23
+
     @staticmethod
     def get_all_subsets(li):
         """
@@ -28,32 +47,259 @@ class MathUtils(object):
         # Get all subsets
         return itertools.chain.from_iterable(itertools.combinations(li, r) for r in range(len(li) + 1))
 
-    @staticmethod
-    def find_next_prime(prev_prime):
+    @classmethod
+    def _extend_primes(cls, limit):
+        """
+            Extends the primes table to contain all primes below the given limit, using a segmented Sieve of Eratosthenes.
+        """
+
+        # Nothing to do if the table is already large enough
+        if limit <= cls._PRIMES_SIEVE_LIMIT:
+            return
+        assert limit <= cls._PRIMES_MAX_SIEVE_LIMIT, Exception(f'Primes table limit is too large: {limit}')
+
+        # Make sure all base primes up to the square root of the limit are available
+        root_limit = math.isqrt(limit - 1) + 1
+        cls._extend_primes(root_limit)
+        base_primes = cls._PRIMES_CACHE[:np.searchsorted(cls._PRIMES_CACHE, root_limit)].tolist()
+
+        # Sieve one segment at a time
+        segments = [ cls._PRIMES_CACHE ]
+        low = cls._PRIMES_SIEVE_LIMIT
+        while low < limit:
+            high = min(low + cls._PRIMES_SEGMENT_SIZE, limit)
+            is_prime = np.ones(high - low, dtype=bool)
+            for p in base_primes:
+                if p * p >= high:
+                    break
+                start = max(p * p, ((low + p - 1) // p) * p)
+                is_prime[start - low::p] = False
+            segments.append(np.flatnonzero(is_prime) + low)
+            low = high
+
+        # Save the extended table
+        cls._PRIMES_CACHE = np.concatenate(segments)
+        cls._PRIMES_SIEVE_LIMIT = limit
+
+    @classmethod
+    def _ensure_primes_count(cls, count):
+        """
+            Makes sure the primes table contains at least the given number of primes.
+            Returns False if that would exceed the maximum sieve limit.
+        """
+
+        # Grow geometrically, starting from an upper bound estimation of the n-th prime
+        while len(cls._PRIMES_CACHE) < count:
+            if cls._PRIMES_SIEVE_LIMIT >= cls._PRIMES_MAX_SIEVE_LIMIT:
+                return False
+            estimation = int(count * (math.log(count) + math.log(math.log(count)))) + 1 if count >= 6 else 14
+            cls._extend_primes(min(max(estimation, cls._PRIMES_SIEVE_LIMIT * 2), cls._PRIMES_MAX_SIEVE_LIMIT))
+        return True
+
+    @classmethod
+    def _ensure_primes_above(cls, value):
+        """
+            Makes sure the primes table contains a prime greater than the given value.
+            Returns False if that would exceed the maximum sieve limit.
+        """
+
+        # Grow geometrically
+        while cls._PRIMES_CACHE[-1] <= value:
+            if cls._PRIMES_SIEVE_LIMIT >= cls._PRIMES_MAX_SIEVE_LIMIT:
+                return False
+            cls._extend_primes(min(max(value * 2, cls._PRIMES_SIEVE_LIMIT * 2), cls._PRIMES_MAX_SIEVE_LIMIT))
+        return True
+
+    @classmethod
+    def prime_at(cls, index):
+        """
+            Gets the prime at the given (zero-based) index, i.e. prime_at(0) is 2.
+        """
+
+        # Get from the primes table
+        assert index >= 0, Exception(f'Invalid prime index: {index}')
+        is_available = cls._ensure_primes_count(index + 1)
+        assert is_available, Exception(f'Prime index is too large: {index}')
+        return int(cls._PRIMES_CACHE[index])
+
+    @classmethod
+    def get_primes(cls, start_index, stop_index, step=1):
+        """
+            Gets the primes between the given (zero-based) indices as an array, similarly to range semantics.
+        """
+
+        # Slice the primes table
+        assert 0 <= start_index <= stop_index, Exception(f'Invalid prime indices: {start_index}, {stop_index}')
+        is_available = cls._ensure_primes_count(stop_index)
+        assert is_available, Exception(f'Prime index is too large: {stop_index}')
+        return cls._PRIMES_CACHE[start_index:stop_index:step].copy()
+
+    @classmethod
+    def iter_primes(cls, start_index=0, step=1):
+        """
+            Iterates primes from the given (zero-based) index forever, taking every step-th prime.
+        """
+
+        # Iterate the primes table in growing chunks
+        assert step > 0, Exception(f'Invalid step between primes: {step}')
+        index = start_index
+        chunk_size = 1024
+        while True:
+            if not cls._ensure_primes_count(index + chunk_size * step):
+                break
+            yield from cls._PRIMES_CACHE[index:index + chunk_size * step:step].tolist()
+            index += chunk_size * step
+            chunk_size *= 2
+
+        # Continue naively beyond the primes table limit
+        curr_index = len(cls._PRIMES_CACHE) - 1
+        curr_prime = int(cls._PRIMES_CACHE[-1])
+        while True:
+            if index < len(cls._PRIMES_CACHE):
+                curr_index, curr_prime = index, int(cls._PRIMES_CACHE[index])
+            while curr_index < index:
+                curr_prime = cls.find_next_prime(curr_prime)
+                curr_index += 1
+            yield curr_prime
+            index += step
+
+    @classmethod
+    def index_of(cls, prime):
+        """
+            Gets the (zero-based) index of the given prime, i.e. index_of(2) is 0.
+        """
+
+        # Look up in the primes table
+        is_available = cls._ensure_primes_above(prime)
+        assert is_available, Exception(f'Prime is too large: {prime}')
+        index = int(np.searchsorted(cls._PRIMES_CACHE, prime))
+        assert cls._PRIMES_CACHE[index] == prime, Exception(f'Not a prime: {prime}')
+        return index
+
+    @classmethod
+    def prime_count(cls, value):
+        """
+            Counts the primes that are less than or equal to the given value.
+        """
+
+        # Look up in the primes table
+        is_available = cls._ensure_primes_above(value)
+        assert is_available, Exception(f'Value is too large: {value}')
+        return int(np.searchsorted(cls._PRIMES_CACHE, value, side='right'))
+
+    @classmethod
+    def is_prime(cls, num):
+        """
+            Indicates if the given number is a prime.
+        """
+
+        # Use the primes table if it covers the number, otherwise use sympy
+        if num >= cls._PRIMES_SIEVE_LIMIT:
+            return sympy.isprime(num)
+        index = np.searchsorted(cls._PRIMES_CACHE, num)
+        return bool(index < len(cls._PRIMES_CACHE) and cls._PRIMES_CACHE[index] == num)
+
+    @classmethod
+    def find_next_prime(cls, prev_prime):
         """
             Finds the next prime number.
         """
 
-        # Return the next prime
-        return sympy.nextprime(prev_prime)
+        # Use the primes table unless the number is too large
+        if not cls._ensure_primes_above(prev_prime):
+            return sympy.nextprime(prev_prime)
+        return int(cls._PRIMES_CACHE[np.searchsorted(cls._PRIMES_CACHE, prev_prime, side='right')])
 
-    @staticmethod
-    def mobius(n):
+    @classmethod
+    def _extend_arithmetic_tables(cls, limit):
+        """
+            Extends the Totient and Mobius tables to contain the values of all naturals below the given limit.
+            Sieves over the primes table, handling all multiples of each prime at once.
+        """
+
+        # Nothing to do if the tables are already large enough
+        if limit <= cls._ARITHMETIC_SIEVE_LIMIT:
+            return
+        limit = min(max(limit, cls._ARITHMETIC_SIEVE_LIMIT * 2), cls._ARITHMETIC_MAX_SIEVE_LIMIT)
+
+        # Primes above half the limit have no other multiples below the limit, so handle them all at once
+        primes = cls.get_primes(0, cls.prime_count(limit - 1))
+        large_primes = primes[primes > limit // 2]
+        totients = np.arange(limit, dtype=np.int64)
+        mobius_values = np.ones(limit, dtype=np.int8)
+        mobius_values[0] = 0
+        totients[large_primes] -= 1
+        mobius_values[large_primes] = -1
+
+        # Sieve the multiples of all other primes
+        for p in primes[:len(primes) - len(large_primes)].tolist():
+            totients[p::p] -= totients[p::p] // p
+            mobius_values[p::p] *= -1
+            mobius_values[p*p::p*p] = 0
+
+        # Save the extended tables
+        cls._TOTIENTS_CACHE = totients
+        cls._MOBIUS_CACHE = mobius_values
+        cls._ARITHMETIC_SIEVE_LIMIT = limit
+
+    @classmethod
+    def _ensure_arithmetic_tables(cls, n):
+        """
+            Makes sure the Totient and Mobius tables contain the given natural.
+            Returns False if the natural is not positive or would exceed the maximum sieve limit.
+        """
+
+        # Extend if possible
+        if n < 1 or n >= cls._ARITHMETIC_MAX_SIEVE_LIMIT:
+            return False
+        cls._extend_arithmetic_tables(n + 1)
+        return True
+
+    @classmethod
+    def mobius(cls, n):
         """
             Defines Mobius function.
         """
 
-        # Use sympy
-        return sympy.mobius(n)
+        # Use the Mobius table unless the number is too large
+        if not cls._ensure_arithmetic_tables(n):
+            return sympy.mobius(n)
+        return int(cls._MOBIUS_CACHE[n])
 
-    @staticmethod
-    def totient(n):
+    @classmethod
+    def totient(cls, n):
         """
             Defines the Totient function.
         """
 
-        # Use sympy
-        return sympy.totient(n)
+        # Use the Totient table unless the number is too large
+        if not cls._ensure_arithmetic_tables(n):
+            return sympy.totient(n)
+        return int(cls._TOTIENTS_CACHE[n])
+
+    @classmethod
+    def get_mobius_values(cls, values):
+        """
+            Gets the Mobius function of all given naturals as an array.
+        """
+
+        # Use the Mobius table unless some numbers are too large
+        values = np.asarray(values)
+        if values.size == 0 or values.min() < 1 or not cls._ensure_arithmetic_tables(values.max()):
+            return np.array([ cls.mobius(n) for n in values.tolist() ], dtype=np.int64)
+        return cls._MOBIUS_CACHE[values.astype(np.int64)].astype(np.int64)
+
+    @classmethod
+    def get_totients(cls, values):
+        """
+            Gets the Totient function of all given naturals as an array.
+        """
+
+        # Use the Totient table unless some numbers are too large
+        values = np.asarray(values)
+        if values.size == 0 or values.min() < 1 or not cls._ensure_arithmetic_tables(values.max()):
+            return np.array([ cls.totient(n) for n in values.tolist() ], dtype=object)
+        return cls._TOTIENTS_CACHE[values.astype(np.int64)]
 
     @staticmethod
     def sqrt(num):
@@ -77,19 +323,27 @@ class MathUtils(object):
         # See if the square root is an integer
         return sympy.sqrt(num).is_Integer
 
-    @staticmethod
-    def gen_primes(first_value=2, indices_apart=1):
+    @classmethod
+    def gen_primes(cls, first_value=2, indices_apart=1):
         """
             A generator for primes.
         """
 
-        # Generate primes forever
+        # Yield the first value as-is (even if it is not a prime)
         assert indices_apart > 0, Exception(f'Invalid argument for indices apart between primes: {indices_apart}')
+        yield first_value
+
+        # Walk the primes table from the first prime that is greater than the first value
+        if cls._ensure_primes_above(first_value):
+            next_index = int(np.searchsorted(cls._PRIMES_CACHE, first_value, side='right'))
+            yield from cls.iter_primes(start_index=next_index + indices_apart - 1, step=indices_apart)
+
+        # Generate primes naively forever if the first value is too large
         curr_prime = first_value
         while True:
-            yield curr_prime
             for i in range(indices_apart):
-                curr_prime = MathUtils.find_next_prime(curr_prime)
+                curr_prime = cls.find_next_prime(curr_prime)
+            yield curr_prime
 
     @staticmethod
     def gen_totients(start_at_0=False):
@@ -101,8 +355,14 @@ class MathUtils(object):
         if start_at_0:
             yield 0
 
-        # Generate forever
+        # Walk the Totient table in growing chunks
         n = 1
+        while n + 1 < MathUtils._ARITHMETIC_MAX_SIEVE_LIMIT:
+            MathUtils._extend_arithmetic_tables(n * 2)
+            yield from MathUtils._TOTIENTS_CACHE[n:MathUtils._ARITHMETIC_SIEVE_LIMIT].tolist()
+            n = MathUtils._ARITHMETIC_SIEVE_LIMIT
+
+        # Generate forever
         while True:
             yield MathUtils.totient(n)
             n += 1
@@ -183,6 +443,73 @@ class MathUtils(object):
             if not repeat:
                 break
 
+class Alphabet(object):
+    """
+        A working alphabet (all runes, optionally starting with a prefix) alongside its lookup tables.
+        Instances are cached by prefix, so use Alphabet.get rather than creating them directly.
+    """
+
+    # Alphabets cache by prefix, bounded by evicting the least recently used alphabets
+    _ALPHABETS_CACHE = collections.OrderedDict()
+    _ALPHABETS_CACHE_SIZE = 4096
+
+    def __init__(self, prefix=''):
+        """
+            Creates an instance.
+        """
+
+        # Build the alphabet
+        assert len(prefix) == len([ c for c in prefix if RuneUtils.is_rune(c) ]), Exception(f'Invalid alphabet prefix: {prefix}')
+        assert len(prefix) == len(set(prefix)), Exception(f'Repeating elements in alphabet prefix are forbidden: {prefix}')
+        self.prefix = prefix
+        self.runes = prefix + ''.join([ rune for rune in RuneUtils.iter_runes() if rune not in prefix ])
+
+        # Map runes to indices in the alphabet
+        self.rune_to_index = dict([ (rune, index) for (index, rune) in enumerate(self.runes) ])
+
+        # Translation tables between rune indices and alphabet indices, to be used with bytes.translate
+        self.to_alphabet = bytes([ self.rune_to_index[rune] for rune in RuneUtils.iter_runes() ]).ljust(256, b'\0')
+        self.from_alphabet = bytes([ RuneUtils.get_rune_index(rune) for rune in self.runes ]).ljust(256, b'\0')
+
+    @classmethod
+    def get(cls, prefix=''):
+        """
+            Gets the alphabet for the given prefix.
+        """
+
+        # Get from cache and mark as recently used
+        alphabet = cls._ALPHABETS_CACHE.get(prefix)
+        if alphabet is not None:
+            cls._ALPHABETS_CACHE.move_to_end(prefix)
+            return alphabet
+
+        # Create and evict the least recently used alphabet if needed
+        alphabet = Alphabet(prefix)
+        cls._ALPHABETS_CACHE[prefix] = alphabet
+        if len(cls._ALPHABETS_CACHE) > cls._ALPHABETS_CACHE_SIZE:
+            cls._ALPHABETS_CACHE.popitem(last=False)
+        return alphabet
+
+    def __len__(self):
+        """
+            Gets the alphabet size.
+        """
+
+        # Return the size
+        return len(self.runes)
+
+    def keys_to_matrix(self, keys):
+        """
+            Turns Runic keys to a 2D matrix of indices in the alphabet (padded with zeros to the longest key) and an array of their lengths.
+        """
+
+        # Fill each row with its key
+        key_lengths = np.array([ len(key) for key in keys ], dtype=np.int64)
+        matrix = np.zeros((len(keys), max(key_lengths.tolist(), default=0)), dtype=np.int64)
+        for row, key in enumerate(keys):
+            matrix[row, :len(key)] = [ self.rune_to_index[rune] for rune in key ]
+        return matrix, key_lengths
+
 class TransformerBase(ABC):
     """
         Base class for transformers.
@@ -195,15 +522,179 @@ class TransformerBase(ABC):
         """
         pass
 
+    def transform_lazy(self, processed_text):
+        """
+            Transforms a processed text lazily, so runes are only transformed as they are pulled from the processed text.
+            Transformers that do not override this method simply transform eagerly.
+        """
+
+        # Transform eagerly by default
+        self.transform(processed_text)
+
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer, i.e. the value added to each rune (as an index in the working alphabet).
+            Returns None for transformers that are not additive, which is the default.
+        """
+
+        # Not additive by default
+        return None
+
+    @staticmethod
+    def _get_non_interrupted_positions(num_of_runes, interrupt_indices):
+        """
+            Gets the positions of all runes that are not interrupters as an array.
+        """
+
+        # Build a mask of non-interrupters
+        mask = np.ones(num_of_runes, dtype=bool)
+        mask[[ index for index in interrupt_indices if index < num_of_runes ]] = False
+        return np.flatnonzero(mask)
+
+    def _spread_keystream(self, values, num_of_runes, interrupt_indices, add):
+        """
+            Builds an additive keystream by spreading the given values over all non-interrupted positions.
+            Values are added or substructed and interrupters are left untouched.
+        """
+
+        # Reduce values (could be arbitrarily big or non-native integers) in the working alphabet
+        size = len(self._alphabet)
+        values = np.asarray(values)
+        if values.dtype == object:
+            values = (values % size).astype(np.int64)
+        values = values.astype(np.int64) % size
+        if not add:
+            values = (size - values) % size
+
+        # Spread on the non-interrupted positions
+        positions = self.__class__._get_non_interrupted_positions(num_of_runes, interrupt_indices)[:len(values)]
+        keystream = np.zeros(num_of_runes, dtype=np.int64)
+        keystream[positions] = values[:len(positions)]
+        return keystream
+
+    def _apply_keystream(self, processed_text, keystream):
+        """
+            Adds an additive keystream to the processed text runes in a single pass.
+        """
+
+        # Add in the working alphabet
+        runes = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8)
+        self._set_alphabet_indices(processed_text, ((runes + keystream) % len(self._alphabet)).astype(np.uint8).tobytes())
+
     def __init__(self, alphabet_prefix=''):
         """
             Creates an instance.
         """
 
-        # Saves the alphabet
-        assert len(alphabet_prefix) == len([ c for c in alphabet_prefix if RuneUtils.is_rune(c) ]), Exception(f'Invalid alphabet prefix: {alphabet_prefix}')
-        assert len(alphabet_prefix) == len(set(alphabet_prefix)), Exception(f'Repeating elements in alphabet prefix are forbidden: {alphabet_prefix}')
-        self._alphabet = alphabet_prefix + ''.join([ RuneUtils.rune_at(i) for i in range(RuneUtils.size()) if RuneUtils.rune_at(i) not in alphabet_prefix ])
+        # Saves the alphabet from cache
+        alphabet = Alphabet.get(alphabet_prefix)
+        self._alphabet = alphabet.runes
+        self._alphabet_indices = alphabet.rune_to_index
+
+        # Save translation tables between rune indices and alphabet indices
+        self._to_alphabet = alphabet.to_alphabet
+        self._from_alphabet = alphabet.from_alphabet
+
+    def _get_alphabet_indices(self, processed_text):
+        """
+            Gets the processed text runes as indices in the working alphabet.
+        """
+
+        # Translate from rune indices
+        return processed_text.get_rune_indices().translate(self._to_alphabet)
+
+    def _set_alphabet_indices(self, processed_text, alphabet_indices):
+        """
+            Sets the processed text runes from indices in the working alphabet.
+        """
+
+        # Translate to rune indices
+        processed_text.set_rune_indices(bytes(alphabet_indices).translate(self._from_alphabet))
+
+    def _iter_alphabet_indices(self, processed_text):
+        """
+            Iterates the processed text runes as indices in the working alphabet, lazily.
+        """
+
+        # Translate from rune indices as they are pulled
+        return map(self._to_alphabet.__getitem__, processed_text.iter_rune_indices())
+
+    def _set_alphabet_indices_lazy(self, processed_text, alphabet_indices):
+        """
+            Sets the processed text runes from an iterable of indices in the working alphabet, which is only consumed as runes are pulled.
+        """
+
+        # Translate to rune indices as they are pulled
+        processed_text.set_rune_stream(map(self._from_alphabet.__getitem__, alphabet_indices))
+
+class PipelineExecutor(object):
+    """
+        Runs many transformer pipelines (sequences of transformers) on a processed text, treating them as a trie.
+        Each distinct pipeline prefix is only transformed once, since its result is cached and shared by all pipelines that start with it.
+        Transformers are expected to be deterministic, i.e. transforming the same runes twice gives the same result.
+    """
+
+    def __init__(self, pipelines, max_cached_buffers=None):
+        """
+            Creates an instance.
+            Pipelines are traversed depth-first, so at most one buffer per depth is cached at any time.
+            Limiting the number of cached buffers drops the deepest ones first, which are then recomputed from their nearest cached ancestor.
+        """
+
+        # Build the trie where each node is a list of its transformer, its children keyed by transformer identity and the pipeline indices that end in it
+        self._root = [ None, {}, [] ]
+        for pipeline_index, pipeline in enumerate(pipelines):
+            node = self._root
+            for transformer in pipeline:
+                if id(transformer) not in node[1]:
+                    node[1][id(transformer)] = [ transformer, {}, [] ]
+                node = node[1][id(transformer)]
+            node[2].append(pipeline_index)
+
+        # Save members
+        self._max_cached_buffers = max_cached_buffers
+
+    def run(self, processed_text):
+        """
+            Iterates the indices of all pipelines, where the processed text holds the result of each pipeline when its index is yielded.
+            Pipelines are applied to the original runes of the processed text, which is reverted when done.
+        """
+
+        # Start from the original runes, which are the result of empty pipelines
+        processed_text.revert()
+        snapshot = processed_text.snapshot()
+        for pipeline_index in self._root[2]:
+            yield pipeline_index
+        yield from self._run_node(processed_text, self._root, snapshot, [], 0)
+        processed_text.revert()
+
+    def _run_node(self, processed_text, node, snapshot, replay, depth):
+        """
+            Iterates the indices of all pipelines under a trie node.
+            The node result is the snapshot after replaying the given transformers on it.
+        """
+
+        # Run all children
+        for child in node[1].values():
+
+            # Transform the result of the node
+            transformer, children, pipeline_indices = child
+            processed_text.restore(snapshot)
+            for replayed_transformer in replay:
+                replayed_transformer.transform(processed_text)
+            transformer.transform(processed_text)
+
+            # Either cache the result or replay the transformer to get it again
+            if self._max_cached_buffers is None or depth < self._max_cached_buffers:
+                child_snapshot, child_replay = processed_text.snapshot(), []
+            else:
+                child_snapshot, child_replay = snapshot, replay + [ transformer ]
+
+            # Yield all pipelines that end here and continue with the children
+            for pipeline_index in pipeline_indices:
+                yield pipeline_index
+            if len(children) > 0:
+                yield from self._run_node(processed_text, child, child_snapshot, child_replay, depth + 1)
 
 class ShiftTransformer(TransformerBase):
     """
@@ -225,7 +716,25 @@ class ShiftTransformer(TransformerBase):
         """
 
         # Performs the shift transformation
-        processed_text.set_runes([ self._alphabet[(self._alphabet.index(rune) + self._shift) % len(self._alphabet)] for rune in processed_text.get_runes() ])
+        size = len(self._alphabet)
+        self._set_alphabet_indices(processed_text, [ (index + self._shift) % size for index in self._get_alphabet_indices(processed_text) ])
+
+    def transform_lazy(self, processed_text):
+        """
+            Transforms runes lazily.
+        """
+
+        # Performs the shift transformation as runes are pulled
+        size = len(self._alphabet)
+        self._set_alphabet_indices_lazy(processed_text, ((index + self._shift) % size for index in self._iter_alphabet_indices(processed_text)))
+
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer.
+        """
+
+        # The shift is added to all runes
+        return np.full(num_of_runes, self._shift, dtype=np.int64)
 
 class AtbashTransformer(TransformerBase):
     """
@@ -239,7 +748,18 @@ class AtbashTransformer(TransformerBase):
 
         # Performs Atbash transformation
         super().__init__(alphabet_prefix=alphabet_prefix)
-        processed_text.set_runes([ self._alphabet[len(self._alphabet) - self._alphabet.index(rune) - 1] for rune in processed_text.get_runes() ])
+        size = len(self._alphabet)
+        self._set_alphabet_indices(processed_text, [ size - index - 1 for index in self._get_alphabet_indices(processed_text) ])
+
+    def transform_lazy(self, processed_text, alphabet_prefix=''):
+        """
+            Transforms runes lazily.
+        """
+
+        # Performs Atbash transformation as runes are pulled
+        super().__init__(alphabet_prefix=alphabet_prefix)
+        size = len(self._alphabet)
+        self._set_alphabet_indices_lazy(processed_text, (size - index - 1 for index in self._iter_alphabet_indices(processed_text)))
 
 class AutokeyTransformer(TransformerBase):
     """
@@ -257,7 +777,7 @@ class AutokeyTransformer(TransformerBase):
         # Save the key indices
         super().__init__(alphabet_prefix=alphabet_prefix)
         assert len(key) > 0, Exception('Empty key')
-        self._key_indices = [ self._alphabet.index(rune) for rune in key ]
+        self._key_indices = [ self._alphabet_indices[rune] for rune in key ]
 
         # Save the interrupters
         self._interrupt_indices = interrupt_indices
@@ -271,107 +791,178 @@ class AutokeyTransformer(TransformerBase):
             Transforms runes.
         """
 
+        # Decrypt and set the result
+        self._set_alphabet_indices(processed_text, self._decrypt_indices(self._get_alphabet_indices(processed_text), self._interrupt_indices))
+
+    def transform_lazy(self, processed_text):
+        """
+            Transforms runes lazily.
+        """
+
+        # Decrypt as runes are pulled
+        self._set_alphabet_indices_lazy(processed_text, self._iter_decrypt_indices(self._iter_alphabet_indices(processed_text), self._interrupt_indices, processed_text.get_num_of_runes()))
+
+    def transform_batch(self, processed_text, keys, key_lengths):
+        """
+            Transforms runes with each of the given keys (in the same mode) and returns a 2D matrix of rune indices.
+            Keys are rows of a 2D matrix of indices in the working alphabet alongside their lengths, as returned by Alphabet.keys_to_matrix.
+            Each row could be set as the processed text rune indices, and the processed text itself is not modified.
+        """
+
+        # Runes that consume the keystream are non-interrupters (and in Mobius modes, runes whose 1-based index has a non-zero Mobius value)
+        size = len(self._alphabet)
+        keys = np.asarray(keys, dtype=np.int64)
+        key_lengths = np.asarray(key_lengths, dtype=np.int64)
+        ciphertext = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8).astype(np.int64)
+        positions = self.__class__._get_non_interrupted_positions(len(ciphertext), self._interrupt_indices)
+        if self._mode in (AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
+            mobius_values = MathUtils.get_mobius_values(np.arange(1, len(ciphertext) + 1))
+            positions = positions[mobius_values[positions] != 0]
+
+        # Decide which consumed runes extend the keystream with their plaintext (in Mobius modes, those with a Mobius value of 1)
+        num_of_values = len(positions)
+        if self._mode == AutokeyMode.PLAINTEXT:
+            extend_to_plaintext = np.ones(num_of_values, dtype=bool)
+        elif self._mode == AutokeyMode.CIPHERTEXT:
+            extend_to_plaintext = np.zeros(num_of_values, dtype=bool)
+        elif self._mode == AutokeyMode.ALT_START_PLAINTEXT:
+            extend_to_plaintext = np.arange(num_of_values) % 2 == 0
+        elif self._mode == AutokeyMode.ALT_START_CIPHERTEXT:
+            extend_to_plaintext = np.arange(num_of_values) % 2 == 1
+        else:
+            extend_to_plaintext = mobius_values[positions] == 1
+
+        # The others extend the keystream with the ciphertext from its start (interrupters included), in order
+        ciphertext_extension = ciphertext[np.cumsum(~extend_to_plaintext) - (~extend_to_plaintext)]
+        gp_values = np.array([ RuneUtils.gp_at(index) % size for index in range(size) ], dtype=np.int64)
+
+        # Decrypt keys of the same length together, a key length at a time since each value depends on the one a key length before it
+        consumed_ciphertext = ciphertext[positions]
+        result = np.tile(ciphertext, (len(keys), 1))
+        for key_len in np.unique(key_lengths).tolist():
+            rows = np.flatnonzero(key_lengths == key_len)
+            plaintext = np.empty((len(rows), num_of_values), dtype=np.int64)
+            plaintext[:, :key_len] = (consumed_ciphertext[:key_len] - keys[rows, :min(key_len, num_of_values)]) % size
+            for start in range(key_len, num_of_values, key_len):
+                end = min(start + key_len, num_of_values)
+                extension = np.where(extend_to_plaintext[start - key_len:end - key_len], plaintext[:, start - key_len:end - key_len], ciphertext_extension[start - key_len:end - key_len])
+                if self._use_gp:
+                    extension = gp_values[extension]
+                plaintext[:, start:end] = (consumed_ciphertext[start:end] - extension) % size
+            result[np.ix_(rows, positions)] = plaintext
+
+        # Translate back to rune indices
+        return np.frombuffer(self._from_alphabet, dtype=np.uint8)[result]
+
+    def _decrypt_indices(self, ciphertext, interrupt_indices):
+        """
+            Decrypts indices in the working alphabet with the given interrupt indices and returns the result.
+        """
+
+        # Decrypt everything
+        return list(self._iter_decrypt_indices(ciphertext, interrupt_indices, len(ciphertext)))
+
+    def _iter_decrypt_indices(self, ciphertext, interrupt_indices, num_of_runes):
+        """
+            Decrypts an iterable of indices in the working alphabet with the given interrupt indices, yielding results one by one.
+        """
+
         # Save state based on mode
         extend_to_plaintext = self._mode in (AutokeyMode.PLAINTEXT, AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_PLAINTEXT)
 
-        # Performs an autokey decryption
-        result = []
+        # Performs an autokey decryption, saving the ciphertext for extending the keystream
+        consumed_ciphertext = []
         key_index = 0
         rune_index = -1
         ciphertext_extension_index = 0
         mob_value = None
         running_key_indices = self._key_indices[:]
-        ciphertext = processed_text.get_runes()
+        size = len(self._alphabet)
+        use_mobius = self._mode in (AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT)
+        if use_mobius:
+            mob_values = MathUtils.get_mobius_values(np.arange(1, num_of_runes + 1)).tolist()
         for rune in ciphertext:
             rune_index += 1
+            consumed_ciphertext.append(rune)
 
             # Handle Mobius function and change state accrdingly
-            if self._mode in (AutokeyMode.ALT_MOBIUS_START_PLAINTEXT, AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT):
-                mob_value = MathUtils.mobius(rune_index + 1)
+            if use_mobius:
+                mob_value = mob_values[rune_index]
                 extend_to_plaintext = (AutokeyMode.ALT_MOBIUS_START_PLAINTEXT and mob_value == 1) or (AutokeyMode.ALT_MOBIUS_START_CIPHERTEXT and mob_value == 0)
 
             # Treat mobius value of 0 just like an interrupt index
-            if rune_index in self._interrupt_indices or mob_value == 0:
-                new_index = self._alphabet.index(rune)
+            if rune_index in interrupt_indices or mob_value == 0:
+                new_index = rune
             else:
-                new_index = (self._alphabet.index(rune) - running_key_indices[key_index]) % len(self._alphabet)
+                new_index = (rune - running_key_indices[key_index]) % size
                 key_index += 1
 
                 # Extend the keystream from either plaintext or ciphertext
                 if extend_to_plaintext:
                     running_key_indices.append(new_index)
                 else:
-                    running_key_indices.append(self._alphabet.index(ciphertext[ciphertext_extension_index]))
+                    running_key_indices.append(consumed_ciphertext[ciphertext_extension_index])
                     ciphertext_extension_index += 1
 
                 # Using GP mode we extend the running keystream with the GP value of the lastly added value
                 if self._use_gp:
-                    running_key_indices[-1] = GP_PRIMES[running_key_indices[-1]] % len(self._alphabet)
+                    running_key_indices[-1] = RuneUtils.gp_at(running_key_indices[-1]) % size
 
                 # Update whether to extend the keystream to plaintext if needed
                 if self._mode in (AutokeyMode.ALT_START_PLAINTEXT, AutokeyMode.ALT_START_CIPHERTEXT):
                     extend_to_plaintext = not extend_to_plaintext
 
-            # Add the new rune
-            result.append(self._alphabet[new_index])
-
-        # Set the result
-        processed_text.set_runes(result)
+            # Yield the new rune
+            yield new_index
 
 class AutokeyMobiusTransformer(TransformerBase):
+    """
+        Splits runes by the Mobius function of their (1-based) index and runs Autokey decryption on each part with its own key.
+    """
+
+    # Partitions of rune positions by the Mobius function of their 1-based index (-1, 0 or 1), keyed by text length
+    _PARTITIONS_CACHE = {}
 
     def __init__(self, keys, mode, interrupt_indices=set(), alphabet_prefix=''):
         """
             Creates an instance.
         """
 
-        # Save the keys
+        # Save the keys as an Autokey transformer per part
         super().__init__(alphabet_prefix=alphabet_prefix)
         assert len(keys) == 3, Exception('Expecting three keys')
-        self._keys = keys[:]
+        self._transformers = [ AutokeyTransformer(key, mode, alphabet_prefix=alphabet_prefix) for key in keys ]
 
-        # Save the interrupters and the mode
+        # Save the interrupters
         self._interrupt_indices = interrupt_indices
-        self._mode = mode
+
+    @classmethod
+    def _get_partition(cls, length):
+        """
+            Gets the rune positions for each Mobius function value (-1, 0 and 1) for the given text length.
+        """
+
+        # Get from cache
+        if length not in cls._PARTITIONS_CACHE:
+            mobius_values = MathUtils.get_mobius_values(np.arange(1, length + 1))
+            cls._PARTITIONS_CACHE[length] = [ np.flatnonzero(mobius_values == mob) for mob in (-1, 0, 1) ]
+        return cls._PARTITIONS_CACHE[length]
 
     def transform(self, processed_text):
         """
             Transforms runes.
         """
 
-        # Split by runes
-        rune_chunks = [ '' ] * 3
-        interrupt_indices = [ set() ] * 3
-        rune_index = 0
-        for rune in processed_text.get_runes():
-            
-            # Use 1-based indexing
-            rune_index += 1
+        # Gather each part, decrypt it and scatter the results back
+        ciphertext = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8)
+        result = np.empty_like(ciphertext)
+        interrupt_indices = list(self._interrupt_indices)
+        for transformer, positions in zip(self._transformers, self.__class__._get_partition(len(ciphertext))):
+            part_interrupt_indices = set(np.flatnonzero(np.isin(positions, interrupt_indices)).tolist())
+            result[positions] = transformer._decrypt_indices(ciphertext[positions].tobytes(), part_interrupt_indices)
 
-            # Append to the right ciphertext chunk and map Mobius function from { -1, 0, 1 } to { 0, 1, 2 }
-            fixed_index = MathUtils.mobius(rune_index) + 1
-            rune_chunks[fixed_index] += rune
-
-            # Save interrupt indices
-            if rune_index - 1 in self._interrupt_indices:
-                interrupt_indices[fixed_index].add(len(rune_chunks[fixed_index]) - 1)
-
-        # Run each transformer seperately
-        pt_chunks = [ None ] * 3
-        for i in range(3):
-            transformer = AutokeyTransformer(self._keys[i], self._mode, interrupt_indices[i])
-            pt_chunks[i] = ProcessedText(rune_chunks[i])
-            transformer.transform(pt_chunks[i])
-
-        # Merge results
-        results = []
-        pt_runes = [ pt.get_runes() for pt in pt_chunks ]
-        rune_index = 0
-        for rune in processed_text.get_runes():
-            rune_index += 1
-            fixed_index = MathUtils.mobius(rune_index) + 1
-            results.append(pt_runes[fixed_index].pop(0)) 
-        processed_text.set_runes(results)
+        # Set the result
+        self._set_alphabet_indices(processed_text, result)
 
 class VigenereTransformer(TransformerBase):
     """
@@ -386,7 +977,7 @@ class VigenereTransformer(TransformerBase):
         # Save the key indices
         super().__init__(alphabet_prefix=alphabet_prefix)
         assert len(key) > 0, Exception('Empty key')
-        self._key_indices = [ self._alphabet.index(rune) for rune in key ]
+        self._key_indices = [ self._alphabet_indices[rune] for rune in key ]
         assert len([ i for i in self._key_indices if i < 0 ]) == 0, Exception('Invalid key')
 
         # Save the grouping size
@@ -405,17 +996,58 @@ class VigenereTransformer(TransformerBase):
         """
 
         # Performs Vigenere decryption
-        result = []
+        self._set_alphabet_indices(processed_text, list(self._iter_decrypt_indices(self._get_alphabet_indices(processed_text))))
+
+    def transform_lazy(self, processed_text):
+        """
+            Transforms runes lazily.
+        """
+
+        # Performs Vigenere decryption as runes are pulled
+        self._set_alphabet_indices_lazy(processed_text, self._iter_decrypt_indices(self._iter_alphabet_indices(processed_text)))
+
+    def transform_batch(self, processed_text, keys, key_lengths):
+        """
+            Transforms runes with each of the given keys (with the same grouping size) and returns a 2D matrix of rune indices.
+            Keys are rows of a 2D matrix of indices in the working alphabet alongside their lengths, as returned by Alphabet.keys_to_matrix.
+            Each row could be set as the processed text rune indices, and the processed text itself is not modified.
+        """
+
+        # Number the groups of non-interrupters (groups grow from one rune up to the grouping size and start over)
+        size = len(self._alphabet)
+        keys = np.asarray(keys, dtype=np.int64)
+        key_lengths = np.asarray(key_lengths, dtype=np.int64)
+        ciphertext = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8)
+        positions = self.__class__._get_non_interrupted_positions(len(ciphertext), self._interrupt_indices)
+        cycle = np.repeat(np.arange(self._grouping_size), np.arange(1, self._grouping_size + 1))
+        num_of_cycles = -(-len(positions) // len(cycle))
+        groups = (np.arange(num_of_cycles)[:, None] * self._grouping_size + cycle[None, :]).ravel()[:len(positions)]
+
+        # Each group uses the next key rune, so tile the keys accordingly and substruct
+        result = np.tile(ciphertext, (len(keys), 1))
+        keystreams = np.take_along_axis(keys, groups[None, :] % key_lengths[:, None], axis=1)
+        result[:, positions] = (ciphertext[positions] - keystreams) % size
+
+        # Translate back to rune indices
+        return np.frombuffer(self._from_alphabet, dtype=np.uint8)[result]
+
+    def _iter_decrypt_indices(self, ciphertext):
+        """
+            Decrypts an iterable of indices in the working alphabet, yielding results one by one.
+        """
+
+        # Performs Vigenere decryption
         key_index = 0
         rune_index = -1
         curr_group_size = 1
         decrypted_in_group = 0
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for rune in ciphertext:
             rune_index += 1
             if rune_index in self._interrupt_indices:
-                new_index = self._alphabet.index(rune)
+                new_index = rune
             else:
-                new_index = (self._alphabet.index(rune) - self._key_indices[key_index]) % len(self._alphabet)
+                new_index = (rune - self._key_indices[key_index]) % size
                 decrypted_in_group += 1
                 if decrypted_in_group == curr_group_size:
                     key_index = (key_index + 1) % len(self._key_indices)
@@ -423,10 +1055,7 @@ class VigenereTransformer(TransformerBase):
                     curr_group_size += 1
                     if curr_group_size > self._grouping_size:
                         curr_group_size = 1
-            result.append(self._alphabet[new_index])
-
-        # Set the result
-        processed_text.set_runes(result)
+            yield new_index
 
 class TotientPrimeTransformer(TransformerBase):
     """
@@ -449,31 +1078,62 @@ class TotientPrimeTransformer(TransformerBase):
         # Save the interrupters
         self._interrupt_indices = interrupt_indices
 
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer.
+        """
+
+        # Get all primes from the primes table and calculate the totients of all of them at once
+        values = MathUtils.get_primes(0, num_of_runes)
+        if self._emirp:
+            values = np.array([ int(str(p)[::-1]) for p in values.tolist() ], dtype=np.int64)
+        for i in range(self._tot_calls):
+            values = MathUtils.get_totients(values)
+
+        # Spread the values over non-interrupters
+        return self._spread_keystream(values, num_of_runes, self._interrupt_indices, self._add)
+
     def transform(self, processed_text):
         """
             Transforms runes.
         """
 
+        # Add the keystream
+        self._apply_keystream(processed_text, self.get_keystream(processed_text.get_num_of_runes()))
+
+    def transform_lazy(self, processed_text):
+        """
+            Transforms runes lazily.
+        """
+
+        # Calculate the totients of primes one by one
+        values = MathUtils.iter_primes()
+        if self._emirp:
+            values = map(lambda p:int(str(p)[::-1]), values)
+        for i in range(self._tot_calls):
+            values = map(MathUtils.totient, values)
+
+        # Transform as runes are pulled
+        self._set_alphabet_indices_lazy(processed_text, self._iter_transform_indices(self._iter_alphabet_indices(processed_text), values))
+
+    def _iter_transform_indices(self, runes, values):
+        """
+            Adds or substructs the given values from an iterable of indices in the working alphabet, skipping interrupters.
+        """
+
         # Substract or adds the totient of each prime
-        result = []
-        curr_prime = 2
         rune_index = -1
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for rune in runes:
             rune_index += 1
             if rune_index in self._interrupt_indices:
-                new_index = self._alphabet.index(rune)
+                new_index = rune
             else:
-                val = int(str(curr_prime)[::-1]) if self._emirp else curr_prime
-                for i in range(self._tot_calls):
-                    val = MathUtils.totient(val)
+                val = next(values)
                 if not self._add:
                     val *= -1
-                new_index = (self._alphabet.index(rune) + val) % len(self._alphabet)
-                curr_prime = MathUtils.find_next_prime(curr_prime)
-            result.append(self._alphabet[new_index])
-
-        # Set the result
-        processed_text.set_runes(result)
+                new_index = int(rune + val) % size
+            yield new_index
 
 class TotientFibTransformer(TransformerBase):
     """
@@ -503,22 +1163,23 @@ class TotientFibTransformer(TransformerBase):
         result = []
         fib_a, fib_b = 1, 1
         rune_index = -1
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for rune in self._get_alphabet_indices(processed_text):
             rune_index += 1
             if rune_index in self._interrupt_indices:
-                new_index = self._alphabet.index(rune)
+                new_index = rune
             else:
                 val = fib_a
                 for i in range(self._tot_calls):
                     val = MathUtils.totient(val)
                 if not self._add:
                     val *= -1
-                new_index = (self._alphabet.index(rune) + val) % len(self._alphabet)
+                new_index = int(rune + val) % size
                 fib_a, fib_b = fib_b, fib_a + fib_b
-            result.append(self._alphabet[new_index])
+            result.append(new_index)
 
         # Set the result
-        processed_text.set_runes(result)
+        self._set_alphabet_indices(processed_text, result)
 
 class MobiusTotientPrimeTransformer(TransformerBase):
     """
@@ -538,33 +1199,27 @@ class MobiusTotientPrimeTransformer(TransformerBase):
         # Save the interrupters
         self._interrupt_indices = interrupt_indices
 
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer.
+        """
+
+        # Get all primes from the primes table alongside the Mobius function of their totients
+        primes = MathUtils.get_primes(0, num_of_runes)
+        totients = MathUtils.get_totients(primes)
+        mobius_values = MathUtils.get_mobius_values(totients).astype(np.int64)
+
+        # Multiply by either the prime or the totient and spread the values over non-interrupters
+        values = mobius_values * (primes if self._use_prime_as_base else totients)
+        return self._spread_keystream(values, num_of_runes, self._interrupt_indices, self._add)
+
     def transform(self, processed_text):
         """
             Transforms runes.
         """
 
-        # Substract or adds the value of each prime
-        result = []
-        curr_prime = 2
-        rune_index = -1
-        for rune in processed_text.get_runes():
-            rune_index += 1
-            if rune_index in self._interrupt_indices:
-                new_index = self._alphabet.index(rune)
-            else:
-                tot = MathUtils.totient(curr_prime)
-                if self._use_prime_as_base:
-                    val = (MathUtils.mobius(tot) * curr_prime) % len(self._alphabet)
-                else:
-                    val = (MathUtils.mobius(tot) * tot) % len(self._alphabet)
-                if not self._add:
-                    val *= -1
-                new_index = (self._alphabet.index(rune) + val) % len(self._alphabet)
-                curr_prime = MathUtils.find_next_prime(curr_prime)
-            result.append(self._alphabet[new_index])
-
-        # Set the result
-        processed_text.set_runes(result)
+        # Add the keystream
+        self._apply_keystream(processed_text, self.get_keystream(processed_text.get_num_of_runes()))
 
 class ReverseTransformer(TransformerBase):
     """
@@ -585,7 +1240,7 @@ class ReverseTransformer(TransformerBase):
         """
 
         # Reverses runes
-        processed_text.set_runes(processed_text.get_runes()[::-1])
+        processed_text.set_rune_indices(processed_text.get_rune_indices()[::-1])
 
 class KeystreamTransformer(TransformerBase):
     """
@@ -603,36 +1258,73 @@ class KeystreamTransformer(TransformerBase):
         self._keystream = keystream
         self._add = add
 
+        # Keystream values that were already materialized, so transforming again uses the same values
+        self._keystream_values = []
+
         # Save the interrupters
         self._interrupt_indices = interrupt_indices
 
-    def transform(self, processed_text):
+    def _get_key_positions(self, num_of_runes):
         """
-            Transforms runes.
+            Gets the positions of all runes that consume a keystream value (i.e. are not interrupters).
         """
 
-        # Runs the keystream
-        result = []
-        rune_index = -1
-        orig_runes = processed_text.get_runes()
-        try:
-            for rune in orig_runes:
-                rune_index += 1
-                if rune_index in self._interrupt_indices:
-                    result.append(rune)
-                else:
-                    val = next(self._keystream)
-                    if not self._add:
-                        val *= -1
-                    result.append(self._alphabet[(self._alphabet.index(rune) + val) % len(self._alphabet)])
+        # Skip interrupters
+        return self.__class__._get_non_interrupted_positions(num_of_runes, self._interrupt_indices)
+
+    def _apply_keystreams(self, processed_text, keystreams):
+        """
+            Applies a 2D matrix of keystreams on the processed text runes and returns a 2D matrix of rune indices.
+            Keystreams that are shorter than the number of non-interrupted runes only transform the first runes.
+        """
+
+        # Reduce keystream values (could be arbitrarily big or non-native integers) in the working alphabet
+        size = len(self._alphabet)
+        keystreams = np.asarray(keystreams)
+        if keystreams.dtype == object:
+            keystreams = (keystreams % size).astype(np.int64)
+        keystreams = keystreams.astype(np.int64) % size
+        if not self._add:
+            keystreams = (size - keystreams) % size
+
+        # Apply the keystreams on the non-interrupted positions only
+        ciphertext = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8)
+        positions = self._get_key_positions(len(ciphertext))[:keystreams.shape[1]]
+        result = np.tile(ciphertext, (keystreams.shape[0], 1))
+        result[:, positions] = (ciphertext[positions] + keystreams[:, :len(positions)]) % size
 
-            # Set the result
-            processed_text.set_runes(result)
-        except StopIteration:
+        # Translate back to rune indices
+        return np.frombuffer(self._from_alphabet, dtype=np.uint8)[result]
+
+    def transform_batch(self, processed_text, keystreams):
+        """
+            Transforms runes with each of the given keystreams (as rows of a 2D matrix) and returns a 2D matrix of rune indices.
+            Each row could be set as the processed text rune indices, and the processed text itself is not modified.
+        """
+
+        # Apply all keystreams at once
+        return self._apply_keystreams(processed_text, keystreams)
+
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer.
+        """
+
+        # Materialize the keystream as much as needed
+        num_of_values = len(self._get_key_positions(num_of_runes))
+        if len(self._keystream_values) < num_of_values:
+            self._keystream_values += [ int(val) % len(self._alphabet) for val in itertools.islice(self._keystream, num_of_values - len(self._keystream_values)) ]
+
+        # Spread the values over non-interrupters
+        return self._spread_keystream(self._keystream_values[:num_of_values], num_of_runes, self._interrupt_indices, self._add)
+
+    def transform(self, processed_text):
+        """
+            Transforms runes.
+        """
 
-            # Extend results as much as possible
-            result = (result + orig_runes)[:len(orig_runes)]
-            processed_text.set_runes(result)
+        # Add the keystream
+        self._apply_keystream(processed_text, self.get_keystream(processed_text.get_num_of_runes()))
 
 class Page15FuncPrimesTransformer(KeystreamTransformer):
     """
@@ -646,7 +1338,7 @@ class Page15FuncPrimesTransformer(KeystreamTransformer):
         """
 
         # Call super
-        super().__init__(add=add, keystream=map(lambda x:abs(3301-x), MathUtils.gen_primes()), interrupt_indices=interrupt_indices, alphabet_prefix=alphabet_prefix)
+        super().__init__(add=add, keystream=map(lambda x:abs(3301-x), MathUtils.iter_primes()), interrupt_indices=interrupt_indices, alphabet_prefix=alphabet_prefix)
 
 class TotientKeystreamTransformer(KeystreamTransformer):
     """
@@ -719,6 +1411,91 @@ class PrimesIndicesApartTransformer(KeystreamTransformer):
         # Call super
         super().__init__(add=add, keystream=MathUtils.gen_primes(first_value=start_value, indices_apart=indices_apart), interrupt_indices=interrupt_indices, alphabet_prefix=alphabet_prefix)
 
+class KeystreamComposer(TransformerBase):
+    """
+        Composes additive transformers (i.e. transformers that expose their keystream) into a single transformer.
+        Since additions commute, the order of the composed transformers does not matter and they are all applied in a single pass.
+    """
+
+    def __init__(self, transformers):
+        """
+            Creates an instance.
+            All transformers must be additive and work on the same alphabet.
+        """
+
+        # Validations
+        transformers = list(transformers)
+        for transformer in transformers:
+            assert self.__class__.is_additive(transformer), Exception(f'Transformer is not additive: {transformer.__class__.__name__}')
+            assert transformer._alphabet == transformers[0]._alphabet, Exception('Composed transformers must work on the same alphabet')
+
+        # Save members (a full alphabet is also a valid alphabet prefix)
+        super().__init__(alphabet_prefix=transformers[0]._alphabet if len(transformers) > 0 else '')
+        self._transformers = transformers
+        self._keystreams_cache = {}
+
+    @staticmethod
+    def is_additive(transformer):
+        """
+            Indicates if the given transformer is additive, i.e. exposes its keystream.
+        """
+
+        # Additive transformers override the default
+        return type(transformer).get_keystream is not TransformerBase.get_keystream
+
+    @classmethod
+    def iter_distinct_orderings(cls, transformers):
+        """
+            Iterates all orderings of the given transformers, skipping orderings that are equivalent to ones that were already iterated.
+            Two orderings are equivalent if they only differ by the order of adjacent additive transformers that work on the same alphabet.
+        """
+
+        # Iterate all permutations of transformer indices
+        seen = set()
+        for ordering in itertools.permutations(range(len(transformers))):
+
+            # Sort each run of adjacent additive transformers to get a canonical ordering
+            canonical = []
+            run = []
+            for index in ordering:
+                transformer = transformers[index]
+                if not cls.is_additive(transformer):
+                    canonical += sorted(run) + [ index ]
+                    run = []
+                    continue
+                if len(run) > 0 and transformers[run[0]]._alphabet != transformer._alphabet:
+                    canonical += sorted(run)
+                    run = []
+                run.append(index)
+            canonical = tuple(canonical + sorted(run))
+
+            # Skip equivalent orderings
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            yield tuple([ transformers[index] for index in ordering ])
+
+    def get_keystream(self, num_of_runes):
+        """
+            Gets the additive keystream of the transformer, which is the sum of all composed keystreams.
+        """
+
+        # Sum all keystreams once per number of runes
+        if num_of_runes not in self._keystreams_cache:
+            keystream = np.zeros(num_of_runes, dtype=np.int64)
+            for transformer in self._transformers:
+                keystream += transformer.get_keystream(num_of_runes)
+            self._keystreams_cache[num_of_runes] = keystream % len(self._alphabet)
+        return self._keystreams_cache[num_of_runes]
+
+    def transform(self, processed_text):
+        """
+            Transforms runes.
+        """
+
+        # Add the composed keystream
+        self._apply_keystream(processed_text, self.get_keystream(processed_text.get_num_of_runes()))
+
 class HillCipherTransformer(TransformerBase):
     """
         Runs Hill Cipher on runes.
@@ -729,34 +1506,67 @@ class HillCipherTransformer(TransformerBase):
             Creates an instance.
         """
 
-        # Saves the matrix and the padding
+        # Saves the padding
         super().__init__(alphabet_prefix=alphabet_prefix)
-        self._matrix = matrix.inv_mod(len(self._alphabet)) if inverse else matrix
         assert len(padding) == 1, Exception('Invalid padding length')
         assert padding[0] in self._alphabet, Exception(f'Padding must be a rune: {padding}')
         self._padding = padding[0]
 
-    def transform(self, processed_text):
+        # Saves the matrix (inverted only once) as a small integer matrix in the working alphabet
+        self._inverse = inverse
+        self._matrix = self._prepare_matrix(matrix)
+
+    def _prepare_matrix(self, matrix):
         """
-            Transforms runes.
+            Optionally inverts a key matrix and reduces it to an integer array in the working alphabet.
         """
-        
-        # Iterate runes in groups
-        result = []
-        runes = processed_text.get_runes()
-        for i in range(0, len(runes), self._matrix.rows):
 
-            # Get the chunk and optionally extend with padding
-            chunk = (''.join(runes[i:i+self._matrix.rows]) + (self._padding * self._matrix.rows))[:self._matrix.rows]
-            chunk = [ self._alphabet.index(rune) for rune in chunk ]
+        # Invert with sympy and reduce
+        matrix = sympy.Matrix(matrix)
+        if self._inverse:
+            matrix = matrix.inv_mod(len(self._alphabet))
+        return (np.array(matrix.tolist(), dtype=object) % len(self._alphabet)).astype(np.int64)
 
-            # Work on transposed matrix
-            new_chunk = self._matrix * sympy.Matrix(chunk)
-            new_chunk = [ self._alphabet[num % len(self._alphabet)] for num in new_chunk ]
-            result.extend(new_chunk)
+    def _get_blocks(self, processed_text, block_size):
+        """
+            Gets the processed text runes as a (blocks x block size) matrix, padding the last block if needed.
+        """
 
-        # Set the result
-        processed_text.set_runes(result[:len(runes)])
+        # Pad and reshape
+        runes = np.frombuffer(self._get_alphabet_indices(processed_text), dtype=np.uint8).astype(np.int64)
+        num_of_padding_runes = -len(runes) % block_size
+        runes = np.concatenate((runes, np.full(num_of_padding_runes, self._alphabet_indices[self._padding], dtype=np.int64)))
+        return runes.reshape(-1, block_size)
+
+    def _apply_matrices(self, processed_text, matrices):
+        """
+            Multiplies each block of runes by each of the given prepared key matrices and returns a 2D matrix of rune indices.
+        """
+
+        # Multiply all blocks by all matrices at once
+        num_of_runes = processed_text.get_num_of_runes()
+        blocks = self._get_blocks(processed_text, matrices.shape[1])
+        result = np.einsum('kij,bj->kbi', matrices, blocks) % len(self._alphabet)
+
+        # Remove padding and translate back to rune indices
+        return np.frombuffer(self._from_alphabet, dtype=np.uint8)[result.reshape(len(matrices), -1)[:, :num_of_runes]]
+
+    def transform_batch(self, processed_text, matrices):
+        """
+            Transforms runes with each of the given key matrices (all of the same size) and returns a 2D matrix of rune indices.
+            Matrices are inverted if the transformer inverts its own matrix, and the processed text itself is not modified.
+        """
+
+        # Prepare all matrices and apply them at once
+        return self._apply_matrices(processed_text, np.stack([ self._prepare_matrix(matrix) for matrix in matrices ]))
+
+    def transform(self, processed_text):
+        """
+            Transforms runes.
+        """
+
+        # Apply the matrix on all blocks at once
+        processed_text.set_rune_indices(self._apply_matrices(processed_text, self._matrix[None, :, :])[0])
 
 class FibonacciKeystreamTransformer(TransformerBase):
     """
@@ -773,34 +1583,29 @@ class FibonacciKeystreamTransformer(TransformerBase):
         self._interrupt_indices = interrupt_indices
         self._add = add
 
-        # Saves the sequence
-        self._sequence = [ start_a, start_b ]
+        # Saves the sequence (only its values modulo the alphabet size matter)
+        self._sequence = [ start_a % len(self._alphabet), start_b % len(self._alphabet) ]
 
-    def transform(self, processed_text):
+    def get_keystream(self, num_of_runes):
         """
-            Transforms runes.
+            Gets the additive keystream of the transformer.
         """
-        
+
         # Extend sequence
-        runes = processed_text.get_runes()
-        while len(self._sequence) < len(runes):
-            self._sequence.append(self._sequence[-1] + self._sequence[-2])
+        size = len(self._alphabet)
+        while len(self._sequence) < num_of_runes:
+            self._sequence.append((self._sequence[-1] + self._sequence[-2]) % size)
 
-        # Apply sequence
-        result = []
-        rune_index = 0
-        seq_index = 0
-        for rune in runes:
-            if rune_index in self._interrupt_indices:
-                result.append(rune)
-            else:
-                val = self._sequence[seq_index]
-                if not self._add:
-                    val = -val
-                result.append(self._alphabet[(self._alphabet.index(rune) + val) % len(self._alphabet)])
+        # Spread the sequence over non-interrupters
+        return self._spread_keystream(self._sequence[:num_of_runes], num_of_runes, self._interrupt_indices, self._add)
 
-        # Apply result
-        processed_text.set_runes(result)
+    def transform(self, processed_text):
+        """
+            Transforms runes.
+        """
+
+        # Add the keystream
+        self._apply_keystream(processed_text, self.get_keystream(processed_text.get_num_of_runes()))
 
 class ModInvTransformer(TransformerBase):
     """
@@ -825,20 +1630,24 @@ class ModInvTransformer(TransformerBase):
         # Iterate runes
         result = []
         shift_value = 0
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for curr_index in self._get_alphabet_indices(processed_text):
             
             # Performs modular inverse
-            curr_index = self._alphabet.index(rune)
             if curr_index == 0:
                 new_index = curr_index
                 if self._use_shift_counter:
                     shift_value += 1
             else:
-                new_index = pow(curr_index, -1, len(self._alphabet)) + shift_value
-            result.append(self._alphabet[new_index])
+                new_index = pow(curr_index, -1, size) + shift_value
+
+            # The shifted index does not wrap around the alphabet
+            if new_index >= size:
+                raise IndexError(f'Shifted index out of alphabet range: {new_index}')
+            result.append(new_index)
 
         # Set the result
-        processed_text.set_runes(result)
+        self._set_alphabet_indices(processed_text, result)
 
 class AutokeyGpTransformer(TransformerBase):
     """
@@ -865,20 +1674,20 @@ class AutokeyGpTransformer(TransformerBase):
         # Iterate runes
         result = []
         last_value = self._primer_value
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for curr_index in self._get_alphabet_indices(processed_text):
 
             # Generate the new rune index
-            curr_index = self._alphabet.index(rune)
             new_index = curr_index + last_value if self._add else curr_index - last_value
-            new_index %= len(self._alphabet)
-            result.append(self._alphabet[new_index])
+            new_index %= size
+            result.append(new_index)
 
             # Update last value
             last_value = curr_index if self._use_plaintext else new_index
             last_value = RuneUtils.gp_at(last_value)
 
         # Set the result
-        processed_text.set_runes(result)
+        self._set_alphabet_indices(processed_text, result)
 
 class AlbertiTransformer(TransformerBase):
     """
@@ -910,26 +1719,27 @@ class AlbertiTransformer(TransformerBase):
             Transforms runes.
         """
 
-        # Save the mobile disk
-        mobile_disk = self._mobile_disk[:]
+        # The mobile disk is always a rotation of the alphabet indices, so it is fully described by its first element
+        disk_offset = self._mobile_disk[0]
         mobile_counter = 0
 
         # Iterate runes
         result = []
         rune_index = -1
-        for rune in processed_text.get_runes():
+        size = len(self._alphabet)
+        for rune in self._get_alphabet_indices(processed_text):
             rune_index += 1
             if rune_index in self._interrupt_indices:
                 result.append(rune)
                 continue
-            result.append(self._alphabet[mobile_disk.index(self._alphabet.index(rune))])
+            result.append((rune - disk_offset) % size)
             mobile_counter += 1
             if mobile_counter == self._period:
                 mobile_counter = 0
-                mobile_disk = mobile_disk[self._periodic_increment:] + mobile_disk[:self._periodic_increment]
+                disk_offset = (disk_offset + self._periodic_increment) % size
 
         # Yield results
-        processed_text.set_runes(result)
+        self._set_alphabet_indices(processed_text, result)
 
 class UnsolvedTransformer(TransformerBase):
     """